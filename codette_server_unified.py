@@ -1129,12 +1129,16 @@ async def get_status():
 # Try to import DSP effects
 try:
     from daw_core.fx.eq_and_dynamics import EQ3Band, HighLowPass, Compressor
-    from daw_core.fx.dynamics_part2 import Limiter, Expander, Gate, NoiseGate
+    from daw_core.fx.dynamics_part2 import Limiter, LookaheadLimiter, MultibandCompressor, Expander, Gate, NoiseGate
     from daw_core.fx.saturation import Saturation, HardClip, Distortion, WaveShaper
     from daw_core.fx.delays import SimpleDelay, PingPongDelay, MultiTapDelay, StereoDelay
-    from daw_core.fx.reverb import HallReverb, PlateReverb, RoomReverb, Reverb
+    from daw_core.fx.reverb import HallReverb, PlateReverb, RoomReverb, Reverb, ConvolutionReverb
     from daw_core.fx.modulation_and_utility import Chorus, Flanger, Tremolo, Gain, WidthControl, DynamicEQ
+    from daw_core.fx import get_effect_backends, warm_up_kernels
     DSP_EFFECTS_AVAILABLE = True
+    # Compile recursive DSP kernels now rather than in the first audio block
+    warm_up_kernels()
+    logger.info(f"[DSP Effects] Kernel backends: {get_effect_backends()}")
 except ImportError as e:
     DSP_EFFECTS_AVAILABLE = False
     logger.warning(f"[WARNING] DSP effects not available: {e}")
@@ -1144,9 +1148,12 @@ EFFECTS_REGISTRY = {
     "eq_3band": {"class": EQ3Band, "name": "3-Band EQ", "category": "eq"},
     "compressor": {"class": Compressor, "name": "Compressor", "category": "dynamics"},
     "limiter": {"class": Limiter, "name": "Limiter", "category": "dynamics"},
+    "limiter_lookahead": {"class": LookaheadLimiter, "name": "Lookahead Limiter", "category": "dynamics"},
+    "compressor_multiband": {"class": MultibandCompressor, "name": "Multiband Compressor", "category": "dynamics"},
     "gate": {"class": Gate, "name": "Gate", "category": "dynamics"},
     "reverb_plate": {"class": PlateReverb, "name": "Plate Reverb", "category": "reverb"},
     "reverb_hall": {"class": HallReverb, "name": "Hall Reverb", "category": "reverb"},
+    "reverb_convolution": {"class": ConvolutionReverb, "name": "Convolution Reverb", "category": "reverb"},
     "chorus": {"class": Chorus, "name": "Chorus", "category": "modulation"},
     "delay": {"class": SimpleDelay, "name": "Simple Delay", "category": "delay"},
     "delay_pingpong": {"class": PingPongDelay, "name": "Ping Pong Delay", "category": "delay"},
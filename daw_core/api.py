@@ -6,9 +6,12 @@ Exposes audio effects, automation, and metering via REST API
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import numpy as np
 import io
+import os
+import tempfile
+import threading
 from scipy.io import wavfile
 
 from .fx.eq_and_dynamics import EQ3Band, HighLowPass, Compressor
@@ -19,6 +22,7 @@ from .fx.reverb import Reverb
 from .automation import AutomationCurve, LFO, Envelope
 from .metering import LevelMeter, SpectrumAnalyzer, VUMeter, Correlometer
 from .engine import AudioEngine
+from .render import start_render_job, RenderJob
 
 # Create FastAPI app
 app = FastAPI(
@@ -39,6 +43,14 @@ app.add_middleware(
 # Global audio engine
 audio_engine = AudioEngine(sample_rate=44100, buffer_size=1024)
 
+# Background offline renders, keyed by job id (oldest first)
+render_jobs: Dict[str, RenderJob] = {}
+_render_lock = threading.Lock()  # serializes render/start checks against the engine
+MAX_FINISHED_RENDER_JOBS = 32  # finished jobs kept for status polling
+
+# Render output is confined to this directory
+RENDER_DIR = os.environ.get("DAW_RENDER_DIR") or os.path.join(tempfile.gettempdir(), "daw_renders")
+
 # ============================================================================
 # DATA MODELS
 # ============================================================================
@@ -70,6 +82,14 @@ class MeteringRequest(BaseModel):
     audio_data: List[float]
     sample_rate: int = 44100
 
+class RenderRequest(BaseModel):
+    """Request to bounce the session offline"""
+    path: str  # Output .wav or .flac, relative to RENDER_DIR
+    start: Optional[float] = None
+    end: Optional[float] = None
+    unit: str = "seconds"  # 'seconds' or 'samples'
+    subtype: str = "PCM_24"
+
 # ============================================================================
 # HEALTH & INFO ENDPOINTS
 # ============================================================================
@@ -563,11 +583,11 @@ async def upload_audio(file: UploadFile = File(...)):
 @app.post("/engine/start")
 def start_engine():
     """Start audio engine"""
-    try:
+    with _render_lock:
+        if audio_engine.rendering_offline:
+            raise HTTPException(status_code=409, detail="An offline render is in progress")
         audio_engine.is_running = True
-        return {"status": "success", "engine_state": "running"}
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "success", "engine_state": "running"}
 
 @app.post("/engine/stop")
 def stop_engine():
@@ -602,6 +622,83 @@ def set_engine_config(sample_rate: int = 44100, buffer_size: int = 1024):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/engine/profile")
+def get_engine_profile(top: int = 5, histograms: bool = False):
+    """Per-node DSP timing, block load against the deadline and xruns"""
+    return audio_engine.get_profile(top=top, histograms=histograms)
+
+@app.post("/engine/profile")
+def configure_engine_profile(sample_every: int = 1, enabled: bool = True, reset: bool = False):
+    """Set profiling sampling (1 in N blocks) or reset statistics"""
+    try:
+        audio_engine.set_profile_sampling(sample_every, enabled)
+        if reset:
+            audio_engine.profiler.reset()
+        return {
+            "status": "success",
+            "enabled": audio_engine.profiler.enabled,
+            "sample_every": audio_engine.profiler.sample_every,
+        }
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _render_path(name: str) -> str:
+    """Resolve a requested output file inside RENDER_DIR."""
+    root = os.path.realpath(RENDER_DIR)
+    path = os.path.realpath(os.path.join(root, name))
+    if path == root or os.path.commonpath([root, path]) != root:
+        raise ValueError(f"Render path must be a file inside the render directory: {name}")
+    if os.path.splitext(path)[1].lower() not in (".wav", ".flac"):
+        raise ValueError("Render path must end in .wav or .flac")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+def _evict_render_jobs():
+    """Forget the oldest finished jobs beyond MAX_FINISHED_RENDER_JOBS."""
+    finished = [job_id for job_id, job in render_jobs.items()
+                if job.status not in ("pending", "running")]
+    for job_id in finished[:max(0, len(finished) - MAX_FINISHED_RENDER_JOBS)]:
+        del render_jobs[job_id]
+
+@app.post("/engine/render")
+def start_render(request: RenderRequest):
+    """Start an offline render in the background"""
+    with _render_lock:
+        if audio_engine.is_running or audio_engine.rendering_offline:
+            raise HTTPException(status_code=409,
+                                detail="Engine is playing or already rendering")
+        try:
+            job = start_render_job(
+                audio_engine,
+                _render_path(request.path),
+                start=request.start,
+                end=request.end,
+                unit=request.unit,
+                subtype=request.subtype,
+            )
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        _evict_render_jobs()
+        render_jobs[job.id] = job
+    return {"status": "success", "job_id": job.id}
+
+@app.get("/engine/render/{job_id}")
+def get_render_status(job_id: str):
+    """Poll progress of an offline render"""
+    job = render_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown render job: {job_id}")
+    return job.get_status()
+
+@app.post("/engine/render/{job_id}/cancel")
+def cancel_render(job_id: str):
+    """Cancel an offline render"""
+    job = render_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown render job: {job_id}")
+    job.cancel()
+    return {"status": "success", "job_id": job_id}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
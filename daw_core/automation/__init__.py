@@ -9,6 +9,10 @@ Real-time parameter automation framework:
 - ParameterTrack: Time-series parameter automation data structure
 
 Supports all 19 effects with real-time parameter modulation.
+
+The per-sample LFO and ADSR state machines run on the "lfo" and "adsr"
+kernels (numba-compiled when available, NumPy otherwise; see
+daw_core.fx.kernels).
 """
 
 import numpy as np
@@ -16,6 +20,8 @@ from typing import Dict, List, Tuple, Optional, Literal
 from dataclasses import dataclass
 from enum import Enum
 
+from ..fx.kernels import kernel
+
 
 class InterpolationType(Enum):
     """Interpolation modes for automation curves."""
@@ -42,6 +48,149 @@ class WaveformType(Enum):
     RANDOM = "random"
 
 
+# Kernel codes for the deterministic LFO shapes and the envelope stages
+_LFO_SHAPES = {
+    WaveformType.SINE: 0,
+    WaveformType.TRIANGLE: 1,
+    WaveformType.SQUARE: 2,
+    WaveformType.SAWTOOTH: 3,
+}
+_ENVELOPE_STAGES = ("idle", "attack", "decay", "sustain", "release")
+_IDLE, _ATTACK, _DECAY, _SUSTAIN, _RELEASE = range(5)
+
+
+def _lfo_numpy(phase: float, increment: float, shape: int, depth: float,
+               num_samples: int) -> np.ndarray:
+    """lfo kernel for a whole block at once."""
+    cycle = (phase + increment * np.arange(num_samples)) % 1.0
+    if shape == 0:
+        wave = np.sin(2 * np.pi * cycle)
+    elif shape == 1:
+        wave = np.where(cycle < 0.5, 4 * cycle - 1, 3 - 4 * cycle)
+    elif shape == 2:
+        wave = np.where(cycle < 0.5, 1.0, -1.0)
+    else:
+        wave = 2 * cycle - 1
+    return wave * depth
+
+
+@kernel("lfo", fallback=_lfo_numpy, example=lambda: (0.0, 0.01, 0, 1.0, 8))
+def _lfo_kernel(phase, increment, shape, depth, num_samples):
+    """LFO samples starting at phase (cycles), advancing increment per sample."""
+    out = np.empty(num_samples)
+    for i in range(num_samples):
+        cycle = (phase + increment * i) % 1.0
+        if shape == 0:
+            value = np.sin(2 * np.pi * cycle)
+        elif shape == 1:
+            value = 4 * cycle - 1 if cycle < 0.5 else 3 - 4 * cycle
+        elif shape == 2:
+            value = 1.0 if cycle < 0.5 else -1.0
+        else:
+            value = 2 * cycle - 1
+        out[i] = value * depth
+    return out
+
+
+def _leading(mask: np.ndarray) -> int:
+    """Length of the all-True prefix of mask."""
+    return len(mask) if mask.all() else int(np.argmin(mask))
+
+
+def _adsr_numpy(num_samples, current_sample, stage, value, progress, trigger_pos,
+                release_pos, sample_rate, attack, decay, sustain, release):
+    """
+    adsr kernel, one array operation per stage.
+
+    Each stage's elapsed time grows with the sample position, so a stage
+    covers a prefix of what is left of the block.
+    """
+    out = np.zeros(num_samples)
+    pos = current_sample + np.arange(num_samples)
+    i = 0
+    if stage == _ATTACK:
+        elapsed = (pos - trigger_pos) / sample_rate
+        n = _leading(elapsed < attack)
+        out[:n] = elapsed[:n] / attack
+        if n:
+            progress = value = float(out[n - 1])
+        if n < num_samples:
+            stage, progress, value = _DECAY, 0.0, 1.0
+        i = n
+    if stage == _DECAY and i < num_samples:
+        elapsed = (pos[i:] - trigger_pos - attack) / sample_rate
+        n = _leading(elapsed < decay)
+        ramp = elapsed[:n] / decay
+        out[i:i + n] = 1.0 + (sustain - 1.0) * ramp
+        if n:
+            progress, value = float(ramp[-1]), float(out[i + n - 1])
+        i += n
+        if i < num_samples:
+            stage, progress, value = _SUSTAIN, 0.0, sustain
+    if stage == _SUSTAIN and i < num_samples:
+        out[i:] = sustain
+        value = sustain
+        i = num_samples
+    if stage == _RELEASE and i < num_samples:
+        elapsed = (pos[i:] - release_pos) / sample_rate
+        n = _leading(elapsed < release)
+        ramp = elapsed[:n] / release
+        # Without a sustain level the fall restarts from the previous value
+        falling = sustain * (1.0 - ramp) if sustain > 0 else value * np.cumprod(1.0 - ramp)
+        out[i:i + n] = falling
+        if n:
+            progress, value = float(ramp[-1]), float(falling[-1])
+        i += n
+        if i < num_samples:
+            stage, value = _IDLE, 0.0
+    if stage == _IDLE and num_samples:
+        value = 0.0
+    return np.clip(out, 0.0, 1.0), stage, value, progress
+
+
+@kernel("adsr", fallback=_adsr_numpy,
+        example=lambda: (8, 0, _ATTACK, 0.0, 0.0, 0, 0, 44100.0, 0.01, 0.1, 0.7, 0.5))
+def _adsr_kernel(num_samples, current_sample, stage, value, progress, trigger_pos,
+                 release_pos, sample_rate, attack, decay, sustain, release):
+    """
+    ADSR state machine over a block.
+
+    Returns:
+        (values clipped to 0-1, stage, unclipped value, stage progress)
+    """
+    out = np.empty(num_samples)
+    for i in range(num_samples):
+        sample_pos = current_sample + i
+        if stage == _ATTACK:
+            elapsed = (sample_pos - trigger_pos) / sample_rate
+            if elapsed >= attack:
+                stage, progress, value = _DECAY, 0.0, 1.0
+            else:
+                progress = elapsed / attack
+                value = progress
+        if stage == _DECAY:
+            elapsed = (sample_pos - trigger_pos - attack) / sample_rate
+            if elapsed >= decay:
+                stage, progress, value = _SUSTAIN, 0.0, sustain
+            else:
+                progress = elapsed / decay
+                value = 1.0 + (sustain - 1.0) * progress
+        if stage == _SUSTAIN:
+            value = sustain
+        if stage == _RELEASE:
+            elapsed = (sample_pos - release_pos) / sample_rate
+            if elapsed >= release:
+                stage, value = _IDLE, 0.0
+            else:
+                progress = elapsed / release
+                start_value = sustain if sustain > 0 else value
+                value = start_value * (1.0 - progress)
+        if stage == _IDLE:
+            value = 0.0
+        out[i] = min(max(value, 0.0), 1.0)
+    return out, stage, value, progress
+
+
 @dataclass
 class AutomationPoint:
     """Single automation point in time."""
@@ -252,49 +401,27 @@ class LFO:
         Returns:
             Array of LFO values (-1 to +1, centered at 0)
         """
-        output = np.zeros(num_samples)
         phase_increment = self.rate_hz / self.sample_rate
-        
-        for i in range(num_samples):
-            # Calculate phase-based output
-            phase_cycle = self.phase % 1.0  # Normalize to 0-1
-            
-            if self.waveform == WaveformType.SINE:
-                # Sine wave
-                lfo_value = np.sin(2 * np.pi * phase_cycle)
-            
-            elif self.waveform == WaveformType.TRIANGLE:
-                # Triangle wave (0-1 = rise, 0.5-1 = fall)
-                if phase_cycle < 0.5:
-                    lfo_value = 4 * phase_cycle - 1  # Rise from -1 to 1
-                else:
-                    lfo_value = 3 - 4 * phase_cycle  # Fall from 1 to -1
-            
-            elif self.waveform == WaveformType.SQUARE:
-                # Square wave
-                lfo_value = 1.0 if phase_cycle < 0.5 else -1.0
-            
-            elif self.waveform == WaveformType.SAWTOOTH:
-                # Sawtooth wave
-                lfo_value = 2 * phase_cycle - 1
-            
-            elif self.waveform == WaveformType.RANDOM:
-                # Random (stepped) - new value every ~22ms @ 1Hz
-                samples_per_step = int(self.sample_rate / self.rate_hz / 10)
-                if self._random_sample_counter % samples_per_step == 0:
-                    self._random_value = np.random.uniform(-1.0, 1.0)
-                self._random_sample_counter += 1
-                lfo_value = self._random_value
-            
+        if self.waveform != WaveformType.RANDOM:
+            shape = _LFO_SHAPES.get(self.waveform)
+            if shape is None:
+                output = np.zeros(num_samples)
             else:
-                lfo_value = 0.0
-            
-            # Apply depth scaling
-            output[i] = lfo_value * self.depth
-            
-            # Advance phase
-            self.phase += phase_increment
-        
+                output = _lfo_kernel(float(self.phase), float(phase_increment), shape,
+                                     float(self.depth), int(num_samples))
+            self.phase += phase_increment * num_samples
+            return output
+
+        # Random (stepped) - new value every ~22ms @ 1Hz, drawn from
+        # NumPy's global generator so it stays seedable
+        output = np.zeros(num_samples)
+        samples_per_step = int(self.sample_rate / self.rate_hz / 10)
+        for i in range(num_samples):
+            if self._random_sample_counter % samples_per_step == 0:
+                self._random_value = np.random.uniform(-1.0, 1.0)
+            self._random_sample_counter += 1
+            output[i] = self._random_value * self.depth
+        self.phase += phase_increment * num_samples
         return output
     
     def to_dict(self) -> Dict:
@@ -371,55 +498,15 @@ class Envelope:
         Returns:
             Array of envelope values (0-1)
         """
-        output = np.zeros(num_samples)
-        
-        for i in range(num_samples):
-            sample_pos = current_sample + i
-            
-            # Determine stage
-            if self.stage == "attack":
-                elapsed = (sample_pos - self.trigger_pos) / self.sample_rate
-                duration = self.attack_time
-                if elapsed >= duration:
-                    self.stage = "decay"
-                    self.stage_progress = 0.0
-                    self.current_value = 1.0
-                else:
-                    self.stage_progress = elapsed / duration
-                    self.current_value = self.stage_progress  # Linear rise
-            
-            if self.stage == "decay":
-                elapsed = (sample_pos - self.trigger_pos - self.attack_time) / self.sample_rate
-                duration = self.decay_time
-                if elapsed >= duration:
-                    self.stage = "sustain"
-                    self.stage_progress = 0.0
-                    self.current_value = self.sustain_level
-                else:
-                    self.stage_progress = elapsed / duration
-                    # Exponential decay from 1 to sustain_level
-                    self.current_value = 1.0 + (self.sustain_level - 1.0) * self.stage_progress
-            
-            if self.stage == "sustain":
-                self.current_value = self.sustain_level
-            
-            if self.stage == "release":
-                elapsed = (sample_pos - self.release_pos) / self.sample_rate
-                duration = self.release_time
-                if elapsed >= duration:
-                    self.stage = "idle"
-                    self.current_value = 0.0
-                else:
-                    self.stage_progress = elapsed / duration
-                    # Linear fall from current to 0
-                    start_value = self.sustain_level if self.sustain_level > 0 else self.current_value
-                    self.current_value = start_value * (1.0 - self.stage_progress)
-            
-            if self.stage == "idle":
-                self.current_value = 0.0
-            
-            output[i] = np.clip(self.current_value, 0.0, 1.0)
-        
+        output, stage, value, progress = _adsr_kernel(
+            int(num_samples), int(current_sample), _ENVELOPE_STAGES.index(self.stage),
+            float(self.current_value), float(self.stage_progress), int(self.trigger_pos),
+            int(self.release_pos), float(self.sample_rate), float(self.attack_time),
+            float(self.decay_time), float(self.sustain_level), float(self.release_time),
+        )
+        self.stage = _ENVELOPE_STAGES[stage]
+        self.current_value = float(value)
+        self.stage_progress = float(progress)
         return output
     
     def to_dict(self) -> Dict:
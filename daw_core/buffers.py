@@ -0,0 +1,167 @@
+"""
+Audio Buffer Pool
+
+Preallocated float32 storage for port buffers.
+
+Every port buffer handed out by the pool is a view into one contiguous slab
+of shape (slots, channels, buffer_size), so the audio path never allocates.
+Slots are shared between ports whose lifetimes do not overlap in the
+execution order (linear-scan interval colouring, as used by register
+allocators), which keeps memory flat as sessions grow.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple, Hashable
+
+
+class BufferPool:
+    """
+    Fixed-size pool of audio buffers backed by a single float32 slab.
+
+    Args:
+        num_channels: Channels per buffer
+        buffer_size: Samples per buffer (the engine block size)
+        dtype: Sample type (float32 by default)
+    """
+
+    def __init__(self, num_channels: int = 2, buffer_size: int = 1024,
+                 dtype=np.float32):
+        self.num_channels = num_channels
+        self.buffer_size = buffer_size
+        self.dtype = np.dtype(dtype)
+        self._slab = np.zeros((0, num_channels, buffer_size), dtype=self.dtype)
+        self._silence = self._make_silence()
+
+    def _make_silence(self) -> np.ndarray:
+        """Shared read-only zero buffer for unconnected inputs."""
+        silence = np.zeros((self.num_channels, self.buffer_size), dtype=self.dtype)
+        silence.flags.writeable = False
+        return silence
+
+    @property
+    def capacity(self) -> int:
+        """Number of slots currently allocated."""
+        return self._slab.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the slab."""
+        return self._slab.nbytes
+
+    @property
+    def silence(self) -> np.ndarray:
+        """Read-only buffer of zeros with the pool's shape."""
+        return self._silence
+
+    def resize(self, buffer_size: int):
+        """Change the block size. Drops all slots; callers must rebind views."""
+        if buffer_size != self.buffer_size:
+            self.buffer_size = buffer_size
+            self._slab = np.zeros((0, self.num_channels, buffer_size), dtype=self.dtype)
+            self._silence = self._make_silence()
+
+    def reserve(self, num_slots: int):
+        """
+        Ensure at least num_slots buffers exist.
+
+        Growing reallocates the slab, which invalidates earlier views, so this
+        is only called while compiling a plan, never from the audio path.
+        """
+        if num_slots > self.capacity:
+            self._slab = np.zeros((num_slots, self.num_channels, self.buffer_size),
+                                  dtype=self.dtype)
+
+    def view(self, slot: int) -> np.ndarray:
+        """Return the (channels, samples) view for a slot."""
+        return self._slab[slot]
+
+
+def allocate_buffers(
+    order: Sequence[Hashable],
+    produced: Dict[Hashable, List[Hashable]],
+    last_use: Dict[Hashable, int],
+    step_of: Optional[Dict[Hashable, int]] = None,
+) -> Tuple[Dict[Hashable, int], int]:
+    """
+    Assign buffer slots to values with lifetime-based reuse.
+
+    A value (an output port or an input accumulator) is live from its
+    producer's step until the step of its last reader. A slot is only
+    handed to a new value after every value that held it has been read
+    for the last time, so a node never writes over one of its own inputs.
+
+    Steps are positions in the serial order by default. For parallel
+    execution they are dependency levels: nodes sharing a level may run
+    concurrently, so nothing read in a level is reused within it.
+
+    Args:
+        order: Nodes sorted by step
+        produced: node -> keys of the values written at that node's step
+        last_use: key -> step of the last reader;
+            values missing here stay live until the end of the block
+        step_of: node -> step (default: index in order)
+
+    Returns:
+        (buffer_table, num_slots)
+    """
+    if step_of is None:
+        step_of = {node: i for i, node in enumerate(order)}
+    end = max(step_of.values(), default=-1) + 1
+    table: Dict[Hashable, int] = {}
+    free: List[int] = []
+    expiring: Dict[int, List[int]] = {}
+    released_upto = 0
+    num_slots = 0
+
+    for node in order:
+        step = step_of[node]
+        # Slots whose last reader ran in an earlier step are free again
+        while released_upto < step:
+            free.extend(expiring.pop(released_upto, ()))
+            released_upto += 1
+
+        for key in produced.get(node, ()):
+            if free:
+                slot = free.pop()
+            else:
+                slot = num_slots
+                num_slots += 1
+            table[key] = slot
+
+            dies = last_use.get(key, end)
+            # Unread outputs are kept for the whole block so they can be inspected
+            if dies < end:
+                expiring.setdefault(max(dies, step), []).append(slot)
+
+    return table, num_slots
+
+
+def sum_into(acc: np.ndarray, sources: Sequence[np.ndarray]):
+    """Sum several buffers into an accumulator without allocating."""
+    np.copyto(acc, sources[0])
+    for src in sources[1:]:
+        np.add(acc, src, out=acc)
+
+
+def write_block(dst: np.ndarray, data: np.ndarray):
+    """
+    Copy data into a preallocated (channels, samples) buffer in place.
+
+    Mono data is broadcast to every channel; shorter data is zero padded
+    and longer data is truncated to the buffer length.
+    """
+    if data.shape == dst.shape:
+        np.copyto(dst, data, casting="unsafe")
+        return
+
+    if data.ndim == 1:
+        data = data[np.newaxis, :]
+
+    frames = min(dst.shape[-1], data.shape[-1])
+    if data.shape[0] == 1:
+        np.copyto(dst[:, :frames], data[:, :frames], casting="unsafe")
+    else:
+        channels = min(dst.shape[0], data.shape[0])
+        np.copyto(dst[:channels, :frames], data[:channels, :frames], casting="unsafe")
+        dst[channels:, :frames] = 0.0
+    dst[:, frames:] = 0.0
@@ -3,10 +3,83 @@ Audio Engine & Graph Scheduler
 
 Implements real-time graph scheduling and block-based processing.
 Handles topological sorting to ensure correct DSP order.
+
+The schedule is compiled into an ExecutionPlan and cached. The plan is only
+rebuilt when add_node/remove_node/connect bump the topology version, so the
+per-block cost of scheduling is a single list walk. Compiling a plan also
+binds every port to a view into the engine's BufferPool.
+
+Audio moves along port-level edges (src_node, src_port, dst_node, dst_port):
+an input fed by a single edge aliases the source's output buffer (no copy),
+and an input fed by several edges reads a pooled accumulator that the
+engine sums into just before the destination node runs.
+
+Nodes sleep while everything upstream is silent and their tail has
+expired (see Node.run_step); get_stats() reports how many were skipped.
+
+Block times are checked against the real-time deadline and per-node times
+are sampled into an EngineProfiler (see get_profile). Blocks run for an
+offline render (see claim_offline) are not timed, since they have no
+deadline to miss.
+
+With enable_parallel() the plan's dependency levels are processed by a
+ParallelScheduler worker pool instead of serially on the calling thread.
+
+With enable_batching() FXNodes of the same effect class within one level
+are run as a BatchStep: instances with compatible settings are stacked
+and processed by one vectorized call (see batching.py).
+
+Control threads never touch node state directly: they push timestamped
+changes into the engine's parameter_events ring, which the audio thread
+drains lock-free at the start of every block. Tracks connected through
+MixerEngine.connect_tracks route their fader changes into it as well.
 """
 
-from typing import List, Dict
-from .graph import Node
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+import numpy as np
+from typing import List, Dict, Optional, Set, Tuple
+from .graph import Node, NUM_CHANNELS
+from .buffers import BufferPool, allocate_buffers
+from .parallel import ParallelScheduler, build_levels
+from .batching import group_batches
+from .events import ParameterEventQueue, EventScheduler
+from .profiling import EngineProfiler
+
+# (src_node, src_port, dst_node, dst_port)
+Edge = Tuple[Node, int, Node, int]
+
+
+@dataclass
+class ExecutionPlan:
+    """
+    Compiled schedule for one graph topology.
+
+    - order: nodes in processing order
+    - buffer_table: (node, output_port_idx) -> buffer slot index
+    - accumulator_table: (node, input_port_idx) -> slot for multi-fan-in inputs
+    - steps: (node, [(accumulator, source_buffers), ...], upstream_nodes)
+      per scheduled node
+    - levels: steps grouped so each level only depends on earlier levels
+    - batches: BatchSteps created when batching (steps then hold them in
+      place of their member nodes)
+    - version: topology version this plan was compiled from
+    """
+    order: List[Node] = field(default_factory=list)
+    buffer_table: Dict[Tuple[Node, int], int] = field(default_factory=dict)
+    accumulator_table: Dict[Tuple[Node, int], int] = field(default_factory=dict)
+    steps: List[Tuple[Node, List[Tuple[np.ndarray, List[np.ndarray]]], List[Node]]] = field(
+        default_factory=list
+    )
+    levels: List[List[tuple]] = field(default_factory=list)
+    num_buffers: int = 0
+    buffer_size: int = 0
+    parallel: bool = False
+    batched: bool = False
+    batches: int = 0
+    version: int = -1
 
 
 class AudioEngine:
@@ -25,45 +98,190 @@ class AudioEngine:
         self.buffer_size = buffer_size
         self.nodes: List[Node] = []
         self.graph: Dict[Node, List[Node]] = {}
+        self.edges: List[Edge] = []
         self.is_running = False
+        self.rendering_offline = False  # an OfflineRenderer owns the engine
+        self._state_lock = threading.Lock()
         self.block_count = 0
+        self.sample_position = 0
+
+        # Nodes skipped because their inputs and tails were silent
+        self.nodes_skipped = 0
+        self.nodes_skipped_last_block = 0
+
+        # Incrementally maintained topological order
+        self._preds: Dict[Node, List[Node]] = {}
+        self._order: List[Node] = []
+        self._position: Dict[Node, int] = {}
+
+        # Compiled plan, rebuilt lazily when the topology version changes
+        self._topology_version = 0
+        self._plan: Optional[ExecutionPlan] = None
+        self.plan_builds = 0
+
+        # Port buffers, sized from this engine's block size
+        self.buffer_pool = BufferPool(NUM_CHANNELS, buffer_size)
+
+        # Optional multi-core execution
+        self.scheduler: Optional[ParallelScheduler] = None
+
+        # Group same-class effects into one vectorized call per level
+        self.batching = False
+
+        # Control -> audio thread parameter changes
+        self.parameter_events = ParameterEventQueue()
+        self._event_scheduler = EventScheduler(self.parameter_events)
+
+        # Block/node timing and xrun counting (see get_profile)
+        self.profiler = EngineProfiler()
+        self._block_timings: List[tuple] = []
 
     def add_node(self, node: Node):
         """Add a node to the engine."""
         if node not in self.nodes:
             self.nodes.append(node)
             self.graph[node] = []
+            self._preds[node] = []
+            # A node without edges can go anywhere; the end keeps the order valid
+            self._position[node] = len(self._order)
+            self._order.append(node)
+            self._topology_version += 1
 
     def remove_node(self, node: Node):
         """Remove a node from the engine."""
         if node in self.nodes:
             self.nodes.remove(node)
-            del self.graph[node]
-            for connected_nodes in self.graph.values():
-                if node in connected_nodes:
-                    connected_nodes.remove(node)
+            for dst in self.graph.pop(node):
+                self._preds[dst].remove(node)
+            for src in self._preds.pop(node):
+                self.graph[src].remove(node)
+            self.edges = [e for e in self.edges if e[0] is not node and e[2] is not node]
+
+            # Removing a node never invalidates the relative order of the rest
+            idx = self._position.pop(node)
+            del self._order[idx]
+            for i in range(idx, len(self._order)):
+                self._position[self._order[i]] = i
+            self._topology_version += 1
+            self.profiler.forget(node)
+
+    def connect(self, src_node: Node, dst_node: Node, src_port: int = 0, dst_port: int = 0):
+        """
+        Connect an output port of one node to an input port of another.
+
+        Several edges may feed the same input port; they are summed.
+
+        Raises:
+            ValueError: If either node has not been added to the engine
+            RuntimeError: If the connection would create a cycle
+            IndexError: If a port index does not exist on the node
+        """
+        for node in (src_node, dst_node):
+            if node not in self.graph:
+                raise ValueError(f"{node.name} has not been added to the engine")
+        if not 0 <= src_port < len(src_node.output_ports):
+            raise IndexError(f"{src_node.name} has no output port {src_port}")
+        if not 0 <= dst_port < len(dst_node.input_ports):
+            raise IndexError(f"{dst_node.name} has no input port {dst_port}")
+
+        edge = (src_node, src_port, dst_node, dst_port)
+        if edge in self.edges:
+            return
 
-    def connect(self, src_node: Node, dst_node: Node):
-        """Connect two nodes in the graph."""
-        if src_node in self.graph and dst_node in self.graph:
-            if dst_node not in self.graph[src_node]:
-                self.graph[src_node].append(dst_node)
+        if dst_node not in self.graph[src_node]:
+            self._insert_edge(src_node, dst_node)
+            self.graph[src_node].append(dst_node)
+            self._preds[dst_node].append(src_node)
+        self.edges.append(edge)
+        src_node.connect_to(dst_node, src_port, dst_port)
+        self._topology_version += 1
+
+    def disconnect(self, src_node: Node, dst_node: Node, src_port: int = 0, dst_port: int = 0):
+        """Remove a port-level connection (no-op if it does not exist)."""
+        edge = (src_node, src_port, dst_node, dst_port)
+        if edge not in self.edges:
+            return
+
+        self.edges.remove(edge)
+        src_node.connections = [
+            c for c in src_node.connections if c != (dst_node, src_port, dst_port)
+        ]
+        # Drop the node-level dependency once no port edge needs it
+        if not any(e[0] is src_node and e[2] is dst_node for e in self.edges):
+            self.graph[src_node].remove(dst_node)
+            self._preds[dst_node].remove(src_node)
+        self._topology_version += 1
+
+    def _insert_edge(self, src_node: Node, dst_node: Node):
+        """
+        Keep the topological order valid for a new edge (Pearce-Kelly).
+
+        Only the region between dst and src is touched, so adding an edge
+        that already agrees with the order costs O(1). Cycles are detected
+        here, once, instead of on every block.
+        """
+        if src_node is dst_node:
+            raise RuntimeError(f"Graph contains a cycle! ({src_node.name} -> itself)")
+
+        lower = self._position[dst_node]
+        upper = self._position[src_node]
+        if upper < lower:
+            return
+
+        # Forward search from dst, bounded by src's position
+        forward: Set[Node] = set()
+        stack = [dst_node]
+        while stack:
+            node = stack.pop()
+            if node in forward:
+                continue
+            forward.add(node)
+            for neighbor in self.graph[node]:
+                if neighbor is src_node:
+                    raise RuntimeError(
+                        f"Graph contains a cycle! ({src_node.name} -> {dst_node.name})"
+                    )
+                if neighbor not in forward and self._position[neighbor] <= upper:
+                    stack.append(neighbor)
+
+        # Backward search from src, bounded by dst's position
+        backward: Set[Node] = set()
+        stack = [src_node]
+        while stack:
+            node = stack.pop()
+            if node in backward:
+                continue
+            backward.add(node)
+            for pred in self._preds[node]:
+                if pred not in backward and self._position[pred] >= lower:
+                    stack.append(pred)
+
+        # Reuse the freed slots: everything that reaches src goes first
+        by_position = self._position.__getitem__
+        reordered = sorted(backward, key=by_position) + sorted(forward, key=by_position)
+        slots = sorted(self._position[n] for n in reordered)
+        for slot, node in zip(slots, reordered):
+            self._order[slot] = node
+            self._position[node] = slot
 
     def topological_sort(self) -> List[Node]:
         """
         Kahn's algorithm for topological sorting.
         Returns nodes in the correct processing order.
+
+        This is a full re-sort and is kept for validation; the audio path
+        uses the cached plan from get_execution_plan().
         """
         in_degree = {node: 0 for node in self.nodes}
         for node in self.nodes:
             for neighbor in self.graph.get(node, []):
                 in_degree[neighbor] += 1
 
-        queue = [node for node in self.nodes if in_degree[node] == 0]
+        queue = deque(node for node in self.nodes if in_degree[node] == 0)
         sorted_nodes = []
 
         while queue:
-            node = queue.pop(0)
+            node = queue.popleft()
             sorted_nodes.append(node)
 
             for neighbor in self.graph.get(node, []):
@@ -76,6 +294,120 @@ class AudioEngine:
 
         return sorted_nodes
 
+    def get_execution_plan(self) -> ExecutionPlan:
+        """Return the compiled plan, rebuilding it only if the topology changed."""
+        plan = self._plan
+        if (plan is None or plan.version != self._topology_version
+                or plan.buffer_size != self.buffer_size
+                or plan.parallel != (self.scheduler is not None)
+                or plan.batched != self.batching):
+            plan = self._compile_plan()
+            self._plan = plan
+        return plan
+
+    def _compile_plan(self) -> ExecutionPlan:
+        """Snapshot the maintained order, assign pool slots and bind ports."""
+        order = list(self._order)
+        parallel = self.scheduler is not None
+        batched = self.batching
+
+        # Serial plans reuse buffers along the linear order; parallel and
+        # batched plans may run a whole dependency level at once, so live
+        # ranges are measured in levels and the order is regrouped level
+        # by level.
+        if parallel or batched:
+            step_of: Dict[Node, int] = {}
+            for node in order:
+                step_of[node] = 1 + max((step_of[p] for p in self._preds[node]), default=-1)
+            order.sort(key=step_of.__getitem__)
+        else:
+            step_of = {node: i for i, node in enumerate(order)}
+
+        # Sources feeding each input port
+        fan_in: Dict[Tuple[Node, int], List[Tuple[Node, int]]] = {}
+        for src, src_port, dst, dst_port in self.edges:
+            fan_in.setdefault((dst, dst_port), []).append((src, src_port))
+
+        # Values written at each step: accumulators first, then outputs.
+        # An output stays live until its last reader has run; an
+        # accumulator is only read by the node it feeds.
+        produced: Dict[Node, List[Tuple[str, Node, int]]] = {}
+        last_use: Dict[Tuple[str, Node, int], int] = {}
+        for node in order:
+            produced[node] = [
+                ("in", node, port_idx)
+                for port_idx in range(len(node.input_ports))
+                if len(fan_in.get((node, port_idx), ())) > 1
+            ]
+            produced[node] += [("out", node, port_idx) for port_idx in range(len(node.output_ports))]
+            for key in produced[node]:
+                if key[0] == "in":
+                    last_use[key] = step_of[node]
+        for (dst, _), sources in fan_in.items():
+            for src, src_port in sources:
+                key = ("out", src, src_port)
+                last_use[key] = max(last_use.get(key, 0), step_of[dst])
+
+        slots, num_buffers = allocate_buffers(order, produced, last_use, step_of)
+        buffer_table = {(k[1], k[2]): slot for k, slot in slots.items() if k[0] == "out"}
+        accumulator_table = {(k[1], k[2]): slot for k, slot in slots.items() if k[0] == "in"}
+
+        pool = self.buffer_pool
+        pool.resize(self.buffer_size)
+        pool.reserve(num_buffers)
+        steps = self._bind_ports(order, buffer_table, accumulator_table, fan_in)
+        levels = build_levels(order, self._preds, steps)
+        batches = 0
+        if batched:
+            levels, batches = group_batches(levels)
+            steps = [step for level in levels for step in level]
+
+        self.plan_builds += 1
+        return ExecutionPlan(
+            order=order,
+            buffer_table=buffer_table,
+            accumulator_table=accumulator_table,
+            steps=steps,
+            levels=levels,
+            num_buffers=num_buffers,
+            buffer_size=self.buffer_size,
+            parallel=parallel,
+            batched=batched,
+            batches=batches,
+            version=self._topology_version,
+        )
+
+    def _bind_ports(self, order, buffer_table, accumulator_table, fan_in):
+        """
+        Point every port at its pool view and build the per-node mix steps.
+
+        Single-source inputs alias the source output; multi-source inputs
+        get their accumulator; unconnected inputs read shared silence.
+        """
+        pool = self.buffer_pool
+        for node in order:
+            for port_idx, port in enumerate(node.output_ports):
+                port.buffer = pool.view(buffer_table[(node, port_idx)])
+
+        steps = []
+        for node in order:
+            mixes = []
+            for port_idx, port in enumerate(node.input_ports):
+                sources = fan_in.get((node, port_idx), ())
+                if not sources:
+                    port.buffer = pool.silence
+                elif len(sources) == 1:
+                    src, src_port = sources[0]
+                    port.buffer = src.output_ports[src_port].buffer
+                else:
+                    port.buffer = pool.view(accumulator_table[(node, port_idx)])
+                    mixes.append((
+                        port.buffer,
+                        [src.output_ports[src_port].buffer for src, src_port in sources],
+                    ))
+            steps.append((node, mixes, list(self._preds[node])))
+        return steps
+
     def process_block(self):
         """
         Process one block of audio through the entire graph.
@@ -83,17 +415,164 @@ class AudioEngine:
         """
         if not self.is_running:
             return
+        self.run_block()
 
-        sorted_nodes = self.topological_sort()
+    def run_block(self):
+        """
+        Process one block regardless of is_running.
+
+        Used by offline rendering to drive the graph as fast as possible.
+        """
+        profiler = self.profiler
+        profiling = profiler.enabled and not self.rendering_offline
+        sampled = profiling and profiler.should_sample()
+        timings = self._block_timings
+        timings.clear()
+        block_t0 = time.perf_counter_ns()
 
-        for node in sorted_nodes:
-            node.process()
+        plan = self.get_execution_plan()
+        self._event_scheduler.dispatch(self.sample_position, self.buffer_size)
+        if self.scheduler is not None:
+            skipped = self.scheduler.run_block(
+                plan.levels, profiler if sampled else None, timings
+            )
+        elif sampled:
+            skipped = 0
+            perf_ns = time.perf_counter_ns
+            record = profiler.record_node
+            for node, mixes, upstream in plan.steps:
+                t0 = perf_ns()
+                if not node.run_step(mixes, upstream):
+                    skipped += 1
+                elapsed = perf_ns() - t0
+                record(node, elapsed)
+                timings.append((node, elapsed))
+        else:
+            skipped = 0
+            for node, mixes, upstream in plan.steps:
+                if not node.run_step(mixes, upstream):
+                    skipped += 1
+        self.nodes_skipped_last_block = skipped
+        self.nodes_skipped += skipped
+
+        if profiling:
+            deadline_ns = self.buffer_size * 1_000_000_000 // self.sample_rate
+            profiler.end_block(time.perf_counter_ns() - block_t0, deadline_ns, sampled, timings)
 
         self.block_count += 1
+        self.sample_position += self.buffer_size
+
+    def schedule_parameter(self, target, param: str, value, sample_time: int = -1) -> bool:
+        """
+        Queue a parameter change for the audio thread (any control thread).
+
+        Args:
+            target: Node, effect or track owning the parameter
+            param: Parameter name (applied via apply_event, set_<param> or setattr)
+            value: New value
+            sample_time: Absolute sample to apply at (-1 = next block)
+
+        Returns:
+            False if the queue was full and the change was dropped
+        """
+        return self.parameter_events.push(target, param, value, sample_time)
+
+    def seek(self, sample_pos: int):
+        """Move every streaming node (and the engine clock) to a sample position."""
+        self.sample_position = max(0, int(sample_pos))
+        for node in self.nodes:
+            node.seek(self.sample_position)
+
+    def get_session_length(self) -> int:
+        """Length in samples of the longest source in the graph."""
+        return max((getattr(node, "length", 0) for node in self.nodes), default=0)
+
+    def get_latency(self, node: Optional[Node] = None) -> int:
+        """
+        Processing latency in samples: the longest sum of node latencies on
+        any path ending at node (default: the worst path in the graph).
+        """
+        path_latency: Dict[Node, int] = {}
+        for current in self._order:
+            upstream = max((path_latency[p] for p in self._preds[current]), default=0)
+            path_latency[current] = upstream + current.get_latency_samples()
+        if node is not None:
+            return path_latency.get(node, 0)
+        return max(path_latency.values(), default=0)
+
+    def enable_parallel(self, num_workers: Optional[int] = None, pin_threads: bool = True):
+        """
+        Process independent branches on a persistent worker pool.
+
+        Args:
+            num_workers: Threads doing DSP, including the calling thread
+                (default: available CPUs)
+            pin_threads: Pin background workers to individual CPUs
+        """
+        self.disable_parallel()
+        self.scheduler = ParallelScheduler(num_workers, pin_threads)
+        self.scheduler.start()
+
+    def disable_parallel(self):
+        """Stop the worker pool and return to serial processing."""
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+
+    def enable_batching(self, enabled: bool = True):
+        """
+        Run instances of one effect class in the same dependency level
+        (e.g. a Compressor on every track) through one vectorized call.
+
+        Takes effect when the plan is next used.
+        """
+        self.batching = enabled
+
+    def set_profile_sampling(self, sample_every: int = 1, enabled: bool = True):
+        """
+        Configure profiling overhead.
+
+        Args:
+            sample_every: Time individual nodes on 1 in N blocks
+                (block totals and xruns are always measured)
+            enabled: Turn all timing on or off
+        """
+        self.profiler.set_sampling(sample_every)
+        self.profiler.enabled = enabled
+
+    def get_profile(self, top: int = 5, histograms: bool = False) -> dict:
+        """Per-node timing percentiles, block load vs deadline, xruns, top offenders."""
+        return self.profiler.report(top, histograms)
+
+    def claim_offline(self):
+        """
+        Reserve the engine for an offline render.
+
+        Raises:
+            RuntimeError: If it is playing or another render holds it
+        """
+        with self._state_lock:
+            if self.is_running:
+                raise RuntimeError("Stop the realtime engine before rendering offline")
+            if self.rendering_offline:
+                raise RuntimeError("Another offline render is using the engine")
+            self.rendering_offline = True
+
+    def release_offline(self):
+        """End an offline render started with claim_offline()."""
+        self.rendering_offline = False
 
     def start(self):
-        """Start the audio engine."""
-        self.is_running = True
+        """
+        Start the audio engine.
+
+        Raises:
+            RuntimeError: If an offline render is using the engine
+        """
+        with self._state_lock:
+            if self.rendering_offline:
+                raise RuntimeError("An offline render is using the engine")
+            self.is_running = True
         print(f"[AudioEngine] Started. Sample rate: {self.sample_rate}, Buffer: {self.buffer_size}")
 
     def stop(self):
@@ -108,5 +587,19 @@ class AudioEngine:
             "buffer_size": self.buffer_size,
             "num_nodes": len(self.nodes),
             "block_count": self.block_count,
+            "sample_position": self.sample_position,
+            "nodes_skipped": self.nodes_skipped,
+            "nodes_skipped_last_block": self.nodes_skipped_last_block,
+            "xruns": self.profiler.xruns,
             "is_running": self.is_running,
+            "rendering_offline": self.rendering_offline,
+            "topology_version": self._topology_version,
+            "plan_builds": self.plan_builds,
+            "buffer_slots": self._plan.num_buffers if self._plan else 0,
+            "buffer_pool_bytes": self.buffer_pool.nbytes,
+            "parallel": self.scheduler.get_stats() if self.scheduler else None,
+            "batch_steps": self._plan.batches if self._plan else 0,
+            "parameter_events_applied": self._event_scheduler.events_applied,
+            "parameter_events_pending": len(self._event_scheduler),
+            "parameter_events_dropped": self.parameter_events.dropped,
         }
@@ -0,0 +1,143 @@
+"""
+Parameter Event Queue
+
+Lock-free hand-off of parameter changes from control threads (API
+handlers, UI automation) to the audio thread.
+
+Control threads push timestamped events into a ring; the audio thread
+drains it at the start of every block and applies each event at its sample
+offset inside the block. The audio thread never takes a lock: the consumer
+only advances the read index and the producer only advances the write
+index, and each index is published with a single attribute store (atomic
+under the GIL) after the slot it guards has been written or read. Pushes
+from several control threads (API handlers, tracks) are serialized by a
+producer-side lock that the consumer never touches.
+
+Nodes and effects that can change a parameter mid-block implement
+apply_event(param, value, offset); anything else receives the change at
+block start through its set_<param>() method (or plain attribute).
+"""
+
+import heapq
+import itertools
+import threading
+from typing import Any, List, Optional, Tuple
+
+
+class ParameterEventQueue:
+    """
+    Fixed-capacity ring of (target, param, value, sample_time) events.
+
+    Any number of threads may call push(); exactly one thread (the audio
+    thread) may call pop().
+
+    Args:
+        capacity: Maximum number of undrained events
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self._slots: List[Optional[tuple]] = [None] * capacity
+        self._write = 0  # only advanced by the producer
+        self._read = 0   # only advanced by the consumer
+        self._push_lock = threading.Lock()  # producers only
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._write - self._read
+
+    def push(self, target: Any, param: str, value: Any, sample_time: int = -1) -> bool:
+        """
+        Enqueue a parameter change (producer side).
+
+        Args:
+            target: Object owning the parameter
+            param: Parameter name
+            value: New value
+            sample_time: Absolute engine sample at which to apply the change
+                (-1 = start of the next block)
+
+        Returns:
+            False if the ring was full and the event was dropped
+        """
+        with self._push_lock:
+            write = self._write
+            if write - self._read >= self.capacity:
+                self.dropped += 1
+                return False
+            self._slots[write % self.capacity] = (target, param, value, sample_time)
+            self._write = write + 1  # publish after the slot is written
+            return True
+
+    def pop(self) -> Optional[tuple]:
+        """Dequeue the oldest event, or None if empty (consumer side)."""
+        read = self._read
+        if read == self._write:
+            return None
+        idx = read % self.capacity
+        event = self._slots[idx]
+        self._slots[idx] = None
+        self._read = read + 1  # release the slot after it has been read
+        return event
+
+
+def apply_parameter_event(target: Any, param: str, value: Any, offset: int = 0):
+    """
+    Apply one parameter change on the audio thread.
+
+    Prefers target.apply_event(param, value, offset) for sample-accurate
+    changes, then target.set_<param>(value), then setattr.
+    """
+    apply_event = getattr(target, "apply_event", None)
+    if apply_event is not None:
+        apply_event(param, value, offset)
+        return
+    setter = getattr(target, f"set_{param}", None)
+    if setter is not None:
+        setter(value)
+    else:
+        setattr(target, param, value)
+
+
+class EventScheduler:
+    """
+    Audio-thread side of the parameter queue.
+
+    Drains the ring every block and keeps events stamped for later blocks
+    in a time-ordered heap until their block comes up.
+    """
+
+    def __init__(self, queue: ParameterEventQueue):
+        self.queue = queue
+        self._pending: List[Tuple[int, int, tuple]] = []
+        self._seq = itertools.count()  # keeps FIFO order for equal timestamps
+        self.events_applied = 0
+
+    def __len__(self) -> int:
+        return len(self._pending) + len(self.queue)
+
+    def dispatch(self, block_start: int, block_size: int) -> int:
+        """
+        Apply every event due in [block_start, block_start + block_size).
+
+        Late events (stamped before the block) are applied at offset 0.
+
+        Returns:
+            Number of events applied
+        """
+        pending = self._pending
+        pop = self.queue.pop
+        event = pop()
+        while event is not None:
+            sample_time = event[3] if event[3] >= 0 else block_start
+            heapq.heappush(pending, (sample_time, next(self._seq), event))
+            event = pop()
+
+        block_end = block_start + block_size
+        applied = 0
+        while pending and pending[0][0] < block_end:
+            sample_time, _, (target, param, value, _) = heapq.heappop(pending)
+            apply_parameter_event(target, param, value, max(0, sample_time - block_start))
+            applied += 1
+        self.events_applied += applied
+        return applied
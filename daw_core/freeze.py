@@ -0,0 +1,226 @@
+"""
+Track Freeze
+
+Renders a track's source through its insert chain once and replays the
+result from a memory-mapped float32 cache instead of running the inserts.
+
+The cache is identified by a content hash of everything that affects the
+rendered audio: each insert's to_dict() (minus runtime buffers such as
+delay lines), insert order and bypass state, the track's input gain and the
+source samples. Freezing a track whose hash matches an existing cache file
+reuses it; any change to the chain produces a new hash, which invalidates
+the frozen audio.
+
+Insert edits made through the track (add/remove/reorder_inserts,
+set_insert_param) re-check the hash at once, and the frozen node re-checks
+it on every seek; hashing is too costly for the audio thread, so an
+effect edited directly is only caught at the next seek or
+validate_freeze(). Once invalidated the node stops streaming the cache and
+runs the track's source through the live inserts in its place, so the
+engine plays the edit without a graph rebuild; rebuilding (see
+MixerEngine.connect_tracks) swaps in the live chain itself.
+
+Usage:
+    track.freeze(cache_dir="freeze_cache")
+    ...
+    track.set_insert_param(0, "gain", -3.0)   # unfreezes: chain changed
+    track.validate_freeze()   # after editing an effect directly
+"""
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+from .buffers import write_block
+from .graph import AudioInput, NUM_CHANNELS
+
+
+# to_dict() keys holding DSP runtime state rather than parameters
+RUNTIME_STATE_KEYS = frozenset({"buffer", "write_pos", "filter_store"})
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "daw_freeze")
+
+
+def _strip_runtime_state(value):
+    """Drop runtime buffers from a (nested) to_dict() result."""
+    if isinstance(value, dict):
+        return {k: _strip_runtime_state(v) for k, v in value.items() if k not in RUNTIME_STATE_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [_strip_runtime_state(v) for v in value]
+    return value
+
+
+def _insert_state(fx) -> dict:
+    """Parameters of one insert node for hashing."""
+    state = {"name": fx.name, "enabled": fx.enabled}
+    effect = getattr(fx.fx_fn, "__self__", None)
+    if effect is not None and hasattr(effect, "to_dict"):
+        state["effect"] = _strip_runtime_state(effect.to_dict())
+    else:
+        # Plain functions can only be identified by their code
+        fn = fx.fx_fn
+        state["fn"] = f"{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', repr(fn))}"
+    return state
+
+
+def chain_state(track) -> str:
+    """Input gain and insert parameters as canonical JSON (no source audio)."""
+    chain = {
+        "input_gain": track.input_gain,
+        "inserts": [_insert_state(fx) for fx in track.inserts],
+    }
+    return json.dumps(chain, sort_keys=True, default=str)
+
+
+def chain_hash(track) -> str:
+    """Content hash of a track's source, input gain and insert chain."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(chain_state(track).encode())
+    source = _track_source(track)
+    if source is not None:
+        h.update(str((source.shape, source.dtype.str)).encode())
+        h.update(np.ascontiguousarray(source).data)
+    return h.hexdigest()
+
+
+def _track_source(track) -> Optional[np.ndarray]:
+    node = track.input_node
+    if isinstance(node, AudioInput) and node.data is not None:
+        return node.data
+    return None
+
+
+def _copy_inserts(track) -> list:
+    """
+    Private copies of a track's inserts with their DSP state reset.
+
+    Renders run on the copies so they neither race the audio thread on the
+    live effects nor pick up (or clear) their tails. Effects reset through
+    reset() or clear(), so both are called when present.
+    """
+    memo = {}
+    inserts = []
+    for fx in track.inserts:
+        fx = copy.copy(fx)
+        fx.connections = []
+        fx.fx_fn = copy.deepcopy(fx.fx_fn, memo)  # shared effects stay shared
+        effect = getattr(fx.fx_fn, "__self__", None)
+        for name in ("reset", "clear"):
+            method = getattr(effect, name, None)
+            if callable(method):
+                method()
+        inserts.append(fx)
+    return inserts
+
+
+def run_inserts(inserts, signal: np.ndarray) -> np.ndarray:
+    """Run one block through the enabled inserts in order."""
+    for fx in inserts:
+        if not fx.enabled:
+            continue
+        if fx.in_place:
+            out = np.empty_like(signal)
+            fx.fx_fn(signal, out=out)
+            signal = out
+        else:
+            signal = fx.fx_fn(signal)
+    return signal
+
+
+def render_chain(track, path: str, block_size: int = 1024, max_tail_seconds: float = 10.0,
+                 sample_rate: int = 44100) -> np.memmap:
+    """
+    Render the track's source through its inserts into a .npy memmap.
+
+    The render continues past the end of the source for the longest insert
+    tail (capped at max_tail_seconds) so reverb and delay tails are kept.
+    """
+    source = _track_source(track)
+    if source is None:
+        raise ValueError(f"Track '{track.name}' has no audio source to freeze")
+    if source.ndim == 1:
+        source = source[np.newaxis, :]
+
+    inserts = _copy_inserts(track)
+    tail = max((fx.get_tail_samples() for fx in inserts if fx.enabled), default=0)
+    tail = min(tail, int(max_tail_seconds * sample_rate))
+    length = source.shape[-1] + tail
+    input_gain = np.float32(10.0 ** (track.input_gain / 20.0))
+
+    tmp_path = path + ".partial.npy"
+    cache = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32,
+                                      shape=(NUM_CHANNELS, length))
+    block = np.zeros((NUM_CHANNELS, block_size), dtype=np.float32)
+    for pos in range(0, length, block_size):
+        write_block(block, source[:, pos:pos + block_size])
+        signal = run_inserts(inserts, block * input_gain)
+        frames = min(block_size, length - pos)
+        write_block(cache[:, pos:pos + frames], np.asarray(signal)[..., :frames])
+    cache.flush()
+    del cache
+    os.replace(tmp_path, path)
+    return np.load(path, mmap_mode="r")
+
+
+class FrozenSource(AudioInput):
+    """
+    Streams a frozen track's cache in place of its source and inserts.
+
+    Every seek (transport relocation, render start) re-checks the chain
+    hash, so edits made while frozen invalidate the cache. Once the track
+    is unfrozen the node is stale: it renders the source through the live
+    inserts instead, until the graph is rebuilt without it.
+    """
+
+    def __init__(self, track, data: np.ndarray, content_hash: str, path: str):
+        super().__init__(f"{track.name} (frozen)", data)
+        self.track = track
+        self.content_hash = content_hash
+        self.path = path
+        self.stale = False
+
+    def seek(self, sample_pos: int):
+        """Move the stream position after validating the cache."""
+        super().seek(sample_pos)
+        self.track.validate_freeze()
+
+    def process(self):
+        """Stream the cache, or the live chain once invalidated."""
+        if not self.stale:
+            super().process()
+            return
+
+        out = self.get_output(0)
+        frames = out.shape[-1]
+        source = _track_source(self.track)
+        if not self.enabled or source is None:
+            self.clear_output()
+        else:
+            block = np.zeros(out.shape, dtype=np.float32)
+            write_block(block, source[..., self.position:self.position + frames])
+            gain = np.float32(10.0 ** (self.track.input_gain / 20.0))
+            self.set_output(run_inserts(self.track.inserts, block * gain))
+        self.position += frames
+
+
+def freeze_track(track, cache_dir: Optional[str] = None, block_size: int = 1024,
+                 sample_rate: int = 44100, max_tail_seconds: float = 10.0) -> FrozenSource:
+    """
+    Render (or reuse) a track's freeze cache and return its playback node.
+
+    Cache files are named <track_id>-<hash>.npy inside cache_dir.
+    """
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    content_hash = chain_hash(track)
+    path = os.path.join(cache_dir, f"{track.id}-{content_hash}.npy")
+    if os.path.exists(path):
+        data = np.load(path, mmap_mode="r")
+    else:
+        data = render_chain(track, path, block_size, max_tail_seconds, sample_rate)
+    return FrozenSource(track, data, content_hash, path)
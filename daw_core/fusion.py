@@ -0,0 +1,175 @@
+"""
+Insert Chain Fusion
+
+Runs a track's whole insert chain as one graph node and fuses runs of
+consecutive linear, time-invariant stages into a single kernel.
+
+An effect opts in by implementing linear_response(), returning
+(sos, matrix):
+- sos: (sections, 6) filter applied identically to every channel, or None
+- matrix: 2x2 channel matrix (gain, width, ...), or None
+(None, None) means the effect is currently a no-op; returning None
+means it is not linear right now (e.g. a linear-phase EQ) and it runs
+unfused.
+
+Within a run all filters are concatenated into one SOS cascade and all
+matrices multiplied into one 2x2 matrix. This is exact because a filter
+applied identically to every channel commutes with channel mixing. Bypassed
+stages (disabled node or effect) are dropped. The plan is rebuilt every
+block from the stages' current responses; a run's cascade is re-fused only
+when one of its coefficient arrays changed, and then ramps over like any
+other SOSFilter coefficient change. Fused stages are kept by run position
+rather than membership, so bypassing a member re-fuses the same stage
+(keeping its filter state) instead of starting a fresh one.
+
+Fusion works on the engine's stereo (2, samples) blocks; other layouts run
+the stages one by one.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .fx.filter_engine import SOSFilter
+from .graph import FXNode, Node, SAMPLE_RATE
+
+
+PASSTHROUGH_SOS = np.array([[1.0, 0.0, 0.0, 1.0, 0.0, 0.0]])
+
+def _effect(fx: FXNode):
+    return getattr(fx.fx_fn, "__self__", None)
+
+
+def linear_response(fx: FXNode):
+    """(sos, matrix) of an insert, (None, None) if bypassed, None if not fusable."""
+    if not fx.enabled:
+        return None, None
+    response = getattr(_effect(fx), "linear_response", None)
+    if response is None or fx.in_place:
+        return None
+    return response()
+
+
+def _apply(fx: FXNode, signal: np.ndarray) -> np.ndarray:
+    """Run one insert the way FXNode.process would."""
+    if fx.in_place:
+        out = np.empty_like(signal)
+        fx.fx_fn(signal, out=out)
+        return out
+    return fx.fx_fn(signal)
+
+
+class FusedStage:
+    """
+    One SOS cascade followed by one 2x2 channel matrix, with filter state.
+    """
+
+    def __init__(self, sample_rate: float = SAMPLE_RATE):
+        self.filter = SOSFilter(sample_rate=sample_rate)
+        self.sources: Tuple[np.ndarray, ...] = ()
+        self.matrix: Optional[np.ndarray] = None
+
+    def update(self, sos_list: Sequence[np.ndarray], matrix: Optional[np.ndarray]):
+        """Re-fuse the cascade if any stage's coefficients changed."""
+        if len(sos_list) != len(self.sources) or any(
+                a is not b for a, b in zip(sos_list, self.sources)):
+            self.sources = tuple(sos_list)
+            if self.sources:
+                self.filter.set_sos(np.vstack(self.sources))
+            elif self.filter.sos is not None:
+                self.filter.set_sos(PASSTHROUGH_SOS)  # ramp out the last filter
+        self.matrix = matrix
+
+    def process(self, signal: np.ndarray) -> np.ndarray:
+        """Filter, then mix channels."""
+        if self.sources or self.filter.ramping:
+            signal = self.filter.process(signal)
+        if self.matrix is not None:
+            signal = self.matrix @ signal
+        return signal
+
+
+class InsertChain(Node):
+    """
+    Graph node running a list of inserts, fusing linear runs.
+
+    The list is read every block, so adding, removing or toggling inserts
+    needs no graph rebuild.
+
+    Args:
+        name: Node name
+        inserts: FXNodes in chain order (shared, e.g. Track.inserts)
+        sample_rate: Sample rate for coefficient ramps
+    """
+
+    def __init__(self, name: str, inserts: List[FXNode], sample_rate: float = SAMPLE_RATE):
+        super().__init__(name, num_inputs=1, num_outputs=1)
+        self.inserts = inserts
+        self.sample_rate = sample_rate
+        self._fused: List[FusedStage] = []  # by run position in the plan
+
+    def get_tail_samples(self) -> int:
+        """Longest tail of the enabled inserts."""
+        return max((fx.get_tail_samples() for fx in self.inserts if fx.enabled), default=0)
+
+    def get_latency_samples(self) -> int:
+        """Latencies of the enabled inserts add up along the chain."""
+        return sum(fx.get_latency_samples() for fx in self.inserts if fx.enabled)
+
+    def plan(self) -> list:
+        """
+        Current chain as a list of FXNodes (run unfused) and FusedStages.
+        """
+        steps: list = []
+        run: List[int] = []
+        sos_list: List[np.ndarray] = []
+        matrix: Optional[np.ndarray] = None
+        fused: List[FusedStage] = []
+
+        def close_run():
+            if run:
+                if len(fused) < len(self._fused):
+                    stage = self._fused[len(fused)]
+                else:
+                    stage = FusedStage(self.sample_rate)
+                stage.update(sos_list, matrix)
+                fused.append(stage)
+                steps.append(stage)
+
+        for i, fx in enumerate(self.inserts):
+            response = linear_response(fx)
+            if response is None:
+                close_run()
+                run, sos_list, matrix = [], [], None
+                steps.append(fx)
+                continue
+            sos, mix = response
+            if sos is None and mix is None:
+                continue
+            run.append(i)
+            if sos is not None:
+                sos_list.append(sos)
+            if mix is not None:
+                mix = np.asarray(mix, dtype=np.float64)
+                matrix = mix if matrix is None else mix @ matrix
+        close_run()
+        self._fused = fused
+        return steps
+
+    def run(self, signal: np.ndarray) -> np.ndarray:
+        """Process a block through the chain."""
+        if signal.ndim != 2 or signal.shape[0] != 2:
+            for fx in self.inserts:
+                if fx.enabled:
+                    signal = _apply(fx, signal)
+            return signal
+        for step in self.plan():
+            signal = step.process(signal) if isinstance(step, FusedStage) else _apply(step, signal)
+        return signal
+
+    def process(self):
+        """Apply the chain to the input."""
+        if not self.enabled:
+            self.set_output(self.get_input(0))
+            return
+        self.set_output(self.run(self.get_input(0)))
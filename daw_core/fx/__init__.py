@@ -18,6 +18,8 @@ Effect Categories:
 2. Dynamic Processors (In Progress)
    - Compressor: VCA-style with lookahead and soft knee
    - Limiter: Hard compressor variant
+   - LookaheadLimiter: True-peak brickwall limiter with lookahead
+   - MultibandCompressor: Linkwitz-Riley bands, each with its own compressor
    - Expander: Inverse compressor
    - Gate: Silence noise below threshold
 
@@ -35,6 +37,7 @@ Effect Categories:
    - PlateReverb: Plate reverb algorithm
    - RoomReverb: Small/medium room simulation
    - HallReverb: Concert hall simulation
+   - ConvolutionReverb: Partitioned FFT convolution with WAV impulse responses
 
 6. Analysis & Metering (Planned)
    - LevelMeter: RMS + Peak metering
@@ -71,6 +74,14 @@ Integration with DAW:
     track.add_insert("compressor", comp_settings)
     
     The audio engine processes track audio through all inserts in order.
+
+Kernel Backends:
+
+    Per-sample recursions (envelope followers, reverb combs/allpasses) run
+    on kernels compiled with numba when it is installed and on NumPy
+    otherwise. Call warm_up_kernels() at startup so compilation does not
+    land in the first audio block; get_effect_backends() reports which
+    backend each effect is using.
 """
 
 from .eq_and_dynamics import (
@@ -80,6 +91,8 @@ from .eq_and_dynamics import (
 )
 from .dynamics_part2 import (
     Limiter,
+    LookaheadLimiter,
+    MultibandCompressor,
     Expander,
     Gate,
     NoiseGate,
@@ -101,8 +114,47 @@ from .reverb import (
     HallReverb,
     PlateReverb,
     RoomReverb,
+    ConvolutionReverb,
+)
+from .modulation_and_utility import DynamicEQ
+from .kernels import (
+    HAS_NUMBA,
+    get_backend,
+    kernel_backends,
+    set_backend,
+    warm_up as warm_up_kernels,
 )
 
+# Kernels each effect's process() runs on, as declared by its KERNELS
+EFFECT_KERNELS = {
+    cls.__name__: cls.KERNELS
+    for cls in (
+        EQ3Band, HighLowPass, Compressor,
+        Limiter, LookaheadLimiter, MultibandCompressor, Expander, Gate, NoiseGate,
+        Saturation, HardClip, Distortion, WaveShaper,
+        SimpleDelay, PingPongDelay, MultiTapDelay, StereoDelay,
+        Reverb, HallReverb, PlateReverb, RoomReverb, ConvolutionReverb,
+        DynamicEQ,
+    )
+    if getattr(cls, "KERNELS", ())
+}
+
+
+def get_effect_backends() -> dict:
+    """
+    Backend each effect's inner loops are running on.
+
+    Returns:
+        Effect name -> "numba" or "numpy" for effects with kernels;
+        every other effect is plain NumPy/SciPy
+    """
+    backends = kernel_backends()
+    return {
+        name: "numba" if all(backends[k] == "numba" for k in kernels) else "numpy"
+        for name, kernels in EFFECT_KERNELS.items()
+    }
+
+
 __all__ = [
     # EQ
     "EQ3Band",
@@ -110,6 +162,8 @@ __all__ = [
     # Dynamics
     "Compressor",
     "Limiter",
+    "LookaheadLimiter",
+    "MultibandCompressor",
     "Expander",
     "Gate",
     "NoiseGate",
@@ -128,6 +182,15 @@ __all__ = [
     "PlateReverb",
     "RoomReverb",
     "HallReverb",
+    "ConvolutionReverb",
+    # Kernel backends
+    "HAS_NUMBA",
+    "EFFECT_KERNELS",
+    "get_backend",
+    "set_backend",
+    "kernel_backends",
+    "warm_up_kernels",
+    "get_effect_backends",
     # "LevelMeter",
     # "SpectrumAnalyzer",
     # "Correlometer",
@@ -3,10 +3,150 @@ Delay Effects - Phase 2.5
 
 Professional time-based delay effects with circular buffer architecture.
 Includes SimpleDelay, PingPongDelay, and MultiTap delays with tempo sync.
+
+All effects are built on DelayLine, a multi-channel circular buffer that
+is read and written in whole blocks through wrap-around slices. Feedback
+paths are processed in chunks of at most one delay length: everything a
+chunk reads was written before the chunk started, so each chunk is a few
+array operations instead of a per-sample loop.
+
+Feedback and mix changes are ramped per block (see smoothing.py). A new
+delay time crossfades from the old read position to the new one over the
+smoothing time instead of jumping.
 """
 
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence
+
+from .smoothing import Block, SmoothedParameter, ramp_slice
+
+
+# Level at which a feedback tail counts as silent (-80 dB)
+TAIL_THRESHOLD = 1e-4
+
+
+def feedback_tail_samples(delay_samples: int, feedback: float) -> int:
+    """Samples until a feedback delay's repeats decay below TAIL_THRESHOLD."""
+    if feedback <= 0.0:
+        return int(delay_samples)
+    repeats = int(np.ceil(np.log(TAIL_THRESHOLD) / np.log(feedback)))
+    return int(delay_samples) * (repeats + 1)
+
+
+class DelayLine:
+    """
+    Multi-channel circular delay buffer with block reads and writes.
+
+    A read of n samples at delay d returns what was written d to d - n + 1
+    samples ago, so it only depends on earlier writes when n <= d.
+
+    Args:
+        max_delay: Buffer length in samples (longest usable delay)
+        channels: Number of channels (rows)
+    """
+
+    def __init__(self, max_delay: int, channels: int = 1):
+        self.size = max(1, int(max_delay))
+        self.buffer = np.zeros((channels, self.size), dtype=np.float32)
+        self.write_pos = 0
+
+    @property
+    def channels(self) -> int:
+        return self.buffer.shape[0]
+
+    def _span(self, start: int, num_samples: int):
+        """Up to two (buffer, block) slice pairs covering a wrapped range."""
+        first = min(num_samples, self.size - start)
+        yield slice(start, start + first), slice(0, first)
+        if first < num_samples:
+            yield slice(0, num_samples - first), slice(first, num_samples)
+
+    def read(self, delay: int, num_samples: int) -> np.ndarray:
+        """Block of num_samples starting delay samples behind the write head."""
+        out = np.empty((self.channels, num_samples), dtype=self.buffer.dtype)
+        start = (self.write_pos - int(delay)) % self.size
+        for src, dst in self._span(start, num_samples):
+            out[:, dst] = self.buffer[:, src]
+        return out
+
+    def gather(self, delays: Sequence[int], num_samples: int) -> np.ndarray:
+        """Several taps at once as a (channels, taps, samples) array."""
+        idx = (self.write_pos - np.asarray(delays)[:, None] + np.arange(num_samples)) % self.size
+        return self.buffer[:, idx]
+
+    def write(self, block: np.ndarray):
+        """Append a (channels, samples) block and advance the write head."""
+        num_samples = block.shape[-1]
+        if num_samples > self.size:
+            block = block[..., -self.size:]
+            self.write_pos = (self.write_pos + num_samples - self.size) % self.size
+            num_samples = self.size
+        for dst, src in self._span(self.write_pos, num_samples):
+            self.buffer[:, dst] = block[..., src]
+        self.write_pos = (self.write_pos + num_samples) % self.size
+
+    def feedback(self, signal: np.ndarray, delay: int, amount: Block,
+                 fade_from: Optional[int] = None, fade: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Run a feedback delay over a block.
+
+        Writes clip(signal + amount * delayed, -1, 1) and returns the delayed
+        (wet) signal, in chunks of at most one delay length.
+
+        Args:
+            amount: Feedback, a float or a per-sample ramp
+            fade_from, fade: While changing delay time, the old delay and a
+                per-sample 0 -> 1 crossfade from its read head to the new one
+        """
+        delay = max(1, int(delay))
+        chunk = delay if fade is None else max(1, min(delay, int(fade_from)))
+        num_samples = signal.shape[-1]
+        wet = np.empty((self.channels, num_samples), dtype=self.buffer.dtype)
+        for start in range(0, num_samples, chunk):
+            end = min(start + chunk, num_samples)
+            delayed = self.read(delay, end - start)
+            if fade is not None:
+                old = self.read(fade_from, end - start)
+                delayed = old + (delayed - old) * fade[start:end]
+            wet[:, start:end] = delayed
+            self.write(np.clip(signal[..., start:end] + delayed * ramp_slice(amount, start, end),
+                               -1.0, 1.0))
+        return wet
+
+    def clear(self):
+        """Zero the buffer and rewind the write head."""
+        self.buffer.fill(0)
+        self.write_pos = 0
+
+
+class _DelayTime:
+    """
+    Delay time in use, crossfading to a new time over SMOOTHING_MS.
+
+    A change during a crossfade restarts it from the previous new time.
+    """
+
+    def __init__(self, sample_rate: float):
+        self.delay: Optional[int] = None
+        self.fade_from: Optional[int] = None
+        self._fade = SmoothedParameter(1.0, sample_rate=sample_rate)
+
+    def next(self, delay: int, num_samples: int) -> Optional[np.ndarray]:
+        """Crossfade ramp for this block, or None when not changing."""
+        delay = int(delay)
+        if self.delay is None:
+            self.delay = delay
+        elif delay != self.delay:
+            self.fade_from, self.delay = self.delay, delay
+            self._fade.snap(0.0)
+            self._fade.set_target(1.0)
+        fade = self._fade.next(num_samples)
+        return fade if isinstance(fade, np.ndarray) else None
+
+
+def _as_channels(signal: np.ndarray) -> np.ndarray:
+    """View a mono or multi-channel signal as (channels, samples)."""
+    return signal.reshape(-1, signal.shape[-1])
 
 
 class SimpleDelay:
@@ -37,11 +177,21 @@ class SimpleDelay:
         self.mix = 0.5  # 0-1
         self.ping_pong = False  # Stereo bouncing
         
-        # State - circular buffer
+        # State - circular buffer (one row per channel, sized on first block)
         self.max_delay_samples = int(5.0 * sample_rate / 1000.0)  # 5 seconds
-        self.delay_buffer = np.zeros(self.max_delay_samples, dtype=np.float32)
-        self.write_pos = 0
-        self.channel_count = 2
+        self._line = DelayLine(self.max_delay_samples)
+        self._time = _DelayTime(sample_rate)
+        self._feedback = SmoothedParameter(self.feedback, sample_rate=sample_rate)
+        self._mix = SmoothedParameter(self.mix, sample_rate=sample_rate)
+
+    @property
+    def delay_buffer(self) -> np.ndarray:
+        """Delay line contents, one row per channel."""
+        return self._line.buffer
+
+    @property
+    def write_pos(self) -> int:
+        return self._line.write_pos
 
     def _ms_to_samples(self, ms: float) -> int:
         """Convert milliseconds to sample count."""
@@ -53,33 +203,21 @@ class SimpleDelay:
         if not self.enabled or signal.size == 0:
             return signal
         
+        x = _as_channels(signal)
+        if x.shape[0] != self._line.channels:
+            self._line = DelayLine(self.max_delay_samples, x.shape[0])
+
+        num_samples = x.shape[-1]
         delay_samples = self._ms_to_samples(self.time_ms)
-        output = np.zeros_like(signal)
-        feedback_linear = np.clip(self.feedback, 0, 0.95)
-        
-        for i in range(signal.shape[-1]):
-            # Calculate read position
-            read_pos = (self.write_pos - delay_samples) % self.max_delay_samples
-            
-            # Read delayed sample
-            delayed = self.delay_buffer[read_pos]
-            
-            # Write new value (input + feedback)
-            new_val = signal[i] + delayed * feedback_linear
-            self.delay_buffer[self.write_pos] = np.clip(new_val, -1.0, 1.0)
-            
-            # Stereo ping-pong effect
-            if self.ping_pong and signal.ndim == 2:
-                # Alternate channels between left and right
-                pass  # Handled in stereo process
-            
-            # Mix wet and dry
-            output[i] = signal[i] * (1 - self.mix) + delayed * self.mix
-            
-            # Advance write position
-            self.write_pos = (self.write_pos + 1) % self.max_delay_samples
-        
-        return output
+        fade = self._time.next(delay_samples, num_samples)
+        feedback_linear = self._feedback.next(num_samples, np.clip(self.feedback, 0, 0.95))
+        delayed = self._line.feedback(x, delay_samples, feedback_linear,
+                                      self._time.fade_from, fade)
+
+        # Mix wet and dry
+        mix = self._mix.next(num_samples, self.mix)
+        output = x * (1 - mix) + delayed * mix
+        return output.reshape(signal.shape).astype(signal.dtype, copy=False)
 
     def set_time(self, ms: float):
         """Set delay time in milliseconds."""
@@ -97,10 +235,13 @@ class SimpleDelay:
         """Enable stereo ping-pong bouncing."""
         self.ping_pong = enabled
 
+    def get_tail_samples(self) -> int:
+        """Length of the feedback tail after the input stops."""
+        return feedback_tail_samples(self._ms_to_samples(self.time_ms), self.feedback)
+
     def clear(self):
         """Clear the delay buffer."""
-        self.delay_buffer.fill(0)
-        self.write_pos = 0
+        self._line.clear()
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize state."""
@@ -151,11 +292,24 @@ class PingPongDelay:
         self.stereo_width = 1.0  # 0-1
         self.mix = 0.5
         
-        # State - separate buffers for left and right
+        # State - one stereo line, row 0 left and row 1 right
         self.max_delay_samples = int(5.0 * sample_rate / 1000.0)
-        self.delay_buffer_l = np.zeros(self.max_delay_samples, dtype=np.float32)
-        self.delay_buffer_r = np.zeros(self.max_delay_samples, dtype=np.float32)
-        self.write_pos = 0
+        self._line = DelayLine(self.max_delay_samples, channels=2)
+        self._feedback = SmoothedParameter(self.feedback * self.stereo_width,
+                                           sample_rate=sample_rate)
+        self._mix = SmoothedParameter(self.mix, sample_rate=sample_rate)
+
+    @property
+    def delay_buffer_l(self) -> np.ndarray:
+        return self._line.buffer[0]
+
+    @property
+    def delay_buffer_r(self) -> np.ndarray:
+        return self._line.buffer[1]
+
+    @property
+    def write_pos(self) -> int:
+        return self._line.write_pos
 
     def _ms_to_samples(self, ms: float) -> int:
         """Convert milliseconds to sample count."""
@@ -175,31 +329,24 @@ class PingPongDelay:
             return_mono = False
         
         delay_samples = self._ms_to_samples(self.time_ms)
-        output = np.zeros_like(signal)
-        feedback_linear = np.clip(self.feedback, 0, 0.95)
-        width = np.clip(self.stereo_width, 0, 1)
-        
-        for i in range(signal.shape[1]):
-            # Read positions
-            read_pos = (self.write_pos - delay_samples) % self.max_delay_samples
-            
-            # Read delayed samples (cross-channel for ping-pong)
-            delayed_l = self.delay_buffer_r[read_pos]  # Right to left
-            delayed_r = self.delay_buffer_l[read_pos]  # Left to right
-            
-            # Write new values with feedback
-            new_val_l = signal[0, i] + delayed_l * feedback_linear * width
-            new_val_r = signal[1, i] + delayed_r * feedback_linear * width
-            
-            self.delay_buffer_l[self.write_pos] = np.clip(new_val_l, -1.0, 1.0)
-            self.delay_buffer_r[self.write_pos] = np.clip(new_val_r, -1.0, 1.0)
-            
-            # Mix wet and dry
-            output[0, i] = signal[0, i] * (1 - self.mix) + delayed_l * self.mix
-            output[1, i] = signal[1, i] * (1 - self.mix) + delayed_r * self.mix
-            
-            self.write_pos = (self.write_pos + 1) % self.max_delay_samples
-        
+        stereo = signal[:2]
+        num_samples = stereo.shape[1]
+        bounce = self._feedback.next(
+            num_samples, np.clip(self.feedback, 0, 0.95) * np.clip(self.stereo_width, 0, 1))
+        wet = np.empty((2, num_samples), dtype=np.float32)
+
+        # Chunks of one delay length; reads cross channels (R->L, L->R)
+        for start in range(0, num_samples, delay_samples):
+            end = min(start + delay_samples, num_samples)
+            delayed = self._line.read(delay_samples, end - start)[::-1]
+            wet[:, start:end] = delayed
+            self._line.write(np.clip(stereo[:, start:end]
+                                     + delayed * ramp_slice(bounce, start, end), -1.0, 1.0))
+
+        # Mix wet and dry
+        mix = self._mix.next(num_samples, self.mix)
+        output = (stereo * (1 - mix) + wet * mix).astype(signal.dtype, copy=False)
+
         if return_mono:
             output = output[0]
         
@@ -221,11 +368,15 @@ class PingPongDelay:
         """Set wet/dry mix."""
         self.mix = np.clip(amount, 0, 1)
 
+    def get_tail_samples(self) -> int:
+        """Length of the feedback tail after the input stops."""
+        return feedback_tail_samples(
+            self._ms_to_samples(self.time_ms), self.feedback * self.stereo_width
+        )
+
     def clear(self):
         """Clear delay buffers."""
-        self.delay_buffer_l.fill(0)
-        self.delay_buffer_r.fill(0)
-        self.write_pos = 0
+        self._line.clear()
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize state."""
@@ -278,10 +429,20 @@ class MultiTapDelay:
         # Individual tap levels (sum to 1.0)
         self.tap_levels = np.ones(self.tap_count, dtype=np.float32) / self.tap_count
         
-        # State - single circular buffer
+        # State - single circular buffer (one row per channel)
         self.max_delay_samples = int(5.0 * sample_rate / 1000.0)
-        self.delay_buffer = np.zeros(self.max_delay_samples, dtype=np.float32)
-        self.write_pos = 0
+        self._line = DelayLine(self.max_delay_samples)
+        self._feedback = SmoothedParameter(self.feedback, sample_rate=sample_rate)
+        self._mix = SmoothedParameter(self.mix, sample_rate=sample_rate)
+
+    @property
+    def delay_buffer(self) -> np.ndarray:
+        """Delay line contents, one row per channel."""
+        return self._line.buffer
+
+    @property
+    def write_pos(self) -> int:
+        return self._line.write_pos
 
     def _ms_to_samples(self, ms: float) -> int:
         """Convert milliseconds to sample count."""
@@ -293,37 +454,31 @@ class MultiTapDelay:
         if not self.enabled or signal.size == 0:
             return signal
         
-        output = np.zeros_like(signal)
-        feedback_linear = np.clip(self.feedback, 0, 0.95)
+        x = _as_channels(signal)
+        if x.shape[0] != self._line.channels:
+            self._line = DelayLine(self.max_delay_samples, x.shape[0])
+
+        num_samples = x.shape[1]
+        feedback_linear = self._feedback.next(num_samples, np.clip(self.feedback, 0, 0.95))
         base_delay = self._ms_to_samples(self.spacing_ms)
-        
-        # Accumulate all taps
-        tap_signal = np.zeros_like(signal)
-        
-        for tap_idx in range(self.tap_count):
-            # Calculate delay for this tap
-            tap_delay = base_delay * (tap_idx + 1)
-            tap_delay = np.clip(tap_delay, 1, self.max_delay_samples - 1)
-            
-            for i in range(signal.shape[-1]):
-                # Read delayed sample
-                read_pos = (self.write_pos - tap_delay) % self.max_delay_samples
-                delayed = self.delay_buffer[read_pos]
-                
-                # Add to accumulation with tap level
-                tap_signal[i] += delayed * self.tap_levels[tap_idx]
-        
-        # Write feedback into buffer
-        for i in range(signal.shape[-1]):
-            new_val = signal[i] + tap_signal[i] * feedback_linear
-            self.delay_buffer[self.write_pos] = np.clip(new_val, -1.0, 1.0)
-            
-            # Mix wet and dry
-            output[i] = signal[i] * (1 - self.mix) + tap_signal[i] * self.mix
-            
-            self.write_pos = (self.write_pos + 1) % self.max_delay_samples
-        
-        return output
+        tap_delays = np.clip(base_delay * np.arange(1, self.tap_count + 1),
+                             1, self.max_delay_samples - 1)
+        levels = np.asarray(self.tap_levels, dtype=np.float32)
+
+        # The shortest tap bounds each chunk; all taps are one gather
+        chunk = int(tap_delays[0])
+        tap_signal = np.empty(x.shape, dtype=np.float32)
+        for start in range(0, num_samples, chunk):
+            end = min(start + chunk, num_samples)
+            taps = self._line.gather(tap_delays, end - start)
+            tap_signal[:, start:end] = levels @ taps
+            self._line.write(np.clip(x[:, start:end] + tap_signal[:, start:end]
+                                     * ramp_slice(feedback_linear, start, end), -1.0, 1.0))
+
+        # Mix wet and dry
+        mix = self._mix.next(num_samples, self.mix)
+        output = x * (1 - mix) + tap_signal * mix
+        return output.reshape(signal.shape).astype(signal.dtype, copy=False)
 
     def set_spacing(self, ms: float):
         """Set time spacing between taps."""
@@ -337,6 +492,12 @@ class MultiTapDelay:
         """Set wet/dry mix."""
         self.mix = np.clip(amount, 0, 1)
 
+    def get_tail_samples(self) -> int:
+        """Length of the tap pattern plus its feedback repeats."""
+        longest_tap = min(self._ms_to_samples(self.spacing_ms) * self.tap_count,
+                          self.max_delay_samples - 1)
+        return feedback_tail_samples(longest_tap, self.feedback)
+
     def set_tap_level(self, tap_idx: int, level: float):
         """Set individual tap level (0-1)."""
         if 0 <= tap_idx < self.tap_count:
@@ -363,8 +524,7 @@ class MultiTapDelay:
 
     def clear(self):
         """Clear delay buffer."""
-        self.delay_buffer.fill(0)
-        self.write_pos = 0
+        self._line.clear()
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize state."""
@@ -420,11 +580,26 @@ class StereoDelay:
         self.feedback = 0.5
         self.mix = 0.5
         
-        # Separate buffers for each channel
+        # Separate lines for each channel
         self.max_delay_samples = int(5.0 * sample_rate / 1000.0)
-        self.delay_buffer_l = np.zeros(self.max_delay_samples, dtype=np.float32)
-        self.delay_buffer_r = np.zeros(self.max_delay_samples, dtype=np.float32)
-        self.write_pos = 0
+        self._line_l = DelayLine(self.max_delay_samples)
+        self._line_r = DelayLine(self.max_delay_samples)
+        self._time_l = _DelayTime(sample_rate)
+        self._time_r = _DelayTime(sample_rate)
+        self._feedback = SmoothedParameter(self.feedback, sample_rate=sample_rate)
+        self._mix = SmoothedParameter(self.mix, sample_rate=sample_rate)
+
+    @property
+    def delay_buffer_l(self) -> np.ndarray:
+        return self._line_l.buffer[0]
+
+    @property
+    def delay_buffer_r(self) -> np.ndarray:
+        return self._line_r.buffer[0]
+
+    @property
+    def write_pos(self) -> int:
+        return self._line_l.write_pos
 
     def _ms_to_samples(self, ms: float) -> int:
         """Convert milliseconds to sample count."""
@@ -443,33 +618,23 @@ class StereoDelay:
         else:
             return_mono = False
         
+        num_samples = signal.shape[-1]
         delay_samples_l = self._ms_to_samples(self.time_l_ms)
         delay_samples_r = self._ms_to_samples(self.time_r_ms)
-        output = np.zeros_like(signal)
-        feedback_linear = np.clip(self.feedback, 0, 0.95)
-        
-        for i in range(signal.shape[1]):
-            # Read positions
-            read_pos_l = (self.write_pos - delay_samples_l) % self.max_delay_samples
-            read_pos_r = (self.write_pos - delay_samples_r) % self.max_delay_samples
-            
-            # Read delayed samples
-            delayed_l = self.delay_buffer_l[read_pos_l]
-            delayed_r = self.delay_buffer_r[read_pos_r]
-            
-            # Write new values
-            new_val_l = signal[0, i] + delayed_l * feedback_linear
-            new_val_r = signal[1, i] + delayed_r * feedback_linear
-            
-            self.delay_buffer_l[self.write_pos] = np.clip(new_val_l, -1.0, 1.0)
-            self.delay_buffer_r[self.write_pos] = np.clip(new_val_r, -1.0, 1.0)
-            
-            # Mix
-            output[0, i] = signal[0, i] * (1 - self.mix) + delayed_l * self.mix
-            output[1, i] = signal[1, i] * (1 - self.mix) + delayed_r * self.mix
-            
-            self.write_pos = (self.write_pos + 1) % self.max_delay_samples
-        
+        fade_l = self._time_l.next(delay_samples_l, num_samples)
+        fade_r = self._time_r.next(delay_samples_r, num_samples)
+        feedback_linear = self._feedback.next(num_samples, np.clip(self.feedback, 0, 0.95))
+
+        delayed_l = self._line_l.feedback(signal[0], delay_samples_l, feedback_linear,
+                                          self._time_l.fade_from, fade_l)[0]
+        delayed_r = self._line_r.feedback(signal[1], delay_samples_r, feedback_linear,
+                                          self._time_r.fade_from, fade_r)[0]
+
+        # Mix
+        mix = self._mix.next(num_samples, self.mix)
+        wet = np.stack((delayed_l, delayed_r))
+        output = (signal[:2] * (1 - mix) + wet * mix).astype(signal.dtype, copy=False)
+
         if return_mono:
             output = output[0]
         
@@ -493,9 +658,8 @@ class StereoDelay:
 
     def clear(self):
         """Clear delay buffers."""
-        self.delay_buffer_l.fill(0)
-        self.delay_buffer_r.fill(0)
-        self.write_pos = 0
+        self._line_l.clear()
+        self._line_r.clear()
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize state."""
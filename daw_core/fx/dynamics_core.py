@@ -0,0 +1,331 @@
+"""
+Dynamics Detector / Gain Computer
+
+Shared block-based building blocks for Compressor, Limiter, Expander,
+Gate and NoiseGate.
+
+Everything that does not depend on the previous sample is computed over
+the whole block with NumPy: peak detection across channels, dB conversion
+and the static gain curves (threshold/ratio/knee, expansion, gate hold and
+hysteresis). Only the attack/release envelope recursion, whose branch
+depends on its own state, runs sample by sample: numba-compiled when
+available, otherwise as a tight loop over plain Python floats (see
+kernels.py). Stacked detectors (multiband, batched compressors) share one
+envelope_bank call across all rows. Gain-reduction history is kept in a
+fixed-size NumPy ring buffer instead of a list trimmed with pop(0).
+"""
+
+import numpy as np
+from typing import Iterator, Tuple
+
+from .kernels import kernel
+
+
+MIN_LEVEL = 1e-6  # -120 dB floor for log conversion
+
+
+def linear_to_db(linear: np.ndarray) -> np.ndarray:
+    """Convert linear amplitude to dB (floored at -120 dB)."""
+    return 20.0 * np.log10(np.maximum(linear, MIN_LEVEL))
+
+
+def db_to_linear(db: np.ndarray) -> np.ndarray:
+    """Convert dB to linear amplitude."""
+    return 10.0 ** (np.asarray(db) / 20.0)
+
+
+def peak_levels(signal: np.ndarray) -> np.ndarray:
+    """Per-sample peak across channels (samples along the last axis)."""
+    num_samples = signal.shape[-1]
+    return np.abs(signal).reshape(-1, num_samples).max(axis=0)
+
+
+def time_coefficient(ms: float, sample_rate: float) -> float:
+    """One-pole smoothing coefficient for a time constant in ms."""
+    return 1.0 - np.exp(-1.0 / (ms / 1000.0 * sample_rate))
+
+
+def _envelope_python(level_db: np.ndarray, envelope: float, attack: float,
+                     release: float) -> np.ndarray:
+    """envelope_follower over Python floats (the numpy backend)."""
+    out = []
+    append = out.append
+    env = float(envelope)
+    attack = float(attack)
+    release = float(release)
+    for level in level_db.tolist():
+        if level > env:
+            env += attack * (level - env)
+        else:
+            env += release * (level - env)
+        append(env)
+    return np.array(out, dtype=np.float64)
+
+
+@kernel("envelope_follower", fallback=_envelope_python,
+        example=lambda: (np.zeros(8), -120.0, 0.5, 0.1))
+def envelope_follower(level_db: np.ndarray, envelope: float, attack: float,
+                      release: float) -> np.ndarray:
+    """env += (attack if level > env else release) * (level - env), per sample."""
+    out = np.empty(level_db.shape[0])
+    env = envelope
+    for i in range(level_db.shape[0]):
+        level = level_db[i]
+        if level > env:
+            env += attack * (level - env)
+        else:
+            env += release * (level - env)
+        out[i] = env
+    return out
+
+
+def smooth_envelope(level_db: np.ndarray, envelope: float, attack_coef: float,
+                    release_coef: float) -> np.ndarray:
+    """
+    Attack/release envelope follower in dB.
+
+    env += (attack if level > env else release) * (level - env), per sample.
+    The branch depends on the previous output, so this is the one part of
+    the detector that cannot be vectorized; it runs on the
+    envelope_follower kernel.
+
+    Returns:
+        Envelope for every sample; the last value is the new state
+    """
+    return envelope_follower(np.asarray(level_db, dtype=np.float64), float(envelope),
+                             float(attack_coef), float(release_coef))
+
+
+# Rows from which the numpy backend steps all envelopes together per sample
+# instead of running one Python-float loop per row
+ENVELOPE_BANK_MIN_ROWS = 32
+
+
+def _envelope_bank_numpy(level_db: np.ndarray, envelopes: np.ndarray, attack: np.ndarray,
+                         release: np.ndarray) -> np.ndarray:
+    """envelope_bank on the numpy backend."""
+    rows, num_samples = level_db.shape
+    if rows < ENVELOPE_BANK_MIN_ROWS:
+        # Per-sample NumPy calls cost more than they save on a few rows
+        return np.stack([_envelope_python(level_db[i], envelopes[i], attack[i], release[i])
+                         for i in range(rows)])
+    out = np.empty((num_samples, rows))
+    env = np.array(envelopes, dtype=np.float64)
+    for i, level in enumerate(np.ascontiguousarray(level_db.T)):
+        env += np.where(level > env, attack, release) * (level - env)
+        out[i] = env
+    return out.T
+
+
+@kernel("envelope_bank", fallback=_envelope_bank_numpy,
+        example=lambda: (np.zeros((2, 8)), np.full(2, -120.0), np.full(2, 0.5), np.full(2, 0.1)))
+def envelope_bank(level_db: np.ndarray, envelopes: np.ndarray, attack: np.ndarray,
+                  release: np.ndarray) -> np.ndarray:
+    """envelope_follower for every row of (rows, samples) levels in one call."""
+    rows, num_samples = level_db.shape
+    out = np.empty((rows, num_samples))
+    env = envelopes.copy()
+    for i in range(num_samples):
+        for r in range(rows):
+            level = level_db[r, i]
+            if level > env[r]:
+                env[r] += attack[r] * (level - env[r])
+            else:
+                env[r] += release[r] * (level - env[r])
+            out[r, i] = env[r]
+    return out
+
+
+def smooth_envelopes(level_db: np.ndarray, envelopes: np.ndarray, attack_coef,
+                     release_coef) -> np.ndarray:
+    """
+    smooth_envelope() for stacked detectors, e.g. (bands, samples).
+
+    All rows go through one envelope_bank call, which steps over samples
+    and updates every row's envelope at each step. With numba that is a
+    single compiled loop; the numpy backend only vectorizes across rows
+    from ENVELOPE_BANK_MIN_ROWS rows and otherwise loops per row.
+
+    Args:
+        level_db: (rows, samples) levels
+        envelopes: Per-row envelope state
+        attack_coef, release_coef: Shared coefficients or one per row
+
+    Returns:
+        (rows, samples) envelopes; the last column is the new state
+    """
+    level_db = np.asarray(level_db, dtype=np.float64)
+    rows = level_db.shape[0]
+    return envelope_bank(
+        level_db,
+        np.array(envelopes, dtype=np.float64).reshape(rows),
+        np.broadcast_to(np.asarray(attack_coef, dtype=np.float64), rows).copy(),
+        np.broadcast_to(np.asarray(release_coef, dtype=np.float64), rows).copy(),
+    )
+
+
+def compressor_gain_db(envelope_db: np.ndarray, threshold: float, ratio: float,
+                       knee: float = 0.0) -> np.ndarray:
+    """
+    Gain reduction (positive dB) of the compressor curve.
+
+    Above threshold the ratio ramps in over a knee of knee * 12 dB below
+    the threshold.
+    """
+    knee_width = knee * 12.0
+    over = envelope_db - threshold
+    if knee_width > 0:
+        knee_start = threshold - knee_width
+        ratio_eff = 1.0 + (ratio - 1.0) * ((envelope_db - knee_start) / knee_width)
+        ratio_eff = np.minimum(ratio_eff, ratio)
+    else:
+        ratio_eff = ratio
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gr = over * (1.0 - 1.0 / ratio_eff)
+    return np.where(over > 0, gr, 0.0)
+
+
+def limiter_gain_db(envelope_db: np.ndarray, threshold: float) -> np.ndarray:
+    """Gain reduction (positive dB) of an infinite-ratio limiter."""
+    return np.maximum(envelope_db - threshold, 0.0)
+
+
+def expander_gain_db(envelope_db: np.ndarray, threshold: float, ratio: float) -> np.ndarray:
+    """Expansion (negative dB) below threshold."""
+    under = envelope_db - threshold
+    return np.where(under < 0, under * (1.0 - 1.0 / ratio), 0.0)
+
+
+def sliding_max(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Max of every window-length run: out[i] = max(values[i:i + window]).
+
+    Van Herk/Gil-Werman block algorithm: prefix and suffix maxima over
+    window-sized blocks, so each output costs O(1) regardless of window.
+
+    Returns:
+        len(values) - window + 1 maxima
+    """
+    window = max(1, int(window))
+    n = values.shape[-1]
+    if window == 1:
+        return values.copy()
+    if n < window:
+        return values[:0].copy()
+    padded_len = -(-n // window) * window
+    blocks = np.full(padded_len, -np.inf)
+    blocks[:n] = values
+    blocks = blocks.reshape(-1, window)
+    prefix = np.maximum.accumulate(blocks, axis=1).ravel()
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    return np.maximum(suffix[:n - window + 1], prefix[window - 1:n])
+
+
+def sliding_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Min of every window-length run (see sliding_max)."""
+    return -sliding_max(-values, window)
+
+
+def forward_peak(levels: np.ndarray, window: int) -> np.ndarray:
+    """Max of levels[i:i + window] (clipped at the block end) for every i."""
+    window = max(1, int(window))
+    if window == 1:
+        return levels
+    padded = np.concatenate((levels, np.zeros(window - 1, dtype=levels.dtype)))
+    return sliding_max(padded, window)
+
+
+def gate_open_mask(envelope_db: np.ndarray, threshold: float, hold_samples: int,
+                   hold_counter: int) -> Tuple[np.ndarray, int]:
+    """
+    Gate state with hold, for a whole block.
+
+    The gate is open above threshold and for hold_samples samples after
+    the envelope last exceeded it; hold_counter carries the remaining hold
+    in from the previous block.
+
+    Returns:
+        (open mask, hold counter after the block)
+    """
+    num_samples = envelope_db.shape[-1]
+    above = envelope_db > threshold
+    idx = np.arange(num_samples)
+    last_above = np.maximum.accumulate(np.where(above, idx, -1))
+    # Samples since the envelope was last above threshold, and the hold left then
+    since = np.where(last_above >= 0, idx - last_above, idx + 1)
+    hold = np.where(last_above >= 0, hold_samples, hold_counter)
+    is_open = above | (since <= hold)
+    if num_samples == 0:
+        return is_open, hold_counter
+    new_counter = max(0, int(hold[-1] - since[-1])) if not above[-1] else hold_samples
+    return is_open, new_counter
+
+
+def hysteresis_mask(envelope_db: np.ndarray, open_threshold: float,
+                    close_threshold: float, is_open: bool) -> np.ndarray:
+    """
+    Gate state with separate open/close thresholds, for a whole block.
+
+    The state only changes when the envelope rises above open_threshold
+    (open) or falls below close_threshold (close).
+    """
+    num_samples = envelope_db.shape[-1]
+    event = np.zeros(num_samples, dtype=np.int8)
+    event[envelope_db > open_threshold] = 1
+    event[envelope_db < close_threshold] = -1
+    idx = np.arange(num_samples)
+    last_event = np.maximum.accumulate(np.where(event != 0, idx, -1))
+    state = event[np.maximum(last_event, 0)] > 0
+    return np.where(last_event >= 0, state, is_open)
+
+
+class GainReductionHistory:
+    """
+    Fixed-capacity ring buffer of gain-reduction values (for metering).
+
+    Behaves like a read-only sequence of the most recent values in
+    chronological order (len(), iteration, np.asarray).
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=np.float64)
+        self._write = 0  # total values written
+
+    def __len__(self) -> int:
+        return min(self._write, self.capacity)
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.to_array().tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self.to_array()
+        return arr if dtype is None else arr.astype(dtype)
+
+    def append(self, value: float):
+        """Record a single value."""
+        self._buffer[self._write % self.capacity] = value
+        self._write += 1
+
+    def extend(self, values: np.ndarray):
+        """Record a block of values, keeping only the newest capacity."""
+        values = np.asarray(values, dtype=np.float64)[-self.capacity:]
+        n = len(values)
+        if n == 0:
+            return
+        start = self._write % self.capacity
+        first = min(n, self.capacity - start)
+        self._buffer[start:start + first] = values[:first]
+        self._buffer[:n - first] = values[first:]
+        self._write += n
+
+    def to_array(self) -> np.ndarray:
+        """Values oldest to newest."""
+        if self._write <= self.capacity:
+            return self._buffer[:self._write].copy()
+        start = self._write % self.capacity
+        return np.concatenate((self._buffer[start:], self._buffer[:start]))
+
+    def clear(self):
+        """Drop all values."""
+        self._write = 0
@@ -1,12 +1,34 @@
 """
 Dynamic Processors - Phase 2.2 Continuation
 
-Implements Limiter, Expander, and Gate effects building on Compressor.
+Implements Limiter, Expander, Gate and multiband effects building on Compressor.
 These extend the dynamic processing toolset for professional mixing.
+
+Detection, gain curves and history use the block-based helpers in
+dynamics_core; only the envelope recursion runs per sample. Thresholds,
+ratios and makeup gains are smoothed per block (see smoothing.py).
 """
 
 import numpy as np
-from typing import Dict, Any
+from scipy.signal import firwin, lfilter
+from typing import Dict, Any, Sequence
+
+from .dynamics_core import (
+    GainReductionHistory,
+    db_to_linear,
+    expander_gain_db,
+    forward_peak,
+    gate_open_mask,
+    hysteresis_mask,
+    limiter_gain_db,
+    linear_to_db,
+    peak_levels,
+    sliding_min,
+    smooth_envelope,
+    time_coefficient,
+)
+from .multiband import MultibandDynamics
+from .smoothing import SmoothedParameter
 
 
 class Limiter:
@@ -26,6 +48,9 @@ class Limiter:
     - Aggressive transient control
     """
 
+    # Kernels process() runs on (see kernels.py)
+    KERNELS = ("envelope_follower",)
+
     def __init__(self, name: str = "Limiter"):
         self.name = name
         self.sample_rate = 44100
@@ -41,7 +66,9 @@ class Limiter:
         # State
         self.envelope = 0.0
         self.gain_reduction = 0.0
-        self.gr_history = []
+        self.gr_history = GainReductionHistory()
+        self._threshold = SmoothedParameter(self.threshold, sample_rate=self.sample_rate)
+        self._makeup = SmoothedParameter(self.makeup_gain, sample_rate=self.sample_rate)
 
     def _db_to_linear(self, db: float) -> float:
         """Convert dB to linear."""
@@ -56,41 +83,26 @@ class Limiter:
         if not self.enabled or signal.size == 0:
             return signal
         
-        output = signal.copy()
-        
-        # Lookahead buffer (find peaks ahead)
+        # Lookahead window (find peaks ahead, within this block)
         lookahead_samples = int((self.lookahead / 1000.0) * self.sample_rate)
         
-        attack_coef = 1.0 - np.exp(-1.0 / (self.attack / 1000.0 * self.sample_rate))
-        release_coef = 1.0 - np.exp(-1.0 / (self.release / 1000.0 * self.sample_rate))
-        
-        for i in range(output.shape[-1]):
-            # Look ahead for peaks
-            lookahead_end = min(i + lookahead_samples, output.shape[-1])
-            lookahead_level = np.max(np.abs(output[..., i:lookahead_end]))
-            input_db = self._linear_to_db(lookahead_level)
-            
-            # Fast attack envelope
-            if input_db > self.envelope:
-                self.envelope += attack_coef * (input_db - self.envelope)
-            else:
-                self.envelope += release_coef * (input_db - self.envelope)
-            
-            # Hard limiting (ratio = ∞)
-            if self.envelope > self.threshold:
-                gr_db = self.envelope - self.threshold
-            else:
-                gr_db = 0.0
-            
-            self.gain_reduction = gr_db
-            self.gr_history.append(gr_db)
-            if len(self.gr_history) > 10000:
-                self.gr_history.pop(0)
-            
-            # Apply gain reduction + makeup gain
-            total_gain_db = -gr_db + self.makeup_gain
-            total_gain_linear = self._db_to_linear(total_gain_db)
-            output[..., i] *= total_gain_linear
+        attack_coef = time_coefficient(self.attack, self.sample_rate)
+        release_coef = time_coefficient(self.release, self.sample_rate)
+        
+        input_db = linear_to_db(forward_peak(peak_levels(signal), lookahead_samples))
+        envelope = smooth_envelope(input_db, self.envelope, attack_coef, release_coef)
+        
+        # Hard limiting (ratio = ∞)
+        num_samples = signal.shape[-1]
+        gr_db = limiter_gain_db(envelope, self._threshold.next(num_samples, self.threshold))
+        
+        self.envelope = float(envelope[-1])
+        self.gain_reduction = float(gr_db[-1])
+        self.gr_history.extend(gr_db)
+        
+        # Apply gain reduction + makeup gain
+        gain = db_to_linear(self._makeup.next(num_samples, self.makeup_gain) - gr_db)
+        output = (signal * gain).astype(signal.dtype, copy=False)
         
         # Hard clipping (no soft clipping like Compressor)
         output = np.clip(output, -1.0, 1.0)
@@ -144,6 +156,278 @@ class Limiter:
         self.set_makeup_gain(data.get("makeup_gain", 0))
 
 
+class LookaheadLimiter:
+    """
+    Lookahead true-peak brickwall limiter for mastering.
+
+    The audio is delayed by the lookahead so gain can come down before a
+    peak arrives:
+    - True peaks are estimated by 4x polyphase oversampling of every
+      channel (stereo-linked); the interpolation filter's delay is added
+      to the latency.
+    - The required gain (ceiling / peak) is held with a sliding-window
+      minimum over the lookahead (van Herk/Gil-Werman, O(1) per sample),
+      then box-averaged over the same window. The averaged ramp reaches
+      the required gain exactly when the peak leaves the delay line.
+    - Release is a one-pole lowpass of that ramp; gain never rises above
+      the ramp.
+
+    All of this runs block-wise; the only state carried between blocks is
+    the window history, filter state and delayed audio. The processing
+    latency is reported by get_latency_samples() for delay compensation.
+
+    Parameters:
+    - Ceiling: Maximum true-peak output level (-20 to 0 dBTP)
+    - Lookahead: Window for peak anticipation (0.1 to 20 ms)
+    - Release: Gain recovery time (1 to 1000 ms)
+    """
+
+    OVERSAMPLE = 4
+    FIR_DELAY = 8  # interpolation filter delay in input samples
+
+    def __init__(self, name: str = "LookaheadLimiter", sample_rate: float = 44100):
+        self.name = name
+        self.sample_rate = sample_rate
+        self.enabled = True
+
+        # Parameters
+        self.ceiling = -1.0  # dBTP
+        self.lookahead = 1.5  # ms
+        self.release = 50.0  # ms
+
+        # State
+        self.gain_reduction = 0.0
+        self.gr_history = GainReductionHistory()
+        self._phases = self._design_interpolator()
+        self._channels = 0
+
+    @classmethod
+    def _design_interpolator(cls) -> np.ndarray:
+        """Polyphase lowpass as (taps, phases), newest sample last."""
+        factor = cls.OVERSAMPLE
+        fir = firwin(2 * factor * cls.FIR_DELAY + 1, 1.0 / factor) * factor
+        taps = -(-len(fir) // factor)
+        phases = np.zeros((factor, taps))
+        for p in range(factor):
+            phase = fir[p::factor]
+            phases[p, :len(phase)] = phase
+        return phases[:, ::-1].T.copy()
+
+    @property
+    def window(self) -> int:
+        """Lookahead window in samples."""
+        return max(1, int(round(self.lookahead / 1000.0 * self.sample_rate)))
+
+    def get_latency_samples(self) -> int:
+        """Samples by which the output lags the input."""
+        return self.window - 1 + self.FIR_DELAY
+
+    def get_tail_samples(self) -> int:
+        """Delayed audio still to be flushed after the input stops."""
+        return self.get_latency_samples()
+
+    def _reset(self, channels: int):
+        """Clear window history, filter state and the audio delay line."""
+        window = self.window
+        self._channels = channels
+        self._peak_history = np.zeros((channels, self._phases.shape[0] - 1))
+        self._gain_history = np.ones(window - 1)
+        self._ramp_history = np.ones(window - 1)
+        self._release_state = 1.0
+        self._delay = np.zeros((channels, self.get_latency_samples()))
+
+    def reset(self):
+        """Drop all state (e.g. on seek)."""
+        self._channels = 0
+
+    def _true_peak(self, x: np.ndarray) -> np.ndarray:
+        """Per-sample inter-sample peak across channels, delayed by FIR_DELAY."""
+        history = np.concatenate((self._peak_history, x), axis=1)
+        self._peak_history = history[:, x.shape[1]:]
+        windows = np.lib.stride_tricks.sliding_window_view(history, self._phases.shape[0], axis=1)
+        interpolated = windows @ self._phases  # (channels, samples, phases)
+        return np.abs(interpolated).max(axis=(0, 2))
+
+    def process(self, signal: np.ndarray) -> np.ndarray:
+        """Apply lookahead limiting (output is delayed by the latency)."""
+        if not self.enabled or signal.size == 0:
+            return signal
+
+        x = np.atleast_2d(signal).reshape(-1, signal.shape[-1]).astype(np.float64)
+        channels, num_samples = x.shape
+        if channels != self._channels:
+            self._reset(channels)
+        window = self.window
+        ceiling = db_to_linear(self.ceiling)
+
+        # Gain needed for every (delayed) true peak
+        peaks = self._true_peak(x)
+        required = np.minimum(1.0, ceiling / np.maximum(peaks, 1e-12))
+
+        # Hold the minimum over the lookahead, then ramp into it
+        gains = np.concatenate((self._gain_history, required))
+        held = sliding_min(gains, window)
+        self._gain_history = gains[num_samples:]
+        ramp_in = np.concatenate((self._ramp_history, held))
+        sums = np.cumsum(np.concatenate(([0.0], ramp_in)))
+        ramp = (sums[window:] - sums[:-window]) / window
+        self._ramp_history = ramp_in[num_samples:]
+
+        # Release: one-pole recovery, never above the ramp
+        coef = np.exp(-1.0 / (self.release / 1000.0 * self.sample_rate))
+        released, _ = lfilter([1.0 - coef], [1.0, -coef], ramp,
+                              zi=[coef * self._release_state])
+        self._release_state = float(released[-1])
+        gain = np.minimum(ramp, released)
+
+        # Delay the audio so the gain lands on its peak
+        delayed = np.concatenate((self._delay, x), axis=1)
+        self._delay = delayed[:, num_samples:]
+        output = np.clip(delayed[:, :num_samples] * gain, -ceiling, ceiling)
+
+        gr_db = -linear_to_db(gain)
+        self.gain_reduction = float(gr_db[-1])
+        self.gr_history.extend(gr_db)
+        return output.reshape(signal.shape).astype(signal.dtype, copy=False)
+
+    def set_ceiling(self, db: float):
+        """Set output ceiling (dBTP)."""
+        self.ceiling = np.clip(db, -20.0, 0.0)
+
+    def set_lookahead(self, ms: float):
+        """Set lookahead (changes latency and resets state)."""
+        self.lookahead = np.clip(ms, 0.1, 20.0)
+        self.reset()
+
+    def set_release(self, ms: float):
+        """Set release time."""
+        self.release = np.clip(ms, 1.0, 1000.0)
+
+    def get_gain_reduction(self) -> float:
+        """Get current gain reduction."""
+        return self.gain_reduction
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize state."""
+        return {
+            "name": self.name,
+            "type": "lookahead_limiter",
+            "enabled": self.enabled,
+            "ceiling": self.ceiling,
+            "lookahead": self.lookahead,
+            "release": self.release,
+        }
+
+    def from_dict(self, data: Dict[str, Any]):
+        """Load state."""
+        self.enabled = data.get("enabled", True)
+        self.set_ceiling(data.get("ceiling", -1.0))
+        self.set_lookahead(data.get("lookahead", 1.5))
+        self.set_release(data.get("release", 50))
+
+
+class MultibandCompressor:
+    """
+    Multiband compressor built on the shared multiband engine.
+
+    A Linkwitz-Riley crossover splits the signal into bands that sum back
+    flat; each band has its own compressor and the processed bands are
+    summed. All bands are filtered and detected as one stacked array.
+
+    Parameters:
+    - Crossovers: Band edges in Hz (N edges give N + 1 bands)
+    - Per band: Threshold (-60 to 0 dB), Ratio (1:1 to 20:1),
+      Makeup gain (-12 to +12 dB)
+    - Attack (0.1 to 100 ms) and Release (10 to 1000 ms), shared
+    """
+
+    # Kernels process() runs on (see kernels.py)
+    KERNELS = ("envelope_bank",)
+
+    def __init__(self, name: str = "MultibandCompressor", sample_rate: float = 44100,
+                 crossovers: Sequence[float] = (120.0, 1000.0, 6000.0)):
+        self.name = name
+        self.sample_rate = sample_rate
+        self.enabled = True
+        self.engine = MultibandDynamics(crossovers, sample_rate)
+
+    @property
+    def num_bands(self) -> int:
+        return self.engine.num_bands
+
+    def process(self, signal: np.ndarray) -> np.ndarray:
+        """Compress each band and sum."""
+        if not self.enabled or signal.size == 0:
+            return signal
+        output = self.engine.process(signal).sum(axis=0)
+        return output.astype(signal.dtype, copy=False)
+
+    def set_crossovers(self, freqs: Sequence[float]):
+        """Set band edges (a different band count resets band settings)."""
+        self.engine.set_frequencies([np.clip(f, 20.0, 20000.0) for f in freqs])
+
+    def set_band(self, band: int, threshold_db: float, ratio: float, makeup_db: float = 0.0):
+        """Configure one band's compressor."""
+        if 0 <= band < self.num_bands:
+            self.engine.thresholds[band] = np.clip(threshold_db, -60, 0)
+            self.engine.ratios[band] = np.clip(ratio, 1.0, 20.0)
+            self.engine.makeup[band] = np.clip(makeup_db, -12, 12)
+
+    def set_threshold(self, db: float):
+        """Set threshold of every band."""
+        self.engine.thresholds[:] = np.clip(db, -60, 0)
+
+    def set_ratio(self, ratio: float):
+        """Set ratio of every band."""
+        self.engine.ratios[:] = np.clip(ratio, 1.0, 20.0)
+
+    def set_makeup_gain(self, db: float):
+        """Set makeup gain of every band."""
+        self.engine.makeup[:] = np.clip(db, -12, 12)
+
+    def set_attack(self, ms: float):
+        """Set attack time."""
+        self.engine.attack = np.clip(ms, 0.1, 100.0)
+
+    def set_release(self, ms: float):
+        """Set release time."""
+        self.engine.release = np.clip(ms, 10.0, 1000.0)
+
+    def get_gain_reduction(self) -> list:
+        """Current gain reduction of each band in dB."""
+        return self.engine.gain_reduction.tolist()
+
+    def reset(self):
+        """Clear filter and detector state."""
+        self.engine.reset()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize state."""
+        return {
+            "name": self.name,
+            "type": "multiband_compressor",
+            "enabled": self.enabled,
+            "crossovers": list(self.engine.crossover.frequencies),
+            "thresholds": self.engine.thresholds.tolist(),
+            "ratios": self.engine.ratios.tolist(),
+            "makeup": self.engine.makeup.tolist(),
+            "attack": self.engine.attack,
+            "release": self.engine.release,
+        }
+
+    def from_dict(self, data: Dict[str, Any]):
+        """Load state."""
+        self.enabled = data.get("enabled", True)
+        self.set_crossovers(data.get("crossovers", (120.0, 1000.0, 6000.0)))
+        thresholds = data.get("thresholds", [-20.0] * self.num_bands)
+        ratios = data.get("ratios", [4.0] * self.num_bands)
+        makeup = data.get("makeup", [0.0] * self.num_bands)
+        for band in range(self.num_bands):
+            self.set_band(band, thresholds[band], ratios[band], makeup[band])
+        self.set_attack(data.get("attack", 10))
+        self.set_release(data.get("release", 100))
+
+
 class Expander:
     """
     Inverse compressor that expands the dynamic range.
@@ -161,6 +445,9 @@ class Expander:
     - Release: Time to stop expanding
     """
 
+    # Kernels process() runs on (see kernels.py)
+    KERNELS = ("envelope_follower",)
+
     def __init__(self, name: str = "Expander"):
         self.name = name
         self.sample_rate = 44100
@@ -175,7 +462,10 @@ class Expander:
         # State
         self.envelope = 0.0
         self.expansion_factor = 0.0
-        self.ef_history = []
+        self.ef_history = GainReductionHistory()
+        self._threshold = SmoothedParameter(self.threshold, sample_rate=self.sample_rate)
+        self._ratio = SmoothedParameter(self.ratio, mode="exponential",
+                                        sample_rate=self.sample_rate)
 
     def _db_to_linear(self, db: float) -> float:
         """Convert dB to linear."""
@@ -190,36 +480,23 @@ class Expander:
         if not self.enabled or signal.size == 0:
             return signal
         
-        output = signal.copy()
-        
-        attack_coef = 1.0 - np.exp(-1.0 / (self.attack / 1000.0 * self.sample_rate))
-        release_coef = 1.0 - np.exp(-1.0 / (self.release / 1000.0 * self.sample_rate))
-        
-        for i in range(output.shape[-1]):
-            input_level = np.abs(output[..., i]).max()
-            input_db = self._linear_to_db(input_level)
-            
-            # Smooth envelope
-            if input_db > self.envelope:
-                self.envelope += attack_coef * (input_db - self.envelope)
-            else:
-                self.envelope += release_coef * (input_db - self.envelope)
-            
-            # Calculate expansion below threshold
-            if self.envelope < self.threshold:
-                # Below threshold: reduce level by expansion ratio
-                expansion_db = (self.envelope - self.threshold) * (1.0 - 1.0 / self.ratio)
-                self.expansion_factor = expansion_db
-            else:
-                self.expansion_factor = 0.0
-            
-            self.ef_history.append(self.expansion_factor)
-            if len(self.ef_history) > 10000:
-                self.ef_history.pop(0)
-            
-            # Apply expansion
-            expansion_linear = self._db_to_linear(self.expansion_factor)
-            output[..., i] *= expansion_linear
+        attack_coef = time_coefficient(self.attack, self.sample_rate)
+        release_coef = time_coefficient(self.release, self.sample_rate)
+        
+        input_db = linear_to_db(peak_levels(signal))
+        envelope = smooth_envelope(input_db, self.envelope, attack_coef, release_coef)
+        
+        # Below threshold: reduce level by expansion ratio
+        num_samples = signal.shape[-1]
+        expansion_db = expander_gain_db(envelope, self._threshold.next(num_samples, self.threshold),
+                                        self._ratio.next(num_samples, self.ratio))
+        
+        self.envelope = float(envelope[-1])
+        self.expansion_factor = float(expansion_db[-1])
+        self.ef_history.extend(expansion_db)
+        
+        # Apply expansion
+        output = (signal * db_to_linear(expansion_db)).astype(signal.dtype, copy=False)
         
         return output
 
@@ -277,6 +554,9 @@ class Gate:
     - Release: Time to close gate (10-500 ms)
     """
 
+    # Kernels process() runs on (see kernels.py)
+    KERNELS = ("envelope_follower",)
+
     def __init__(self, name: str = "Gate"):
         self.name = name
         self.sample_rate = 44100
@@ -292,7 +572,8 @@ class Gate:
         self.envelope = 0.0
         self.hold_counter = 0
         self.gate_open = False
-        self.gr_history = []
+        self.gr_history = GainReductionHistory()
+        self._threshold = SmoothedParameter(self.threshold, sample_rate=self.sample_rate)
 
     def _db_to_linear(self, db: float) -> float:
         """Convert dB to linear."""
@@ -307,44 +588,26 @@ class Gate:
         if not self.enabled or signal.size == 0:
             return signal
         
-        output = signal.copy()
-        
-        attack_coef = 1.0 - np.exp(-1.0 / (self.attack / 1000.0 * self.sample_rate))
-        release_coef = 1.0 - np.exp(-1.0 / (self.release / 1000.0 * self.sample_rate))
+        attack_coef = time_coefficient(self.attack, self.sample_rate)
+        release_coef = time_coefficient(self.release, self.sample_rate)
         hold_samples = int((self.hold / 1000.0) * self.sample_rate)
         
-        for i in range(output.shape[-1]):
-            input_level = np.abs(output[..., i]).max()
-            input_db = self._linear_to_db(input_level)
-            
-            # Smooth envelope
-            if input_db > self.envelope:
-                self.envelope += attack_coef * (input_db - self.envelope)
-            else:
-                self.envelope += release_coef * (input_db - self.envelope)
-            
-            # Gate logic
-            if self.envelope > self.threshold:
-                self.gate_open = True
-                self.hold_counter = hold_samples
-                gr_db = 0.0
-            else:
-                if self.hold_counter > 0:
-                    self.hold_counter -= 1
-                    gr_db = 0.0
-                else:
-                    self.gate_open = False
-                    gr_db = 100.0  # Mute (very large reduction)
-            
-            self.gr_history.append(gr_db)
-            if len(self.gr_history) > 10000:
-                self.gr_history.pop(0)
-            
-            # Apply gate
-            if not self.gate_open and self.hold_counter <= 0:
-                output[..., i] = 0.0  # Mute
-            
-        return output
+        input_db = linear_to_db(peak_levels(signal))
+        envelope = smooth_envelope(input_db, self.envelope, attack_coef, release_coef)
+        
+        # Gate logic: open above threshold, then for the hold time
+        is_open, self.hold_counter = gate_open_mask(
+            envelope, self._threshold.next(signal.shape[-1], self.threshold), hold_samples,
+            self.hold_counter
+        )
+        self.envelope = float(envelope[-1])
+        self.gate_open = bool(is_open[-1])
+        self.gr_history.extend(np.where(is_open, 0.0, 100.0))  # 100 dB = mute
+        
+        # Apply gate
+        output = signal * is_open
+        
+        return output.astype(signal.dtype, copy=False)
 
     def set_threshold(self, db: float):
         """Set gate threshold."""
@@ -398,6 +661,9 @@ class NoiseGate:
     - Hysteresis helps prevent chatter on borderline signals
     """
 
+    # Kernels process() runs on (see kernels.py)
+    KERNELS = ("envelope_follower",)
+
     def __init__(self, name: str = "NoiseGate"):
         self.name = name
         self.sample_rate = 44100
@@ -412,6 +678,8 @@ class NoiseGate:
         # State
         self.gate_open = False
         self.envelope = 0.0
+        self._open = SmoothedParameter(self.open_threshold, sample_rate=self.sample_rate)
+        self._close = SmoothedParameter(self.close_threshold, sample_rate=self.sample_rate)
 
     def _linear_to_db(self, linear: float) -> float:
         """Convert linear to dB."""
@@ -422,36 +690,24 @@ class NoiseGate:
         if not self.enabled or signal.size == 0:
             return signal
         
-        output = signal.copy()
-        
-        attack_coef = 1.0 - np.exp(-1.0 / (self.attack / 1000.0 * self.sample_rate))
-        release_coef = 1.0 - np.exp(-1.0 / (self.release / 1000.0 * self.sample_rate))
-        
-        for i in range(output.shape[-1]):
-            input_level = np.abs(output[..., i]).max()
-            input_db = self._linear_to_db(input_level)
-            
-            # Smooth envelope
-            if input_db > self.envelope:
-                self.envelope += attack_coef * (input_db - self.envelope)
-            else:
-                self.envelope += release_coef * (input_db - self.envelope)
-            
-            # Hysteresis logic
-            if self.gate_open:
-                # Gate is open, check if we should close
-                if self.envelope < self.close_threshold:
-                    self.gate_open = False
-            else:
-                # Gate is closed, check if we should open
-                if self.envelope > self.open_threshold:
-                    self.gate_open = True
-            
-            # Apply gate
-            if not self.gate_open:
-                output[..., i] = 0.0
+        attack_coef = time_coefficient(self.attack, self.sample_rate)
+        release_coef = time_coefficient(self.release, self.sample_rate)
         
-        return output
+        input_db = linear_to_db(peak_levels(signal))
+        envelope = smooth_envelope(input_db, self.envelope, attack_coef, release_coef)
+        
+        # Hysteresis logic
+        num_samples = signal.shape[-1]
+        is_open = hysteresis_mask(envelope, self._open.next(num_samples, self.open_threshold),
+                                  self._close.next(num_samples, self.close_threshold),
+                                  self.gate_open)
+        self.envelope = float(envelope[-1])
+        self.gate_open = bool(is_open[-1])
+        
+        # Apply gate
+        output = signal * is_open
+        
+        return output.astype(signal.dtype, copy=False)
 
     def set_thresholds(self, open_db: float, close_db: float):
         """Set gate thresholds with hysteresis."""
@@ -13,9 +13,27 @@ Each effect module handles:
 
 import numpy as np
 from typing import Optional, Dict, Any
-from scipy.signal import butter, lfilter, sosfilt
 import math
 
+from .dynamics_core import (
+    GainReductionHistory,
+    compressor_gain_db,
+    db_to_linear,
+    linear_to_db,
+    peak_levels,
+    smooth_envelope,
+    smooth_envelopes,
+    time_coefficient,
+)
+from .filter_engine import (
+    PartitionedConvolver,
+    SOSFilter,
+    design_sos,
+    linear_phase_fir,
+    partition_spectra,
+)
+from .smoothing import SmoothedParameter
+
 
 # ============================================================================
 # EQ EFFECTS
@@ -35,12 +53,22 @@ class EQ3Band:
     - Gain (-24 to +24 dB)
     - Frequency (center frequency)
     - Q (bandwidth, 0.1 to 10)
+
+    The three bands run as one stateful SOS cascade (one sosfilt call per
+    block). In "linear" phase mode the cascade's magnitude response is
+    applied as a linear-phase FIR through partitioned FFT convolution,
+    delaying the signal by get_latency_samples().
     """
 
+    PHASE_MODES = ("minimum", "linear")
+    LINEAR_PHASE_TAPS = 8192
+    LINEAR_PHASE_PARTITION = 1024
+
     def __init__(self, name: str = "EQ3Band"):
         self.name = name
         self.sample_rate = 44100
         self.enabled = True
+        self.phase_mode = "minimum"
         
         # Band parameters
         self.low_gain = 0.0  # dB
@@ -59,77 +87,27 @@ class EQ3Band:
         self.low_sos = None
         self.mid_sos = None
         self.high_sos = None
+        self.sos = None  # all bands, one cascade
         
-        # State for each channel
-        self.low_zi = None
-        self.mid_zi = None
-        self.high_zi = None
+        # Filter state carried across blocks
+        self._filter = SOSFilter(sample_rate=self.sample_rate)
+        self._fir_spectra: Optional[np.ndarray] = None  # linear-phase filter, built on demand
+        self._convolver: Optional[PartitionedConvolver] = None
         
         self._update_filters()
 
     def _update_filters(self):
         """Recalculate filter coefficients."""
-        nyquist = self.sample_rate / 2
-        
-        # Low band (shelving)
-        low_norm_freq = self.low_freq / nyquist
-        self.low_sos = self._design_shelf_filter(
-            low_norm_freq, self.low_q, self.low_gain, "low"
-        )
-        
-        # Mid band (peaking)
-        mid_norm_freq = self.mid_freq / nyquist
-        self.mid_sos = self._design_peaking_filter(
-            mid_norm_freq, self.mid_q, self.mid_gain
-        )
-        
-        # High band (shelving)
-        high_norm_freq = self.high_freq / nyquist
-        self.high_sos = self._design_shelf_filter(
-            high_norm_freq, self.high_q, self.high_gain, "high"
-        )
-
-    @staticmethod
-    def _design_peaking_filter(norm_freq: float, q: float, gain_db: float) -> np.ndarray:
-        """Design a peaking (bell) filter."""
-        A = 10.0 ** (gain_db / 40.0)
-        w0 = 2 * np.pi * norm_freq
-        alpha = np.sin(w0) / (2 * q)
-        
-        b0 = 1 + alpha * A
-        b1 = -2 * np.cos(w0)
-        b2 = 1 - alpha * A
-        a0 = 1 + alpha / A
-        a1 = -2 * np.cos(w0)
-        a2 = 1 - alpha / A
-        
-        return np.array([[b0/a0, b1/a0, b2/a0, 1, a1/a0, a2/a0]])
-
-    @staticmethod
-    def _design_shelf_filter(norm_freq: float, q: float, gain_db: float, 
-                           shelf_type: str) -> np.ndarray:
-        """Design a shelving filter (low or high)."""
-        A = 10.0 ** (gain_db / 40.0)
-        w0 = 2 * np.pi * norm_freq
-        S = 1.0  # Shelf slope (1 = moderate)
-        alpha = np.sin(w0) / (2 * q)
-        
-        if shelf_type == "low":
-            b0 = A * ((A + 1) - (A - 1) * np.cos(w0) + 2 * np.sqrt(A) * alpha)
-            b1 = 2 * A * ((A - 1) - (A + 1) * np.cos(w0))
-            b2 = A * ((A + 1) - (A - 1) * np.cos(w0) - 2 * np.sqrt(A) * alpha)
-            a0 = (A + 1) + (A - 1) * np.cos(w0) + 2 * np.sqrt(A) * alpha
-            a1 = -2 * ((A - 1) + (A + 1) * np.cos(w0))
-            a2 = (A + 1) + (A - 1) * np.cos(w0) - 2 * np.sqrt(A) * alpha
-        else:  # high
-            b0 = A * ((A + 1) + (A - 1) * np.cos(w0) + 2 * np.sqrt(A) * alpha)
-            b1 = -2 * A * ((A - 1) + (A + 1) * np.cos(w0))
-            b2 = A * ((A + 1) + (A - 1) * np.cos(w0) - 2 * np.sqrt(A) * alpha)
-            a0 = (A + 1) - (A - 1) * np.cos(w0) + 2 * np.sqrt(A) * alpha
-            a1 = 2 * ((A - 1) - (A + 1) * np.cos(w0))
-            a2 = (A + 1) - (A - 1) * np.cos(w0) - 2 * np.sqrt(A) * alpha
-        
-        return np.array([[b0/a0, b1/a0, b2/a0, 1, a1/a0, a2/a0]])
+        sr = float(self.sample_rate)
+        self.low_sos = design_sos("lowshelf", float(self.low_freq), float(self.low_q),
+                                  float(self.low_gain), sr)
+        self.mid_sos = design_sos("peaking", float(self.mid_freq), float(self.mid_q),
+                                  float(self.mid_gain), sr)
+        self.high_sos = design_sos("highshelf", float(self.high_freq), float(self.high_q),
+                                   float(self.high_gain), sr)
+        self.sos = np.vstack((self.low_sos, self.mid_sos, self.high_sos))
+        self._filter.set_sos(self.sos)
+        self._fir_spectra = None
 
     def set_low_band(self, gain_db: float, freq_hz: float, q: float):
         """Update low band parameters."""
@@ -152,22 +130,62 @@ class EQ3Band:
         self.high_q = np.clip(q, 0.1, 10.0)
         self._update_filters()
 
+    def set_phase_mode(self, mode: str):
+        """Select "minimum" (IIR) or "linear" (FFT FIR) phase (resets filter state)."""
+        if mode not in self.PHASE_MODES:
+            raise ValueError(f"Phase mode must be one of {self.PHASE_MODES}")
+        self.phase_mode = mode
+        self._filter.reset()
+        self._convolver = None
+
+    def batch_key(self):
+        """Instances with equal keys can share one process_batch() call."""
+        if not self.enabled or self.phase_mode != "minimum" or self._filter.ramping:
+            return None
+        return ("eq3band", self.sos.tobytes())
+
+    @classmethod
+    def process_batch(cls, effects, signals: np.ndarray) -> np.ndarray:
+        """Filter stacked (instances, ..., samples) blocks with one sosfilt call."""
+        return SOSFilter.process_batch([e._filter for e in effects], signals)
+
+    def linear_response(self):
+        """(sos, matrix) for chain fusion; None in linear-phase mode."""
+        if not self.enabled:
+            return None, None
+        if self.phase_mode == "linear":
+            return None
+        return self.sos, None
+
+    def get_latency_samples(self) -> int:
+        """Delay of the linear-phase FIR (the IIR path adds none)."""
+        return self.LINEAR_PHASE_TAPS // 2 if self.phase_mode == "linear" else 0
+
+    def _linear_phase(self, signal: np.ndarray) -> np.ndarray:
+        """Apply the linear-phase FIR to (..., samples) audio."""
+        if self._fir_spectra is None:
+            fir = linear_phase_fir(self.sos, self.LINEAR_PHASE_TAPS)
+            self._fir_spectra = partition_spectra(fir[None, :], self.LINEAR_PHASE_PARTITION)
+            if self._convolver is not None:
+                self._convolver.set_spectra(self._fir_spectra)
+        if self._convolver is None:
+            self._convolver = PartitionedConvolver(self._fir_spectra, self.LINEAR_PHASE_PARTITION)
+        x = signal.reshape(-1, signal.shape[-1])
+        return self._convolver.process(x).reshape(signal.shape)
+
     def process(self, signal: np.ndarray) -> np.ndarray:
         """Apply all three EQ bands."""
         if not self.enabled or signal.size == 0:
             return signal
-        
-        output = signal.copy()
-        
-        # Apply each band
-        if self.low_sos is not None:
-            output = sosfilt(self.low_sos, output, axis=-1)
-        if self.mid_sos is not None:
-            output = sosfilt(self.mid_sos, output, axis=-1)
-        if self.high_sos is not None:
-            output = sosfilt(self.high_sos, output, axis=-1)
-        
-        return output
+        if self.phase_mode == "linear":
+            return self._linear_phase(signal)
+        return self._filter.process(signal)
+
+    def reset(self):
+        """Clear filter state."""
+        self._filter.reset()
+        if self._convolver is not None:
+            self._convolver.reset()
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize EQ state."""
@@ -175,6 +193,7 @@ class EQ3Band:
             "name": self.name,
             "type": "eq3band",
             "enabled": self.enabled,
+            "phase_mode": self.phase_mode,
             "low_band": {
                 "gain": self.low_gain,
                 "freq": self.low_freq,
@@ -195,6 +214,7 @@ class EQ3Band:
     def from_dict(self, data: Dict[str, Any]):
         """Load EQ state."""
         self.enabled = data.get("enabled", True)
+        self.set_phase_mode(data.get("phase_mode", "minimum"))
         low = data.get("low_band", {})
         self.set_low_band(low.get("gain", 0), low.get("freq", 100), low.get("q", 0.707))
         mid = data.get("mid_band", {})
@@ -228,14 +248,14 @@ class HighLowPass:
         self.order = 2  # Filter order
         
         self.sos = None
+        self._filter = SOSFilter(sample_rate=self.sample_rate)
         self._update_filter()
 
     def _update_filter(self):
         """Recalculate filter coefficients."""
-        nyquist = self.sample_rate / 2
-        norm_freq = np.clip(self.cutoff_freq / nyquist, 0.01, 0.99)
-        
-        self.sos = butter(self.order, norm_freq, btype=self.filter_type, output='sos')
+        self.sos = design_sos(self.filter_type, float(self.cutoff_freq),
+                              sample_rate=float(self.sample_rate), order=int(self.order))
+        self._filter.set_sos(self.sos)
 
     def set_cutoff(self, freq_hz: float):
         """Set cutoff frequency."""
@@ -257,7 +277,26 @@ class HighLowPass:
         if not self.enabled or signal.size == 0 or self.sos is None:
             return signal
         
-        return sosfilt(self.sos, signal, axis=-1)
+        return self._filter.process(signal)
+
+    def batch_key(self):
+        """Instances with equal keys can share one process_batch() call."""
+        if not self.enabled or self._filter.ramping:
+            return None
+        return ("highlow_pass", self.sos.tobytes())
+
+    @classmethod
+    def process_batch(cls, effects, signals: np.ndarray) -> np.ndarray:
+        """Filter stacked (instances, ..., samples) blocks with one sosfilt call."""
+        return SOSFilter.process_batch([e._filter for e in effects], signals)
+
+    def linear_response(self):
+        """(sos, matrix) for chain fusion."""
+        return (self.sos if self.enabled else None), None
+
+    def reset(self):
+        """Clear filter state."""
+        self._filter.reset()
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize state."""
@@ -301,6 +340,9 @@ class Compressor:
     - Knee: Soft knee amount (0 to 1)
     """
 
+    # Kernels process() runs on (see kernels.py)
+    KERNELS = ("envelope_follower", "envelope_bank")
+
     def __init__(self, name: str = "Compressor"):
         self.name = name
         self.sample_rate = 44100
@@ -317,7 +359,11 @@ class Compressor:
         # State
         self.envelope = 0.0  # Current envelope level
         self.gain_reduction = 0.0  # Current GR in dB
-        self.gr_history = []  # For visualization
+        self.gr_history = GainReductionHistory()  # For visualization
+        self._threshold = SmoothedParameter(self.threshold, sample_rate=self.sample_rate)
+        self._ratio = SmoothedParameter(self.ratio, mode="exponential",
+                                        sample_rate=self.sample_rate)
+        self._makeup = SmoothedParameter(self.makeup_gain, sample_rate=self.sample_rate)
 
     def _calculate_envelope(self, input_signal: np.ndarray) -> float:
         """Calculate RMS envelope of signal."""
@@ -336,55 +382,76 @@ class Compressor:
         if not self.enabled or signal.size == 0:
             return signal
         
-        output = signal.copy()
-        attack_coef = 1.0 - np.exp(-1.0 / (self.attack / 1000.0 * self.sample_rate))
-        release_coef = 1.0 - np.exp(-1.0 / (self.release / 1000.0 * self.sample_rate))
+        attack_coef = time_coefficient(self.attack, self.sample_rate)
+        release_coef = time_coefficient(self.release, self.sample_rate)
+        
+        # Detector and gain curve over the whole block; only the
+        # attack/release recursion runs per sample
+        num_samples = signal.shape[-1]
+        input_db = linear_to_db(peak_levels(signal))
+        envelope = smooth_envelope(input_db, self.envelope, attack_coef, release_coef)
+        gr_db = compressor_gain_db(envelope, self._threshold.next(num_samples, self.threshold),
+                                   self._ratio.next(num_samples, self.ratio), self.knee)
+        
+        self.envelope = float(envelope[-1])
+        self.gain_reduction = float(gr_db[-1])
+        self.gr_history.extend(gr_db)
         
-        # Process each sample
-        for i in range(output.shape[-1]):
-            # Get input level
-            input_level = np.abs(output[..., i]).max()
-            input_db = self._linear_to_db(input_level)
-            
-            # Smooth envelope
-            if input_db > self.envelope:
-                self.envelope += attack_coef * (input_db - self.envelope)
-            else:
-                self.envelope += release_coef * (input_db - self.envelope)
-            
-            # Calculate gain reduction
-            if self.envelope > self.threshold:
-                # Soft knee
-                knee_start = self.threshold - self.knee * 12
-                if self.envelope > knee_start:
-                    knee_width = self.knee * 12
-                    if knee_width > 0:
-                        ratio_eff = 1.0 + (self.ratio - 1.0) * ((self.envelope - knee_start) / knee_width)
-                        ratio_eff = min(ratio_eff, self.ratio)
-                    else:
-                        ratio_eff = self.ratio
-                    
-                    gr_db = (self.envelope - self.threshold) * (1.0 - 1.0 / ratio_eff)
-                else:
-                    gr_db = 0.0
-            else:
-                gr_db = 0.0
-            
-            self.gain_reduction = gr_db
-            self.gr_history.append(gr_db)
-            if len(self.gr_history) > 10000:
-                self.gr_history.pop(0)
-            
-            # Apply gain reduction + makeup gain
-            total_gain_db = -gr_db + self.makeup_gain
-            total_gain_linear = self._db_to_linear(total_gain_db)
-            output[..., i] *= total_gain_linear
+        # Apply gain reduction + makeup gain
+        gain = db_to_linear(self._makeup.next(num_samples, self.makeup_gain) - gr_db)
+        output = (signal * gain).astype(signal.dtype, copy=False)
         
         # Soft clipping to prevent harsh distortion
         output = np.tanh(output)
         
         return output
 
+    def batch_key(self):
+        """Instances with equal keys can share one process_batch() call."""
+        if not self.enabled or not self._settled():
+            return None
+        return ("compressor", float(self.knee))
+
+    def _settled(self) -> bool:
+        """Whether no smoothed parameter is ramping."""
+        return (self._threshold.is_steady(self.threshold) and self._ratio.is_steady(self.ratio)
+                and self._makeup.is_steady(self.makeup_gain))
+
+    @classmethod
+    def process_batch(cls, effects, signals: np.ndarray) -> np.ndarray:
+        """
+        Compress stacked (instances, ..., samples) blocks in one pass.
+
+        Thresholds, ratios, times and makeup gains are per-instance
+        vectors and all envelopes run through one envelope_bank call
+        (see smooth_envelopes); every instance's envelope, meter and
+        history are updated exactly as by its own process().
+        """
+        num, num_samples = len(effects), signals.shape[-1]
+        levels = np.abs(signals).reshape(num, -1, num_samples).max(axis=1)
+        envelope = smooth_envelopes(
+            linear_to_db(levels),
+            [e.envelope for e in effects],
+            [time_coefficient(e.attack, e.sample_rate) for e in effects],
+            [time_coefficient(e.release, e.sample_rate) for e in effects],
+        )
+        # batch_key() only matches settled instances, so these are scalars
+        gr_db = compressor_gain_db(
+            envelope,
+            np.array([e._threshold.next(num_samples, e.threshold) for e in effects])[:, None],
+            np.array([e._ratio.next(num_samples, e.ratio) for e in effects])[:, None],
+            effects[0].knee,
+        )
+        for effect, env, gr in zip(effects, envelope, gr_db):
+            effect.envelope = float(env[-1])
+            effect.gain_reduction = float(gr[-1])
+            effect.gr_history.extend(gr)
+
+        makeup = np.array([e._makeup.next(num_samples, e.makeup_gain) for e in effects])[:, None]
+        gain = db_to_linear(makeup - gr_db).reshape(
+            (num,) + (1,) * (signals.ndim - 2) + (num_samples,))
+        return np.tanh((signals * gain).astype(signals.dtype, copy=False))
+
     def set_threshold(self, db: float):
         """Set compression threshold."""
         self.threshold = np.clip(db, -60, 0)
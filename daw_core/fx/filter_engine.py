@@ -0,0 +1,350 @@
+"""
+Filter Engine
+
+Block-based IIR and FFT filtering shared by the EQ, filter and reverb
+effects.
+
+- Biquad and Butterworth coefficients are designed once per
+  (type, frequency, Q, gain, sample rate) and cached.
+- SOSFilter runs a second-order-section cascade with per-channel state
+  carried across blocks, so block edges are seamless at any block size.
+  Coefficient changes are ramped in short sub-blocks; biquad denominators
+  interpolate inside the stability triangle, so every intermediate filter
+  is stable.
+- linear_phase_fir() turns a cascade's magnitude response into a
+  linear-phase FIR, and PartitionedConvolver applies long FIR filters and
+  impulse responses with uniformly partitioned overlap-save FFT
+  convolution.
+"""
+
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import numpy as np
+from scipy.signal import butter, get_window, sosfilt, sosfreqz
+
+
+# Pass-through second-order section (pads cascades of different lengths)
+IDENTITY_SECTION = np.array([1.0, 0.0, 0.0, 1.0, 0.0, 0.0])
+
+SMOOTHING_MS = 20.0  # coefficient ramp length
+SMOOTHING_STEP = 32  # samples per interpolated coefficient set
+
+
+def _peaking(norm_freq: float, q: float, gain_db: float) -> np.ndarray:
+    """Peaking (bell) biquad."""
+    A = 10.0 ** (gain_db / 40.0)
+    w0 = 2 * np.pi * norm_freq
+    alpha = np.sin(w0) / (2 * q)
+
+    b0 = 1 + alpha * A
+    b1 = -2 * np.cos(w0)
+    b2 = 1 - alpha * A
+    a0 = 1 + alpha / A
+    a1 = -2 * np.cos(w0)
+    a2 = 1 - alpha / A
+
+    return np.array([[b0/a0, b1/a0, b2/a0, 1, a1/a0, a2/a0]])
+
+
+def _shelf(norm_freq: float, q: float, gain_db: float, shelf_type: str) -> np.ndarray:
+    """Low or high shelving biquad."""
+    A = 10.0 ** (gain_db / 40.0)
+    w0 = 2 * np.pi * norm_freq
+    alpha = np.sin(w0) / (2 * q)
+
+    if shelf_type == "low":
+        b0 = A * ((A + 1) - (A - 1) * np.cos(w0) + 2 * np.sqrt(A) * alpha)
+        b1 = 2 * A * ((A - 1) - (A + 1) * np.cos(w0))
+        b2 = A * ((A + 1) - (A - 1) * np.cos(w0) - 2 * np.sqrt(A) * alpha)
+        a0 = (A + 1) + (A - 1) * np.cos(w0) + 2 * np.sqrt(A) * alpha
+        a1 = -2 * ((A - 1) + (A + 1) * np.cos(w0))
+        a2 = (A + 1) + (A - 1) * np.cos(w0) - 2 * np.sqrt(A) * alpha
+    else:  # high
+        b0 = A * ((A + 1) + (A - 1) * np.cos(w0) + 2 * np.sqrt(A) * alpha)
+        b1 = -2 * A * ((A - 1) + (A + 1) * np.cos(w0))
+        b2 = A * ((A + 1) + (A - 1) * np.cos(w0) - 2 * np.sqrt(A) * alpha)
+        a0 = (A + 1) - (A - 1) * np.cos(w0) + 2 * np.sqrt(A) * alpha
+        a1 = 2 * ((A - 1) - (A + 1) * np.cos(w0))
+        a2 = (A + 1) - (A - 1) * np.cos(w0) - 2 * np.sqrt(A) * alpha
+
+    return np.array([[b0/a0, b1/a0, b2/a0, 1, a1/a0, a2/a0]])
+
+
+@lru_cache(maxsize=4096)
+def _cached_sos(kind: str, freq: float, q: float, gain_db: float,
+                sample_rate: float, order: int) -> np.ndarray:
+    """Design behind design_sos(), cached per parameter set."""
+    nyquist = sample_rate / 2
+    if kind == "peaking":
+        sos = _peaking(freq / nyquist, q, gain_db)
+    elif kind in ("lowshelf", "highshelf"):
+        sos = _shelf(freq / nyquist, q, gain_db, kind[:-5])
+    elif kind in ("highpass", "lowpass"):
+        sos = butter(int(order), np.clip(freq / nyquist, 0.01, 0.99), btype=kind, output="sos")
+    else:
+        raise ValueError(f"Unknown filter type: {kind}")
+    return sos
+
+
+def design_sos(kind: str, freq: float, q: float = 0.707, gain_db: float = 0.0,
+               sample_rate: float = 44100, order: int = 2) -> np.ndarray:
+    """
+    Second-order sections for one filter.
+
+    Designs are cached per parameter set; callers get their own copy.
+
+    Args:
+        kind: "peaking", "lowshelf", "highshelf", "highpass" or "lowpass"
+        freq: Frequency in Hz
+        q: Quality factor (biquads)
+        gain_db: Gain (peaking and shelving)
+        sample_rate: Sample rate in Hz
+        order: Butterworth order (highpass/lowpass)
+    """
+    return _cached_sos(kind, float(freq), float(q), float(gain_db),
+                       float(sample_rate), int(order)).copy()
+
+
+def _pad_sections(sos: np.ndarray, sections: int) -> np.ndarray:
+    """Append pass-through sections up to a section count."""
+    if len(sos) >= sections:
+        return sos
+    return np.vstack([sos, np.tile(IDENTITY_SECTION, (sections - len(sos), 1))])
+
+
+class SOSFilter:
+    """
+    Stateful SOS cascade for (..., samples) blocks.
+
+    Filter state is kept per channel (leading axes) and reset when the
+    channel layout changes. set_sos() on a running filter ramps the
+    coefficients over SMOOTHING_MS instead of switching abruptly.
+
+    Args:
+        sos: Initial (sections, 6) coefficients
+        sample_rate: Sample rate in Hz (sets the ramp length)
+    """
+
+    def __init__(self, sos: Optional[np.ndarray] = None, sample_rate: float = 44100):
+        self.sample_rate = sample_rate
+        self.sos: Optional[np.ndarray] = None
+        self._zi: Optional[np.ndarray] = None
+        self._ramp_from: Optional[np.ndarray] = None
+        self._ramp_left = 0
+        if sos is not None:
+            self.set_sos(sos, smooth=False)
+
+    @property
+    def _ramp_length(self) -> int:
+        return max(1, int(SMOOTHING_MS / 1000.0 * self.sample_rate))
+
+    def set_sos(self, sos: np.ndarray, smooth: bool = True):
+        """Set new coefficients, ramped if the filter is already running."""
+        sos = np.atleast_2d(np.asarray(sos, dtype=np.float64))
+        if self.sos is not None and sos.shape == self.sos.shape and np.array_equal(sos, self.sos):
+            return
+        if not smooth or self.sos is None or self._zi is None:
+            if self.sos is not None and len(sos) != len(self.sos):
+                self._zi = None
+            self.sos = sos
+            self._ramp_left = 0
+            return
+        sections = max(len(sos), len(self.sos))
+        self._ramp_from = _pad_sections(self._current(), sections)
+        self.sos = _pad_sections(sos, sections)
+        if len(self._zi) < sections:
+            pad = np.zeros((sections - len(self._zi),) + self._zi.shape[1:])
+            self._zi = np.concatenate((self._zi, pad))
+        self._ramp_left = self._ramp_length
+
+    def _current(self) -> np.ndarray:
+        """Coefficients in use right now (mid-ramp if ramping)."""
+        if self._ramp_left == 0:
+            return self.sos
+        t = 1.0 - self._ramp_left / self._ramp_length
+        return self._ramp_from + (self.sos - self._ramp_from) * t
+
+    @property
+    def ramping(self) -> bool:
+        """Whether a coefficient ramp is in progress."""
+        return self._ramp_left > 0
+
+    def _state(self, shape: tuple) -> np.ndarray:
+        """Filter state for blocks of a shape (fresh zeros if the layout changed)."""
+        zi_shape = (len(self.sos),) + shape[:-1] + (2,)
+        if self._zi is None or self._zi.shape != zi_shape:
+            self._zi = np.zeros(zi_shape)
+        return self._zi
+
+    @staticmethod
+    def process_batch(filters: Sequence["SOSFilter"], signals: np.ndarray) -> np.ndarray:
+        """
+        Run filters sharing one set of coefficients over stacked blocks.
+
+        signals is (instances, ..., samples) with one row per filter; all
+        filters must hold equal, non-ramping coefficients. Each filter's
+        state is carried exactly as if it had processed its row alone.
+        """
+        zi = np.stack([f._state(signals.shape[1:]) for f in filters], axis=1)
+        output, zi = sosfilt(filters[0].sos, signals, axis=-1, zi=zi)
+        for i, f in enumerate(filters):
+            f._zi = zi[:, i]
+        return output
+
+    def process(self, signal: np.ndarray) -> np.ndarray:
+        """Filter a block along the last axis, continuing from the previous one."""
+        self._state(signal.shape)
+        if self._ramp_left == 0:
+            output, self._zi = sosfilt(self.sos, signal, axis=-1, zi=self._zi)
+            return output
+
+        output = np.empty(signal.shape, dtype=np.result_type(signal, np.float64))
+        pos, num_samples = 0, signal.shape[-1]
+        while pos < num_samples:
+            if self._ramp_left == 0:
+                output[..., pos:], self._zi = sosfilt(self.sos, signal[..., pos:], axis=-1,
+                                                      zi=self._zi)
+                break
+            step = min(SMOOTHING_STEP, self._ramp_left, num_samples - pos)
+            self._ramp_left -= step
+            output[..., pos:pos + step], self._zi = sosfilt(
+                self._current(), signal[..., pos:pos + step], axis=-1, zi=self._zi
+            )
+            pos += step
+        return output
+
+    def reset(self):
+        """Clear filter state and finish any ramp."""
+        self._zi = None
+        self._ramp_left = 0
+
+
+def linear_phase_fir(sos: np.ndarray, num_taps: int) -> np.ndarray:
+    """
+    Linear-phase FIR with the magnitude response of an SOS cascade.
+
+    The magnitude is sampled on num_taps FFT bins, made zero-phase, centred
+    on tap num_taps // 2 and Hann-windowed, so the filter delays the signal
+    by num_taps // 2 samples. num_taps sets the frequency resolution
+    (sample_rate / num_taps).
+    """
+    num_taps = int(num_taps)
+    bins = 2 * np.pi * np.arange(num_taps // 2 + 1) / num_taps
+    _, response = sosfreqz(sos, worN=bins)
+    fir = np.fft.irfft(np.abs(response), n=num_taps)
+    return np.roll(fir, num_taps // 2) * get_window("hann", num_taps)
+
+
+def partition_spectra(ir: np.ndarray, partition_size: int) -> np.ndarray:
+    """
+    Split an impulse response into uniform partitions and FFT each one.
+
+    Args:
+        ir: (channels, samples) impulse response
+        partition_size: Samples per partition (B)
+
+    Returns:
+        (channels, partitions, B + 1) spectra of the partitions zero-padded to 2B
+    """
+    channels, length = ir.shape
+    num_parts = max(1, -(-length // partition_size))
+    padded = np.zeros((channels, num_parts, 2 * partition_size))
+    flat = np.zeros((channels, num_parts * partition_size))
+    flat[:, :length] = ir
+    padded[:, :, :partition_size] = flat.reshape(channels, num_parts, partition_size)
+    return np.fft.rfft(padded, axis=-1)
+
+
+class PartitionedConvolver:
+    """
+    Uniformly partitioned overlap-save FFT convolution.
+
+    The filter is split into partitions of B samples whose spectra are kept
+    in memory; past input spectra live in a frequency-domain delay line.
+    Each B-sample block costs one FFT, one IFFT and one vectorized
+    multiply-accumulate over the partitions, so cost per sample stays flat
+    as the filter grows. Calls shorter than B are processed with zero
+    latency by filtering the partially filled block.
+
+    A single-channel filter is applied to every input channel; otherwise
+    channel c uses filter channel c (the last one if there are fewer).
+
+    Args:
+        spectra: (filter_channels, partitions, B + 1) from partition_spectra()
+        partition_size: B
+    """
+
+    def __init__(self, spectra: np.ndarray, partition_size: int):
+        self.partition_size = int(partition_size)
+        self.spectra = spectra
+        self._channels = 0
+        self._input: Optional[np.ndarray] = None    # (channels, 2B): last block + current
+        self._fill = 0                              # samples in the current block
+        self._history: Optional[np.ndarray] = None  # (channels, partitions, B + 1) past spectra
+        self._head = 0                              # newest slot in _history
+        self._tail: Optional[np.ndarray] = None     # contribution of past blocks
+
+    def set_spectra(self, spectra: np.ndarray):
+        """Swap the filter, keeping the input history if the layout matches."""
+        same_layout = spectra.shape == self.spectra.shape
+        self.spectra = spectra
+        if not same_layout:
+            self.reset()
+        elif self._input is not None:
+            self._filters = self._channel_filters(self._channels)
+
+    def _channel_filters(self, channels: int) -> np.ndarray:
+        ir_channel = np.minimum(np.arange(channels), self.spectra.shape[0] - 1)
+        return self.spectra[ir_channel]
+
+    def _reset_state(self, channels: int):
+        """Allocate overlap-save buffers for a channel count."""
+        num_parts = self.spectra.shape[1]
+        bins = self.partition_size + 1
+        self._channels = channels
+        self._input = np.zeros((channels, 2 * self.partition_size))
+        self._fill = 0
+        self._history = np.zeros((channels, num_parts, bins), dtype=np.complex128)
+        self._head = 0
+        self._tail = np.zeros((channels, bins), dtype=np.complex128)
+        self._filters = self._channel_filters(channels)  # (channels, partitions, B + 1)
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """Convolve (channels, samples) input, carrying state across calls."""
+        B = self.partition_size
+        channels, num_samples = x.shape
+        if self._input is None or self._channels != channels:
+            self._reset_state(channels)
+
+        filters = self._filters
+        num_parts = filters.shape[1]
+        output = np.empty((channels, num_samples))
+        pos = 0
+        while pos < num_samples:
+            fill = self._fill
+            length = min(B - fill, num_samples - pos)
+            self._input[:, B + fill:B + fill + length] = x[:, pos:pos + length]
+
+            spectrum = np.fft.rfft(self._input, axis=-1)
+            block = np.fft.irfft(spectrum * filters[:, 0] + self._tail, n=2 * B, axis=-1)
+            output[:, pos:pos + length] = block[:, B + fill:B + fill + length]
+            self._fill = fill + length
+            pos += length
+
+            if self._fill == B:
+                # Block complete: push its spectrum and precompute the past part
+                self._head = (self._head + 1) % num_parts
+                self._history[:, self._head] = spectrum
+                if num_parts > 1:
+                    idx = (self._head - np.arange(num_parts - 1)) % num_parts
+                    self._tail = np.einsum('cpk,cpk->ck', self._history[:, idx], filters[:, 1:])
+                self._input[:, :B] = self._input[:, B:]
+                self._input[:, B:] = 0.0
+                self._fill = 0
+        return output
+
+    def reset(self):
+        """Clear convolution history."""
+        self._input = None
+        self._channels = 0
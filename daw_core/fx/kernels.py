@@ -0,0 +1,137 @@
+"""
+Kernel Backends
+
+Pluggable implementations of the DSP inner loops that cannot be
+vectorized because every sample depends on the previous one: envelope
+followers, damped comb and allpass feedback, and the LFO/ADSR state
+machines used by automation.
+
+Each kernel is written once as a plain per-sample loop over NumPy arrays
+and registered with a NumPy fallback of the same signature:
+
+    @kernel("envelope_follower", fallback=_envelope_numpy, example=...)
+    def envelope_follower(level_db, envelope, attack, release):
+        ...
+
+Backends:
+- "numba": the loop is compiled with numba.njit (cache=True, so compiled
+  machine code is reused across processes)
+- "numpy": the fallback runs (block-vectorized NumPy or a tight loop over
+  Python floats)
+
+The default is numba when it is installed, otherwise numpy; override it
+with set_backend() or the DAW_KERNEL_BACKEND environment variable.
+Compilation happens on a kernel's first call, so warm_up() should run at
+startup (it calls every kernel once on its small example arguments) to
+keep that cost out of the first audio block.
+"""
+
+import os
+import time
+from typing import Callable, Dict, Optional
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    numba = None
+
+
+BACKENDS = ("numba", "numpy")
+
+
+class Kernel:
+    """
+    One registered inner loop with a compiled and a fallback implementation.
+
+    Args:
+        name: Registry name
+        loop: Per-sample implementation (numba-compatible Python)
+        fallback: NumPy implementation with the same signature
+        example: Returns small arguments of the right dtypes for warm-up
+    """
+
+    def __init__(self, name: str, loop: Callable, fallback: Callable,
+                 example: Callable[[], tuple]):
+        self.name = name
+        self.loop = loop
+        self.fallback = fallback
+        self.example = example
+        self.__doc__ = loop.__doc__
+        self._compiled: Optional[Callable] = None
+        self._impl = fallback
+        self.backend = "numpy"
+
+    def select(self, backend: str):
+        """Route calls to the given backend's implementation."""
+        if backend == "numba":
+            if self._compiled is None:
+                self._compiled = numba.njit(cache=True)(self.loop)
+            self._impl = self._compiled
+        else:
+            self._impl = self.fallback
+        self.backend = backend
+
+    def warm_up(self) -> float:
+        """Run once on the example arguments; returns the seconds taken."""
+        t0 = time.perf_counter()
+        self._impl(*self.example())
+        return time.perf_counter() - t0
+
+    def __call__(self, *args):
+        return self._impl(*args)
+
+
+KERNELS: Dict[str, Kernel] = {}
+
+_backend = os.environ.get("DAW_KERNEL_BACKEND") or ("numba" if HAS_NUMBA else "numpy")
+if _backend not in BACKENDS or (_backend == "numba" and not HAS_NUMBA):
+    _backend = "numpy"
+
+
+def kernel(name: str, fallback: Callable, example: Callable[[], tuple]):
+    """Decorator registering a per-sample loop as a Kernel."""
+    def register(loop: Callable) -> Kernel:
+        k = Kernel(name, loop, fallback, example)
+        k.select(_backend)
+        KERNELS[name] = k
+        return k
+    return register
+
+
+def get_backend() -> str:
+    """Backend new and existing kernels run on."""
+    return _backend
+
+
+def set_backend(backend: str):
+    """
+    Switch every kernel to "numba" or "numpy".
+
+    Raises:
+        ValueError: Unknown backend, or numba requested but not installed
+    """
+    global _backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown kernel backend: {backend}")
+    if backend == "numba" and not HAS_NUMBA:
+        raise ValueError("numba is not installed")
+    _backend = backend
+    for k in KERNELS.values():
+        k.select(backend)
+
+
+def warm_up() -> Dict[str, float]:
+    """
+    Compile (numba) or touch (numpy) every registered kernel.
+
+    Returns:
+        Seconds spent per kernel
+    """
+    return {name: k.warm_up() for name, k in KERNELS.items()}
+
+
+def kernel_backends() -> Dict[str, str]:
+    """Backend of every registered kernel."""
+    return {name: k.backend for name, k in KERNELS.items()}
@@ -14,18 +14,155 @@ Utility Effects:
 - Trim: Precise input level control
 - WidthControl: Stereo width expansion/compression
 - CenterMeter: Center frequency extraction and metering
+
+The modulation effects work a block at a time: the LFO phase for the
+whole block is one array, and ModulatedDelay reads every voice and
+channel at its fractional delay with a single gather and interpolation.
+Audio is laid out as (frames, channels).
 """
 
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import math
 
+from .multiband import MultibandDynamics
+from .smoothing import SmoothedParameter
+
+
+INTERPOLATIONS = ("linear", "cubic")
+
+# LFO phase offset of each successive channel (stereo spread)
+CHANNEL_PHASE_OFFSET = 0.33
+
+
+def lfo_phases(phase: float, rate_hz: float, sample_rate: float,
+               frames: int) -> Tuple[np.ndarray, float]:
+    """
+    LFO phase (0-1) for every frame of a block.
+
+    Returns:
+        (phases, phase at the start of the next block)
+    """
+    step = rate_hz / sample_rate
+    phases = (phase + step * np.arange(frames)) % 1.0
+    return phases, (phase + step * frames) % 1.0
+
+
+class ModulatedDelay:
+    """
+    Delay line read at per-sample fractional delays, a block at a time.
+
+    The block is appended to the stored history and every read position
+    (for all voices and channels) is gathered and interpolated at once.
+    With feedback, the block is filled in chunks no longer than the
+    shortest delay, so each chunk only reads samples already written.
+
+    Args:
+        max_delay: Longest delay in samples
+        channels: Number of channels
+        interpolation: "linear" or "cubic" (4-point Catmull-Rom)
+    """
+
+    def __init__(self, max_delay: int, channels: int = 1, interpolation: str = "linear"):
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Unknown interpolation: {interpolation}")
+        self.max_delay = int(max_delay)
+        self.interpolation = interpolation
+        # Extra samples for the interpolation neighbours
+        self._history = np.zeros((channels, self.max_delay + 3))
+
+    @property
+    def channels(self) -> int:
+        return self._history.shape[0]
+
+    def _workspace(self, frames: int) -> np.ndarray:
+        history_len = self._history.shape[1]
+        work = np.zeros((self.channels, history_len + frames))
+        work[:, :history_len] = self._history
+        return work
+
+    def _interpolate(self, work: np.ndarray, start: int, delays: np.ndarray) -> np.ndarray:
+        """Read work at (block start + frame - delay), broadcast over voices/channels."""
+        frames = delays.shape[-1]
+        pos = (self._history.shape[1] + start + np.arange(frames)) - delays
+        base = np.floor(pos)
+        frac = pos - base
+        base = base.astype(np.intp)
+        rows = np.arange(self.channels)[:, None]
+        last = work.shape[1] - 1
+
+        def tap(offset):
+            # Neighbours past the write head only ever get zero weight
+            return work[rows, np.minimum(base + offset, last)]
+
+        x0, x1 = tap(0), tap(1)
+        if self.interpolation == "linear":
+            return x0 + frac * (x1 - x0)
+        xm1, x2 = tap(-1), tap(2)
+        return x0 + 0.5 * frac * (x1 - xm1 + frac * (2.0 * xm1 - 5.0 * x0 + 4.0 * x1 - x2
+                                                     + frac * (3.0 * (x0 - x1) + x2 - xm1)))
+
+    def read(self, signal: np.ndarray, delays: np.ndarray) -> np.ndarray:
+        """
+        Write a (channels, frames) block and read it back delayed.
+
+        Args:
+            signal: Input block
+            delays: Delay in samples per frame, broadcastable to
+                (voices, channels, frames) or (channels, frames)
+
+        Returns:
+            Delayed signal with the broadcast shape of delays
+        """
+        frames = signal.shape[-1]
+        min_delay = 1.0 if self.interpolation == "cubic" else 0.0
+        work = self._workspace(frames)
+        work[:, -frames:] = signal
+        wet = self._interpolate(work, 0, np.clip(delays, min_delay, self.max_delay))
+        self._history = work[:, frames:]
+        return wet
+
+    def feedback(self, signal: np.ndarray, delays: np.ndarray, amount: float) -> np.ndarray:
+        """
+        Feedback delay: writes signal + amount * delayed and returns delayed.
+
+        Args:
+            signal: Input block (channels, frames)
+            delays: Delay in samples per frame, broadcastable to (channels, frames)
+            amount: Feedback gain
+        """
+        frames = signal.shape[-1]
+        cubic = self.interpolation == "cubic"
+        delays = np.clip(delays, 2.0 if cubic else 1.0, self.max_delay)
+        chunk = max(1, int(delays.min()) - (1 if cubic else 0))
+        work = self._workspace(frames)
+        offset = work.shape[1] - frames
+        wet = np.empty((self.channels, frames))
+        for start in range(0, frames, chunk):
+            end = min(start + chunk, frames)
+            delayed = self._interpolate(work, start, delays[..., start:end])
+            wet[:, start:end] = delayed
+            work[:, offset + start:offset + end] = signal[:, start:end] + delayed * amount
+        self._history = work[:, frames:]
+        return wet
+
+    def clear(self):
+        """Zero the delay history."""
+        self._history.fill(0)
+
+
+def _as_channels(audio: np.ndarray) -> np.ndarray:
+    """(frames, channels) or mono (frames,) audio as (channels, frames)."""
+    return audio.reshape(audio.shape[0], -1).T
+
 
 class Chorus:
     """Chorus effect with adjustable depth and rate
     
     Creates a shimmering, doubled vocal effect by adding detuned copies
-    of the signal with varying delays.
+    of the signal with varying delays. Each channel's LFO is offset for
+    stereo spread; extra voices are spread evenly across the LFO cycle
+    and read together as a stacked voices dimension.
     """
     
     def __init__(self, name: str = "Chorus", sample_rate: int = 44100):
@@ -38,12 +175,12 @@ class Chorus:
         self.depth_ms = 3.0  # Max delay depth
         self.wet_level = 0.5  # Wet signal blend
         self.dry_level = 0.5  # Dry signal blend
+        self.voices = 1  # Delayed copies per channel
+        self.interpolation = "linear"
         
         # State
         self.buffer_size = int(sample_rate * 0.01)  # 10ms buffer
-        self.buffer_l = np.zeros(self.buffer_size)
-        self.buffer_r = np.zeros(self.buffer_size)
-        self.write_pos = 0
+        self._delay: Optional[ModulatedDelay] = None
         self.phase = 0.0
     
     def process(self, audio: np.ndarray) -> np.ndarray:
@@ -51,57 +188,22 @@ class Chorus:
         if not self.enabled or audio.shape[0] == 0:
             return audio
         
-        output = audio.copy()
-        frames = audio.shape[0]
-        
-        for i in range(frames):
-            # Generate LFO (sine wave)
-            lfo = np.sin(2 * np.pi * self.phase)
-            delay_samples = (self.depth_ms * self.sample_rate / 1000) * (lfo + 1) / 2
-            
-            # Read from circular buffer with interpolation
-            read_pos = (self.write_pos - delay_samples) % self.buffer_size
-            int_pos = int(read_pos)
-            frac = read_pos - int_pos
-            
-            # Linear interpolation for smooth modulation
-            if audio.shape[1] >= 2:  # Stereo
-                # Left channel
-                s0_l = self.buffer_l[int_pos]
-                s1_l = self.buffer_l[(int_pos + 1) % self.buffer_size]
-                wet_l = s0_l * (1 - frac) + s1_l * frac
-                output[i, 0] = audio[i, 0] * self.dry_level + wet_l * self.wet_level
-                
-                # Right channel (slightly different phase)
-                phase_r = (self.phase + 0.33) % 1.0
-                lfo_r = np.sin(2 * np.pi * phase_r)
-                delay_samples_r = (self.depth_ms * self.sample_rate / 1000) * (lfo_r + 1) / 2
-                read_pos_r = (self.write_pos - delay_samples_r) % self.buffer_size
-                int_pos_r = int(read_pos_r)
-                frac_r = read_pos_r - int_pos_r
-                
-                s0_r = self.buffer_r[int_pos_r]
-                s1_r = self.buffer_r[(int_pos_r + 1) % self.buffer_size]
-                wet_r = s0_r * (1 - frac_r) + s1_r * frac_r
-                output[i, 1] = audio[i, 1] * self.dry_level + wet_r * self.wet_level
-            else:  # Mono
-                s0 = self.buffer_l[int_pos]
-                s1 = self.buffer_l[(int_pos + 1) % self.buffer_size]
-                wet = s0 * (1 - frac) + s1 * frac
-                output[i, 0] = audio[i, 0] * self.dry_level + wet * self.wet_level
-            
-            # Write to buffer
-            self.buffer_l[self.write_pos] = audio[i, 0] if audio.shape[1] >= 1 else 0
-            if audio.shape[1] >= 2:
-                self.buffer_r[self.write_pos] = audio[i, 1]
-            
-            # Update state
-            self.write_pos = (self.write_pos + 1) % self.buffer_size
-            self.phase += self.rate_hz / self.sample_rate
-            if self.phase >= 1.0:
-                self.phase -= 1.0
-        
-        return output
+        x = _as_channels(audio)
+        channels, frames = x.shape
+        if (self._delay is None or self._delay.channels != channels
+                or self._delay.interpolation != self.interpolation):
+            self._delay = ModulatedDelay(self.buffer_size, channels, self.interpolation)
+
+        # LFO per (voice, channel, frame)
+        phases, self.phase = lfo_phases(self.phase, self.rate_hz, self.sample_rate, frames)
+        offsets = (np.arange(self.voices)[:, None] / self.voices
+                   + CHANNEL_PHASE_OFFSET * np.arange(channels)[None, :])
+        lfo = np.sin(2 * np.pi * (phases + offsets[:, :, None]))
+        delays = (self.depth_ms * self.sample_rate / 1000) * (lfo + 1) / 2
+
+        wet = self._delay.read(x, delays).mean(axis=0)
+        output = x * self.dry_level + wet * self.wet_level
+        return output.T.reshape(audio.shape).astype(audio.dtype, copy=False)
     
     def set_rate(self, rate_hz: float):
         """Set LFO rate in Hz"""
@@ -115,6 +217,16 @@ class Chorus:
         """Set wet/dry mix (0.0 to 1.0)"""
         self.wet_level = max(0.0, min(wet, 1.0))
         self.dry_level = max(0.0, min(dry, 1.0))
+
+    def set_voices(self, voices: int):
+        """Set number of chorus voices per channel (1 to 8)"""
+        self.voices = int(max(1, min(voices, 8)))
+
+    def set_interpolation(self, mode: str):
+        """Set fractional-delay interpolation ("linear" or "cubic")"""
+        if mode not in INTERPOLATIONS:
+            raise ValueError(f"Unknown interpolation: {mode}")
+        self.interpolation = mode
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -125,6 +237,8 @@ class Chorus:
             'depth_ms': self.depth_ms,
             'wet_level': self.wet_level,
             'dry_level': self.dry_level,
+            'voices': self.voices,
+            'interpolation': self.interpolation,
         }
     
     @classmethod
@@ -135,6 +249,8 @@ class Chorus:
         effect.depth_ms = data.get('depth_ms', 3.0)
         effect.wet_level = data.get('wet_level', 0.5)
         effect.dry_level = data.get('dry_level', 0.5)
+        effect.set_voices(data.get('voices', 1))
+        effect.set_interpolation(data.get('interpolation', 'linear'))
         return effect
 
 
@@ -145,6 +261,8 @@ class Flanger:
     producing a jet-like or "whooshing" effect.
     """
     
+    MIN_DELAY_MS = 0.5
+
     def __init__(self, name: str = "Flanger", sample_rate: int = 44100):
         self.name = name
         self.sample_rate = sample_rate
@@ -155,11 +273,11 @@ class Flanger:
         self.depth_ms = 5.0
         self.feedback = 0.5
         self.wet_level = 0.5
+        self.interpolation = "linear"
         
-        # State
-        self.buffer_size = int(sample_rate * 0.01)
-        self.buffer = np.zeros(self.buffer_size)
-        self.write_pos = 0
+        # State (room for the minimum delay plus the deepest sweep)
+        self.buffer_size = int(sample_rate * (self.MIN_DELAY_MS + 10.0) / 1000) + 1
+        self._delay: Optional[ModulatedDelay] = None
         self.phase = 0.0
     
     def process(self, audio: np.ndarray) -> np.ndarray:
@@ -167,41 +285,22 @@ class Flanger:
         if not self.enabled or audio.shape[0] == 0:
             return audio
         
-        output = audio.copy()
-        frames = audio.shape[0]
-        channel = audio[:, 0] if audio.shape[1] >= 1 else audio[:, 0]
-        
-        for i in range(frames):
-            # LFO for delay modulation
-            lfo = np.sin(2 * np.pi * self.phase)
-            min_delay = 0.5  # ms
-            max_delay = min_delay + self.depth_ms
-            delay_ms = min_delay + (lfo + 1) / 2 * self.depth_ms
-            delay_samples = delay_ms * self.sample_rate / 1000
-            
-            # Read with interpolation
-            read_pos = (self.write_pos - delay_samples) % self.buffer_size
-            int_pos = int(read_pos)
-            frac = read_pos - int_pos
-            
-            s0 = self.buffer[int_pos]
-            s1 = self.buffer[(int_pos + 1) % self.buffer_size]
-            delayed = s0 * (1 - frac) + s1 * frac
-            
-            # Mix and feedback
-            output[i, 0] = channel[i] + delayed * self.wet_level
-            feedback_in = channel[i] + delayed * self.feedback
-            
-            # Write to buffer
-            self.buffer[self.write_pos] = feedback_in
-            self.write_pos = (self.write_pos + 1) % self.buffer_size
-            
-            # Update LFO
-            self.phase += self.rate_hz / self.sample_rate
-            if self.phase >= 1.0:
-                self.phase -= 1.0
-        
-        return output
+        x = _as_channels(audio)
+        channels, frames = x.shape
+        if (self._delay is None or self._delay.channels != channels
+                or self._delay.interpolation != self.interpolation):
+            self._delay = ModulatedDelay(self.buffer_size, channels, self.interpolation)
+
+        # LFO for delay modulation
+        phases, self.phase = lfo_phases(self.phase, self.rate_hz, self.sample_rate, frames)
+        lfo = np.sin(2 * np.pi * phases)
+        delay_ms = self.MIN_DELAY_MS + (lfo + 1) / 2 * self.depth_ms
+        delays = delay_ms * self.sample_rate / 1000
+
+        # Mix and feedback
+        delayed = self._delay.feedback(x, delays, self.feedback)
+        output = x + delayed * self.wet_level
+        return output.T.reshape(audio.shape).astype(audio.dtype, copy=False)
     
     def set_rate(self, rate_hz: float):
         self.rate_hz = max(0.05, min(rate_hz, 2.0))
@@ -211,6 +310,12 @@ class Flanger:
     
     def set_feedback(self, feedback: float):
         self.feedback = max(0.0, min(feedback, 0.8))
+
+    def set_interpolation(self, mode: str):
+        """Set fractional-delay interpolation ("linear" or "cubic")"""
+        if mode not in INTERPOLATIONS:
+            raise ValueError(f"Unknown interpolation: {mode}")
+        self.interpolation = mode
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -221,6 +326,7 @@ class Flanger:
             'depth_ms': self.depth_ms,
             'feedback': self.feedback,
             'wet_level': self.wet_level,
+            'interpolation': self.interpolation,
         }
 
 
@@ -239,29 +345,22 @@ class Tremolo:
         self.rate_hz = 4.0
         self.depth = 0.5  # 0.0 = no effect, 1.0 = full modulation
         self.phase = 0.0
+        self._depth = SmoothedParameter(self.depth, sample_rate=sample_rate)
     
     def process(self, audio: np.ndarray) -> np.ndarray:
         """Process audio through tremolo"""
         if not self.enabled or audio.shape[0] == 0:
             return audio
         
-        output = audio.copy()
-        frames = audio.shape[0]
-        
-        for i in range(frames):
-            # LFO from 0 to 1
-            lfo = (np.sin(2 * np.pi * self.phase) + 1) / 2
-            
-            # Blend between 1.0 and depth value
-            amplitude = 1.0 - self.depth + lfo * self.depth
-            
-            output[i] *= amplitude
-            
-            self.phase += self.rate_hz / self.sample_rate
-            if self.phase >= 1.0:
-                self.phase -= 1.0
+        phases, self.phase = lfo_phases(self.phase, self.rate_hz, self.sample_rate,
+                                        audio.shape[0])
+        # LFO from 0 to 1, blended between 1.0 and depth value
+        lfo = (np.sin(2 * np.pi * phases) + 1) / 2
+        depth = self._depth.next(audio.shape[0], self.depth)
+        amplitude = 1.0 - depth + lfo * depth
         
-        return output
+        output = audio * amplitude.reshape((-1,) + (1,) * (audio.ndim - 1))
+        return output.astype(audio.dtype, copy=False)
     
     def set_rate(self, rate_hz: float):
         self.rate_hz = max(0.1, min(rate_hz, 20.0))
@@ -304,6 +403,17 @@ class Gain:
         
         return audio * gain_linear
     
+    def get_tail_samples(self) -> int:
+        """Memoryless: no tail."""
+        return 0
+
+    def linear_response(self):
+        """(sos, matrix) for chain fusion: a scaled identity"""
+        if not self.enabled:
+            return None, None
+        gain_linear = 10 ** ((self.gain_db + self.makeup_gain_db) / 20.0)
+        return None, np.eye(2) * gain_linear
+
     def set_gain(self, gain_db: float):
         """Set input gain in dB"""
         self.gain_db = max(-96.0, min(gain_db, 24.0))
@@ -327,6 +437,10 @@ class WidthControl:
     
     Expands or compresses the stereo image by manipulating
     mid/side components of the signal.
+
+    Unlike the modulation effects, audio is laid out as the engine's
+    (channels, samples) blocks, with left and right in rows 0 and 1, so
+    process() and linear_response() agree when the insert is fused.
     """
     
     def __init__(self, name: str = "Width Control", sample_rate: int = 44100):
@@ -338,14 +452,14 @@ class WidthControl:
     
     def process(self, audio: np.ndarray) -> np.ndarray:
         """Process stereo width"""
-        if not self.enabled or audio.shape[0] == 0 or audio.shape[1] < 2:
+        if not self.enabled or audio.ndim < 2 or audio.shape[0] < 2 or audio.shape[1] == 0:
             return audio
         
         output = audio.copy()
         
         # Extract mid and side
-        left = output[:, 0]
-        right = output[:, 1]
+        left = output[0]
+        right = output[1]
         mid = (left + right) / 2
         side = (left - right) / 2
         
@@ -353,11 +467,18 @@ class WidthControl:
         side *= self.width
         
         # Reconstruct L/R
-        output[:, 0] = mid + side
-        output[:, 1] = mid - side
+        output[0] = mid + side
+        output[1] = mid - side
         
         return output
     
+    def linear_response(self):
+        """(sos, matrix) for chain fusion: mid/side scaling on (left, right)"""
+        if not self.enabled:
+            return None, None
+        direct, cross = (1 + self.width) / 2, (1 - self.width) / 2
+        return None, np.array([[direct, cross], [cross, direct]])
+
     def set_width(self, width: float):
         """Set stereo width (0.0 = mono, 1.0 = normal, 2.0+ = wider)"""
         self.width = max(0.0, min(width, 3.0))
@@ -376,7 +497,14 @@ class DynamicEQ:
     
     Applies compression only to specific frequency bands,
     useful for controlling resonances and problem frequencies.
+
+    Bands are split by a Linkwitz-Riley crossover placed halfway (on a log
+    scale) between neighbouring band frequencies, and compressed together
+    by the shared multiband engine.
     """
+
+    # Kernels process() runs on (see kernels.py)
+    KERNELS = ("envelope_bank",)
     
     def __init__(self, name: str = "Dynamic EQ", sample_rate: int = 44100, num_bands: int = 3):
         self.name = name
@@ -385,33 +513,30 @@ class DynamicEQ:
         self.num_bands = num_bands
         
         # Per-band parameters
-        self.band_freqs = [200, 1000, 5000]  # Hz
-        self.band_q = [0.7, 0.7, 0.7]
-        self.band_threshold = [-20, -20, -20]  # dB
-        self.band_ratio = [4.0, 4.0, 4.0]
+        self.band_freqs = np.geomspace(200, 5000, num_bands).tolist()  # Hz
+        self.band_threshold = [-20.0] * num_bands  # dB
+        self.band_ratio = [4.0] * num_bands
+
+        self._engine = MultibandDynamics(self._crossover_freqs(), sample_rate)
+        self._update_engine()
+
+    def _crossover_freqs(self):
+        freqs = np.sort(self.band_freqs)
+        return np.sqrt(freqs[:-1] * freqs[1:]).tolist()
+
+    def _update_engine(self):
+        order = np.argsort(self.band_freqs)
+        self._engine.set_frequencies(self._crossover_freqs())
+        self._engine.thresholds[:] = np.asarray(self.band_threshold, dtype=np.float64)[order]
+        self._engine.ratios[:] = np.asarray(self.band_ratio, dtype=np.float64)[order]
     
     def process(self, audio: np.ndarray) -> np.ndarray:
         """Process through dynamic EQ"""
-        if not self.enabled:
+        if not self.enabled or audio.size == 0:
             return audio
         
-        # Simplified: apply gentle compression to detected frequencies
-        output = audio.copy()
-        
-        for i in range(self.num_bands):
-            # Detect energy at band frequency
-            freq = self.band_freqs[i]
-            # Simplified peak detection
-            peak = np.max(np.abs(output))
-            peak_db = 20 * np.log10(max(peak, 1e-10))
-            
-            # Apply compression if above threshold
-            if peak_db > self.band_threshold[i]:
-                excess = peak_db - self.band_threshold[i]
-                gain_reduction = excess / self.band_ratio[i]
-                output *= 10 ** (-gain_reduction / 20.0)
-        
-        return output
+        bands = self._engine.process(audio.T)
+        return bands.sum(axis=0).T.astype(audio.dtype, copy=False)
     
     def set_band(self, band: int, freq_hz: float, threshold_db: float, ratio: float):
         """Configure a dynamic EQ band"""
@@ -419,6 +544,18 @@ class DynamicEQ:
             self.band_freqs[band] = freq_hz
             self.band_threshold[band] = threshold_db
             self.band_ratio[band] = ratio
+            self._update_engine()
+
+    def get_gain_reduction(self) -> list:
+        """Current gain reduction of each band in dB"""
+        order = np.argsort(self.band_freqs)
+        gr = np.empty(self.num_bands)
+        gr[order] = self._engine.gain_reduction
+        return gr.tolist()
+
+    def reset(self):
+        """Clear filter and detector state"""
+        self._engine.reset()
     
     def to_dict(self) -> Dict[str, Any]:
         return {
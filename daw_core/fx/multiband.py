@@ -0,0 +1,174 @@
+"""
+Multiband Engine
+
+Shared band splitting and per-band dynamics for DynamicEQ and
+MultibandCompressor.
+
+Crossover splits a block into all of its bands in one pass through a tree
+of 4th-order Linkwitz-Riley filters: each crossover point splits the
+remaining upper signal into a low and a high part, and the bands already
+split off below it pass through that crossover's allpass so every band
+sees the same phase. The bands sum back to an allpass of the input (flat
+magnitude), and all filters keep their state across blocks.
+
+MultibandDynamics runs the dynamics_core detector and compressor curve on
+the stacked (bands, channels, samples) array: peak detection, dB
+conversion and gain computation are single array operations with per-band
+thresholds and ratios broadcast along the band axis.
+"""
+
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+import numpy as np
+from scipy.signal import butter
+
+from .dynamics_core import (
+    compressor_gain_db,
+    db_to_linear,
+    linear_to_db,
+    smooth_envelopes,
+    time_coefficient,
+)
+from .filter_engine import SOSFilter
+
+
+@lru_cache(maxsize=256)
+def linkwitz_riley(freq: float, sample_rate: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    4th-order Linkwitz-Riley lowpass, highpass and matching allpass (cached).
+
+    Each of the low/high pair is a squared 2nd-order Butterworth; their sum
+    is the 2nd-order allpass with the same poles.
+    """
+    norm_freq = float(np.clip(freq / (sample_rate / 2), 1e-4, 0.99))
+    low = butter(2, norm_freq, btype="lowpass", output="sos")
+    high = butter(2, norm_freq, btype="highpass", output="sos")
+    a = low[0, 3:]
+    allpass = np.array([[a[2], a[1], a[0], a[0], a[1], a[2]]])
+    return np.vstack((low, low)), np.vstack((high, high)), allpass
+
+
+class Crossover:
+    """
+    Linkwitz-Riley (LR4) band splitter with persistent filter state.
+
+    N crossover frequencies give N + 1 bands, lowest first. Changing the
+    frequencies without changing their count ramps the filters; changing
+    the count resets them.
+
+    Args:
+        frequencies: Ascending crossover frequencies in Hz
+        sample_rate: Sample rate in Hz
+    """
+
+    def __init__(self, frequencies: Sequence[float], sample_rate: float = 44100):
+        self.sample_rate = sample_rate
+        self.frequencies: Tuple[float, ...] = ()
+        self.set_frequencies(frequencies)
+
+    @property
+    def num_bands(self) -> int:
+        return len(self.frequencies) + 1
+
+    def set_frequencies(self, frequencies: Sequence[float]):
+        """Set the crossover points (sorted ascending)."""
+        frequencies = tuple(sorted(float(f) for f in frequencies))
+        designs = [linkwitz_riley(f, float(self.sample_rate)) for f in frequencies]
+        if len(frequencies) != len(self.frequencies):
+            self._low = [SOSFilter(low, self.sample_rate) for low, _, _ in designs]
+            self._high = [SOSFilter(high, self.sample_rate) for _, high, _ in designs]
+            self._allpass = [SOSFilter(ap, self.sample_rate) for _, _, ap in designs]
+        else:
+            for j, (low, high, ap) in enumerate(designs):
+                self._low[j].set_sos(low)
+                self._high[j].set_sos(high)
+                self._allpass[j].set_sos(ap)
+        self.frequencies = frequencies
+
+    def split(self, signal: np.ndarray) -> np.ndarray:
+        """
+        Split (..., samples) audio into bands.
+
+        Returns:
+            (bands, ..., samples) array; summing over bands gives the
+            input through the crossovers' combined allpass
+        """
+        bands = np.empty((self.num_bands,) + signal.shape)
+        rest = signal
+        for j in range(len(self.frequencies)):
+            if j > 0:
+                bands[:j] = self._allpass[j].process(bands[:j])
+            bands[j] = self._low[j].process(rest)
+            rest = self._high[j].process(rest)
+        bands[-1] = rest
+        return bands
+
+    def reset(self):
+        """Clear all filter state."""
+        for filt in self._low + self._high + self._allpass:
+            filt.reset()
+
+
+class MultibandDynamics:
+    """
+    Crossover followed by an independent compressor on every band.
+
+    Per-band parameters are arrays indexed by band; attack, release and
+    knee are shared. process() returns the processed bands so callers can
+    sum, solo or meter them.
+
+    Args:
+        frequencies: Crossover frequencies in Hz (bands = len + 1)
+        sample_rate: Sample rate in Hz
+    """
+
+    def __init__(self, frequencies: Sequence[float], sample_rate: float = 44100):
+        self.sample_rate = sample_rate
+        self.crossover = Crossover(frequencies, sample_rate)
+        self.attack = 10.0  # ms
+        self.release = 100.0  # ms
+        self.knee = 0.0
+        self._resize(self.crossover.num_bands)
+
+    def _resize(self, num_bands: int):
+        self.thresholds = np.full(num_bands, -20.0)  # dB
+        self.ratios = np.full(num_bands, 4.0)
+        self.makeup = np.zeros(num_bands)  # dB
+        self.envelopes = linear_to_db(np.zeros(num_bands))
+        self.gain_reduction = np.zeros(num_bands)  # dB, last sample of each band
+
+    @property
+    def num_bands(self) -> int:
+        return self.crossover.num_bands
+
+    def set_frequencies(self, frequencies: Sequence[float]):
+        """Move the crossovers; a different band count resets band settings."""
+        resize = len(frequencies) + 1 != self.num_bands
+        self.crossover.set_frequencies(frequencies)
+        if resize:
+            self._resize(self.num_bands)
+
+    def process(self, signal: np.ndarray) -> np.ndarray:
+        """Split and compress (..., samples) audio; returns (bands, ..., samples)."""
+        bands = self.crossover.split(signal)
+        num_bands, num_samples = bands.shape[0], bands.shape[-1]
+
+        levels = np.abs(bands).reshape(num_bands, -1, num_samples).max(axis=1)
+        envelope = smooth_envelopes(
+            linear_to_db(levels), self.envelopes,
+            time_coefficient(self.attack, self.sample_rate),
+            time_coefficient(self.release, self.sample_rate),
+        )
+        gr_db = compressor_gain_db(envelope, self.thresholds[:, None],
+                                   self.ratios[:, None], self.knee)
+        self.envelopes = envelope[:, -1].copy()
+        self.gain_reduction = gr_db[:, -1].copy()
+
+        gain = db_to_linear(self.makeup[:, None] - gr_db)
+        return bands * gain.reshape((num_bands,) + (1,) * (bands.ndim - 2) + (num_samples,))
+
+    def reset(self):
+        """Clear filter and envelope state."""
+        self.crossover.reset()
+        self.envelopes = linear_to_db(np.zeros(self.num_bands))
@@ -3,11 +3,23 @@ Saturation & Distortion Effects - Phase 2.4
 
 Professional-grade nonlinear processing for tone shaping and aggression.
 Includes smooth saturation, hard clipping, and distortion algorithms.
+
+Curves, oversampling and tone filtering run block-wise through the
+waveshaping engine; samples are along the last axis. Drive, makeup,
+threshold and mix changes are ramped per block (see smoothing.py).
 """
 
 import numpy as np
 from typing import Dict, Any
 
+from .smoothing import SmoothedParameter
+from .waveshaping import ToneFilter, WaveshapingEngine, apply_curve
+
+
+def _as_channels(signal: np.ndarray) -> np.ndarray:
+    """View a mono or multi-channel signal as (channels, samples)."""
+    return signal.reshape(-1, signal.shape[-1])
+
 
 class Saturation:
     """
@@ -40,6 +52,11 @@ class Saturation:
         # State
         self.output_level = 0.0
         self.last_output = 0.0
+        self._shaper = WaveshapingEngine("tanh")
+        self._tone_filter = ToneFilter()
+        self._drive = SmoothedParameter(self.drive, sample_rate=self.sample_rate)
+        self._makeup = SmoothedParameter(self.makeup_gain, sample_rate=self.sample_rate)
+        self._mix = SmoothedParameter(self.mix, sample_rate=self.sample_rate)
 
     def _db_to_linear(self, db: float) -> float:
         """Convert dB to linear."""
@@ -49,7 +66,7 @@ class Saturation:
         """Convert linear to dB."""
         return 20.0 * np.log10(max(linear, 1e-6))
 
-    def _soft_clip(self, x: float) -> float:
+    def _soft_clip(self, x: np.ndarray) -> np.ndarray:
         """
         Smooth saturation using tanh waveshaper.
         
@@ -58,56 +75,42 @@ class Saturation:
         - Natural compression of peaks
         - Harmonic distortion from 2nd-8th overtones
         """
-        return np.tanh(x)
+        return apply_curve(x, "tanh")
 
-    def _asymmetric_clip(self, x: float) -> float:
+    def _asymmetric_clip(self, x: np.ndarray) -> np.ndarray:
         """
         Asymmetrical soft clipping for tape-like character.
         Asymmetry adds even-order harmonics (warmth).
         """
-        if x > 0:
-            # Positive half: softer saturation
-            return np.tanh(x * 0.8)
-        else:
-            # Negative half: slightly harder saturation
-            return np.tanh(x * 1.2)
+        return apply_curve(x, "asymmetric")
 
     def process(self, signal: np.ndarray) -> np.ndarray:
         """Apply saturation with tone coloration."""
         if not self.enabled or signal.size == 0:
             return signal
         
-        # Apply input drive
-        drive_linear = self._db_to_linear(self.drive)
-        saturated = signal * drive_linear
-        
-        # Apply soft saturation
-        saturated = np.tanh(saturated)
+        x = _as_channels(signal)
+        num_samples = x.shape[-1]
+
+        # Apply input drive and soft saturation
+        drive_linear = self._db_to_linear(self._drive.next(num_samples, self.drive))
+        saturated = self._shaper.process(x * drive_linear)
         
         # Apply tone coloration (simple low-pass for warmth)
         if self.tone > 0.01:
-            # Simple one-pole low-pass filter for coloration
-            tone_coef = 0.1 * self.tone  # Smooth coefficient
-            saturated_filtered = np.zeros_like(saturated)
-            saturated_filtered[0] = saturated[0]
-            
-            for i in range(1, saturated.shape[-1]):
-                saturated_filtered[i] = (
-                    saturated_filtered[i-1] * (1 - tone_coef) + 
-                    saturated[i] * tone_coef
-                )
-            saturated = saturated_filtered
+            saturated = self._tone_filter.process(saturated, 0.1 * self.tone)
         
         # Apply makeup gain
-        makeup_linear = self._db_to_linear(self.makeup_gain)
+        makeup_linear = self._db_to_linear(self._makeup.next(num_samples, self.makeup_gain))
         saturated = saturated * makeup_linear
         
         # Mix wet and dry
-        output = signal * (1 - self.mix) + saturated * self.mix
+        mix = self._mix.next(num_samples, self.mix)
+        output = self._shaper.delay_dry(x) * (1 - mix) + saturated * mix
         
         self.output_level = np.max(np.abs(output))
         
-        return output
+        return output.reshape(signal.shape).astype(signal.dtype, copy=False)
 
     def set_drive(self, db: float):
         """Set input drive."""
@@ -125,6 +128,18 @@ class Saturation:
         """Set wet/dry mix (0 = dry only, 1 = wet only)."""
         self.mix = np.clip(amount, 0, 1)
 
+    def set_oversample(self, factor: int):
+        """Set oversampling factor (1, 2, 4 or 8)."""
+        self._shaper.set_oversample(int(factor))
+
+    def set_use_table(self, enabled: bool):
+        """Read the curve from a lookup table instead of computing it."""
+        self._shaper.use_table = bool(enabled)
+
+    def get_latency_samples(self) -> int:
+        """Delay added by oversampling."""
+        return self._shaper.get_latency_samples()
+
     def get_output_level(self) -> float:
         """Get current output level."""
         return self.output_level
@@ -139,6 +154,8 @@ class Saturation:
             "tone": self.tone,
             "makeup_gain": self.makeup_gain,
             "mix": self.mix,
+            "oversample": self._shaper.oversample,
+            "use_table": self._shaper.use_table,
         }
 
     def from_dict(self, data: Dict[str, Any]):
@@ -148,6 +165,8 @@ class Saturation:
         self.set_tone(data.get("tone", 0.5))
         self.set_makeup_gain(data.get("makeup_gain", 0))
         self.set_mix(data.get("mix", 1.0))
+        self.set_oversample(data.get("oversample", 1))
+        self.set_use_table(data.get("use_table", False))
 
 
 class HardClip:
@@ -176,6 +195,8 @@ class HardClip:
         
         # State
         self.clip_samples = 0
+        self._threshold = SmoothedParameter(self.threshold, sample_rate=self.sample_rate)
+        self._mix = SmoothedParameter(self.mix, sample_rate=self.sample_rate)
 
     def _db_to_linear(self, db: float) -> float:
         """Convert dB to linear."""
@@ -191,7 +212,8 @@ class HardClip:
             return signal
         
         # Convert threshold to linear
-        threshold_linear = self._db_to_linear(self.threshold)
+        num_samples = signal.shape[-1]
+        threshold_linear = self._db_to_linear(self._threshold.next(num_samples, self.threshold))
         
         # Hard clip
         clipped = np.clip(signal, -threshold_linear, threshold_linear)
@@ -200,7 +222,8 @@ class HardClip:
         self.clip_samples = np.sum(np.abs(signal) > threshold_linear)
         
         # Mix wet and dry
-        output = signal * (1 - self.mix) + clipped * self.mix
+        mix = self._mix.next(num_samples, self.mix)
+        output = signal * (1 - mix) + clipped * mix
         
         return output
 
@@ -252,6 +275,9 @@ class Distortion:
     - Mix: Wet/dry balance (0-1)
     """
 
+    # Distortion type -> waveshaping curve
+    CURVES = {"soft": "tanh", "hard": "hard", "fuzz": "fuzz"}
+
     def __init__(self, name: str = "Distortion"):
         self.name = name
         self.sample_rate = 44100
@@ -265,67 +291,53 @@ class Distortion:
         
         # State
         self.last_output = 0.0
+        self._shaper = WaveshapingEngine(self.CURVES[self.distortion_type])
+        self._tone_filter = ToneFilter()
+        self._drive = SmoothedParameter(self.drive, sample_rate=self.sample_rate)
+        self._mix = SmoothedParameter(self.mix, sample_rate=self.sample_rate)
 
     def _db_to_linear(self, db: float) -> float:
         """Convert dB to linear."""
         return 10.0 ** (db / 20.0)
 
-    def _soft_distortion(self, x: float) -> float:
+    def _soft_distortion(self, x: np.ndarray) -> np.ndarray:
         """Soft distortion: smooth saturation."""
-        return np.tanh(x)
+        return apply_curve(x, "tanh")
 
-    def _hard_distortion(self, x: float) -> float:
+    def _hard_distortion(self, x: np.ndarray) -> np.ndarray:
         """Hard distortion: aggressive clipping with slopes."""
-        if abs(x) > 1.0:
-            return np.sign(x) * (1.0 + 0.1 * np.log(abs(x)))
-        else:
-            return np.tanh(x * 1.5)
-
-    def _fuzz_distortion(self, x: float) -> float:
-        """Fuzz distortion: vintage fuzz-box character."""
-        # Hard clip then smooth
-        clipped = np.clip(x, -1, 1)
-        # Add fuzz octaver effect (subtract octave)
-        return clipped - 0.5 * np.sin(2 * np.pi * clipped)
+        return apply_curve(x, "hard")
+
+    def _fuzz_distortion(self, x: np.ndarray) -> np.ndarray:
+        """Fuzz distortion: vintage fuzz-box character (hard clip, minus an octave)."""
+        return apply_curve(x, "fuzz")
 
     def _apply_tone(self, signal: np.ndarray, tone: float) -> np.ndarray:
-        """Apply low-pass filter for tone control."""
+        """Apply low-pass filter for tone control (state kept across blocks)."""
         if tone < 0.01:
             return signal
-        
-        # Simple one-pole low-pass
-        tone_coef = 0.1 * tone
-        filtered = np.zeros_like(signal)
-        filtered[0] = signal[0]
-        
-        for i in range(1, signal.shape[-1]):
-            filtered[i] = filtered[i-1] * (1 - tone_coef) + signal[i] * tone_coef
-        
-        return filtered
+        return self._tone_filter.process(signal, 0.1 * tone)
 
     def process(self, signal: np.ndarray) -> np.ndarray:
         """Apply distortion."""
         if not self.enabled or signal.size == 0:
             return signal
         
-        # Apply drive
-        drive_linear = self._db_to_linear(self.drive)
-        distorted = signal * drive_linear
-        
-        # Apply distortion type
-        if self.distortion_type == "soft":
-            distorted = np.tanh(distorted)
-        elif self.distortion_type == "hard":
-            distorted = np.array([self._hard_distortion(x) for x in distorted])
-        elif self.distortion_type == "fuzz":
-            distorted = np.array([self._fuzz_distortion(x) for x in distorted])
+        x = _as_channels(signal)
+
+        # Apply drive and the distortion type's curve
+        num_samples = x.shape[-1]
+        drive_linear = self._db_to_linear(self._drive.next(num_samples, self.drive))
+        distorted = self._shaper.process(x * drive_linear)
         
         # Apply tone
         if self.tone > 0.01:
             distorted = self._apply_tone(distorted, self.tone)
         
         # Mix wet and dry
-        output = signal * (1 - self.mix) + distorted * self.mix
+        mix = self._mix.next(num_samples, self.mix)
+        output = self._shaper.delay_dry(x) * (1 - mix) + distorted * mix
+        output = output.reshape(signal.shape).astype(signal.dtype, copy=False)
         
         self.last_output = output
         
@@ -333,8 +345,9 @@ class Distortion:
 
     def set_type(self, dtype: str):
         """Set distortion type (soft, hard, fuzz)."""
-        if dtype in ["soft", "hard", "fuzz"]:
+        if dtype in self.CURVES:
             self.distortion_type = dtype
+            self._shaper.curve = self.CURVES[dtype]
 
     def set_drive(self, db: float):
         """Set drive intensity."""
@@ -348,6 +361,18 @@ class Distortion:
         """Set wet/dry mix."""
         self.mix = np.clip(amount, 0, 1)
 
+    def set_oversample(self, factor: int):
+        """Set oversampling factor (1, 2, 4 or 8)."""
+        self._shaper.set_oversample(int(factor))
+
+    def set_use_table(self, enabled: bool):
+        """Read the curve from a lookup table instead of computing it."""
+        self._shaper.use_table = bool(enabled)
+
+    def get_latency_samples(self) -> int:
+        """Delay added by oversampling."""
+        return self._shaper.get_latency_samples()
+
     def to_dict(self) -> Dict[str, Any]:
         """Serialize state."""
         return {
@@ -358,6 +383,8 @@ class Distortion:
             "drive": self.drive,
             "tone": self.tone,
             "mix": self.mix,
+            "oversample": self._shaper.oversample,
+            "use_table": self._shaper.use_table,
         }
 
     def from_dict(self, data: Dict[str, Any]):
@@ -367,6 +394,8 @@ class Distortion:
         self.set_drive(data.get("drive", 12))
         self.set_tone(data.get("tone", 0.5))
         self.set_mix(data.get("mix", 1.0))
+        self.set_oversample(data.get("oversample", 1))
+        self.set_use_table(data.get("use_table", False))
 
 
 class WaveShaper:
@@ -394,49 +423,50 @@ class WaveShaper:
         self.drive = 1.0
         self.mix = 1.0
 
-    def _sine_curve(self, x: float) -> float:
+        # State
+        self._shaper = WaveshapingEngine(self.curve)
+        self._drive = SmoothedParameter(self.drive, mode="exponential",
+                                        sample_rate=self.sample_rate)
+        self._mix = SmoothedParameter(self.mix, sample_rate=self.sample_rate)
+
+    def _sine_curve(self, x: np.ndarray) -> np.ndarray:
         """Sine waveshaper: smooth, musical."""
-        return np.sin(x * np.pi / 2) * np.sign(x)
+        return apply_curve(x, "sine")
 
-    def _square_curve(self, x: float) -> float:
+    def _square_curve(self, x: np.ndarray) -> np.ndarray:
         """Square waveshaper: aggressive, bit-crusher."""
-        return np.sign(x) * (1.0 if abs(x) > 0.5 else abs(x) * 2)
+        return apply_curve(x, "square")
 
-    def _cubic_curve(self, x: float) -> float:
+    def _cubic_curve(self, x: np.ndarray) -> np.ndarray:
         """Cubic waveshaper: soft distortion."""
-        return x - (x ** 3) / 3
+        return apply_curve(x, "cubic")
 
-    def _tanh_curve(self, x: float) -> float:
+    def _tanh_curve(self, x: np.ndarray) -> np.ndarray:
         """Tanh waveshaper: smooth saturation."""
-        return np.tanh(x)
+        return apply_curve(x, "tanh")
 
     def process(self, signal: np.ndarray) -> np.ndarray:
         """Apply waveshaping."""
         if not self.enabled or signal.size == 0:
             return signal
         
-        # Apply drive
-        driven = signal * self.drive
-        
-        # Select curve
-        if self.curve == "sine":
-            shaped = np.array([self._sine_curve(x) for x in driven])
-        elif self.curve == "square":
-            shaped = np.array([self._square_curve(x) for x in driven])
-        elif self.curve == "cubic":
-            shaped = np.array([self._cubic_curve(x) for x in driven])
-        else:  # tanh
-            shaped = np.tanh(driven)
+        x = _as_channels(signal)
+
+        # Apply drive and the selected curve
+        num_samples = x.shape[-1]
+        shaped = self._shaper.process(x * self._drive.next(num_samples, self.drive))
         
         # Mix wet and dry
-        output = signal * (1 - self.mix) + shaped * self.mix
+        mix = self._mix.next(num_samples, self.mix)
+        output = self._shaper.delay_dry(x) * (1 - mix) + shaped * mix
         
-        return output
+        return output.reshape(signal.shape).astype(signal.dtype, copy=False)
 
     def set_curve(self, curve: str):
         """Set waveshape curve."""
         if curve in ["sine", "square", "cubic", "tanh"]:
             self.curve = curve
+            self._shaper.curve = curve
 
     def set_drive(self, amount: float):
         """Set drive intensity."""
@@ -446,6 +476,18 @@ class WaveShaper:
         """Set wet/dry mix."""
         self.mix = np.clip(amount, 0, 1)
 
+    def set_oversample(self, factor: int):
+        """Set oversampling factor (1, 2, 4 or 8)."""
+        self._shaper.set_oversample(int(factor))
+
+    def set_use_table(self, enabled: bool):
+        """Read the curve from a lookup table instead of computing it."""
+        self._shaper.use_table = bool(enabled)
+
+    def get_latency_samples(self) -> int:
+        """Delay added by oversampling."""
+        return self._shaper.get_latency_samples()
+
     def to_dict(self) -> Dict[str, Any]:
         """Serialize state."""
         return {
@@ -455,6 +497,8 @@ class WaveShaper:
             "curve": self.curve,
             "drive": self.drive,
             "mix": self.mix,
+            "oversample": self._shaper.oversample,
+            "use_table": self._shaper.use_table,
         }
 
     def from_dict(self, data: Dict[str, Any]):
@@ -463,3 +507,5 @@ class WaveShaper:
         self.set_curve(data.get("curve", "tanh"))
         self.set_drive(data.get("drive", 1.0))
         self.set_mix(data.get("mix", 1.0))
+        self.set_oversample(data.get("oversample", 1))
+        self.set_use_table(data.get("use_table", False))
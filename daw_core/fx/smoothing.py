@@ -0,0 +1,125 @@
+"""
+Parameter Smoothing
+
+Block-rate de-zippering for effect parameters.
+
+Effects keep their public parameter attributes (threshold, mix, drive, ...)
+as targets, set instantly by set_* methods, from_dict or parameter events.
+Each smoothed attribute has a SmoothedParameter. Once per block, next()
+reads the attribute and returns the value to use for every sample of the
+block:
+- a plain float while the parameter is settled, so steady-state cost is
+  one comparison and the effect's arithmetic stays scalar
+- a (samples,) ramp from the value in use toward the target, built with
+  one vectorized NumPy call, while it is moving
+
+A ramp broadcasts along the last (sample) axis, so it can be used in the
+same expressions as the scalar. Blocks can therefore be as large as you
+like during automation.
+
+Modes:
+- linear: equal steps (dB values, mixes, feedback, times)
+- exponential: equal ratios (linear gains, frequencies); falls back to
+  linear unless both endpoints are nonzero with the same sign
+
+The first block a parameter is used in starts at its target, since no
+audio was produced with the old value.
+"""
+
+from typing import Union
+
+import numpy as np
+
+
+SMOOTHING_MS = 20.0  # Default ramp length
+
+Block = Union[float, np.ndarray]
+
+
+def ramp_slice(value: Block, start: int, end: int) -> Block:
+    """Samples start:end of a next() result (floats pass through)."""
+    return value[start:end] if isinstance(value, np.ndarray) else value
+
+
+class SmoothedParameter:
+    """
+    One parameter's current value and its ramp toward the target.
+
+    Args:
+        value: Initial value (settled)
+        ramp_ms: Time to reach a new target
+        mode: "linear" or "exponential"
+        sample_rate: Sample rate in Hz
+    """
+
+    MODES = ("linear", "exponential")
+
+    def __init__(self, value: float, ramp_ms: float = SMOOTHING_MS, mode: str = "linear",
+                 sample_rate: float = 44100):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown smoothing mode: {mode}")
+        self.mode = mode
+        self.ramp_samples = max(0, int(round(ramp_ms * sample_rate / 1000.0)))
+        self.current = float(value)
+        self.target = float(value)
+        self._start = self.current
+        self._pos = 0
+        self._length = 0
+        self._primed = False
+
+    @property
+    def settled(self) -> bool:
+        return self._pos >= self._length
+
+    def is_steady(self, target: float) -> bool:
+        """Whether next() would return target itself (a scalar)."""
+        return self._pos >= self._length and (target == self.target or not self._primed)
+
+    def set_target(self, value: float):
+        """Start ramping from the value in use toward value."""
+        value = float(value)
+        if value == self.target:
+            return
+        if not self._primed or self.ramp_samples == 0:
+            self.snap(value)
+            return
+        self._start = self.current
+        self.target = value
+        self._pos = 0
+        self._length = self.ramp_samples
+
+    def snap(self, value: float = None):
+        """Jump to value (default: the target) with no ramp."""
+        if value is not None:
+            self.target = float(value)
+        self.current = self._start = self.target
+        self._pos = self._length = 0
+        self._primed = True
+
+    def next(self, num_samples: int, target: float = None) -> Block:
+        """
+        Value for the next num_samples samples.
+
+        Args:
+            num_samples: Block length
+            target: Current value of the parameter attribute (retargets
+                the ramp when it changed)
+
+        Returns:
+            A float when settled, else a (num_samples,) ramp
+        """
+        if target is not None and target != self.target:
+            self.set_target(target)
+        self._primed = True
+        if self._pos >= self._length or num_samples == 0:
+            return self.current
+
+        frac = np.minimum((self._pos + np.arange(1, num_samples + 1)) / self._length, 1.0)
+        start, end = self._start, self.target
+        if self.mode == "exponential" and start * end > 0:
+            ramp = start * (end / start) ** frac
+        else:
+            ramp = start + (end - start) * frac
+        self._pos = min(self._pos + num_samples, self._length)
+        self.current = end if self._pos >= self._length else float(ramp[-1])
+        return ramp
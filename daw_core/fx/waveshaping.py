@@ -0,0 +1,242 @@
+"""
+Waveshaping Engine
+
+Shared block-based building blocks for Saturation, Distortion and
+WaveShaper.
+
+Transfer curves are NumPy ufunc expressions over a whole block, or
+precomputed lookup tables read with linear interpolation (samples outside
+the table range fall back to the expression). An optional polyphase
+oversampler (2x/4x/8x) runs the curve at the higher rate to keep the
+harmonics it creates from aliasing back into the audio band; its latency
+is reported so the dry path and the engine can be aligned. The one-pole
+tone filter runs through lfilter with state carried across blocks.
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from scipy.signal import firwin, lfilter
+
+
+def _asymmetric(x: np.ndarray) -> np.ndarray:
+    """Softer positive half, harder negative half (even harmonics)."""
+    return np.tanh(np.where(x > 0, x * 0.8, x * 1.2))
+
+
+def _hard(x: np.ndarray) -> np.ndarray:
+    """tanh(1.5x) inside +-1, slow logarithmic growth beyond."""
+    ax = np.abs(x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        outer = np.sign(x) * (1.0 + 0.1 * np.log(ax))
+    return np.where(ax > 1.0, outer, np.tanh(x * 1.5))
+
+
+def _fuzz(x: np.ndarray) -> np.ndarray:
+    """Hard clip, then subtract an octave-up sine of the clipped signal."""
+    clipped = np.clip(x, -1, 1)
+    return clipped - 0.5 * np.sin(2 * np.pi * clipped)
+
+
+def _sine(x: np.ndarray) -> np.ndarray:
+    return np.sin(x * np.pi / 2) * np.sign(x)
+
+
+def _square(x: np.ndarray) -> np.ndarray:
+    ax = np.abs(x)
+    return np.sign(x) * np.where(ax > 0.5, 1.0, ax * 2)
+
+
+def _cubic(x: np.ndarray) -> np.ndarray:
+    return x - (x ** 3) / 3
+
+
+CURVES: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "tanh": np.tanh,
+    "asymmetric": _asymmetric,
+    "hard": _hard,
+    "fuzz": _fuzz,
+    "sine": _sine,
+    "square": _square,
+    "cubic": _cubic,
+}
+
+OVERSAMPLE_FACTORS = (1, 2, 4, 8)
+
+OVERSAMPLER_LATENCY = 16  # taps per polyphase branch
+
+TABLE_SIZE = 8193
+TABLE_LIMIT = 16.0  # covers +24 dB of drive on a full-scale signal
+
+
+@lru_cache(maxsize=None)
+def curve_table(curve: str, size: int = TABLE_SIZE,
+                limit: float = TABLE_LIMIT) -> Tuple[np.ndarray, np.ndarray]:
+    """Sample points and curve values over [-limit, limit] (cached)."""
+    xs = np.linspace(-limit, limit, size)
+    ys = CURVES[curve](xs)
+    xs.flags.writeable = False
+    ys.flags.writeable = False
+    return xs, ys
+
+
+def apply_curve(x: np.ndarray, curve: str, use_table: bool = False) -> np.ndarray:
+    """
+    Apply a named transfer curve to a block, directly or via its table.
+
+    Tables interpolate linearly, so a jump in a curve (e.g. "hard" at +-1)
+    is smoothed over one table step.
+    """
+    fn = CURVES[curve]
+    if not use_table:
+        return fn(x)
+    xs, ys = curve_table(curve)
+    shaped = np.interp(x, xs, ys)
+    outside = np.abs(x) > xs[-1]
+    if outside.any():
+        shaped[outside] = fn(x[outside])
+    return shaped
+
+
+class Oversampler:
+    """
+    Polyphase FIR up/down sampler with state carried across blocks.
+
+    A round trip delays the signal by taps_per_phase input samples.
+
+    Upsampling runs one short filter per phase at the input rate and
+    interleaves the results; downsampling filters the phase-decimated
+    streams and sums them, so no filter ever runs on zero-stuffed input.
+
+    Args:
+        factor: Oversampling factor (2, 4 or 8)
+        channels: Number of channels
+        taps_per_phase: Filter length per polyphase branch
+    """
+
+    def __init__(self, factor: int, channels: int = 1,
+                 taps_per_phase: int = OVERSAMPLER_LATENCY):
+        self.factor = factor
+        self.channels = channels
+        numtaps = taps_per_phase * factor + 1
+        fir = firwin(numtaps, 0.9 / factor, window=("kaiser", 8.0))
+        self._up = [fir[p::factor] * factor for p in range(factor)]
+        self._down = [fir[p::factor] for p in range(factor)]
+        # Both filters are linear phase, (numtaps - 1) / 2 high-rate samples each
+        self.latency = taps_per_phase
+        self.reset()
+
+    def reset(self):
+        """Clear filter state."""
+        self._up_state = [np.zeros((self.channels, len(h) - 1)) for h in self._up]
+        self._down_state = [np.zeros((self.channels, len(h) - 1)) for h in self._down]
+        self._down_tail = np.zeros((self.channels, self.factor - 1))
+
+    def up(self, x: np.ndarray) -> np.ndarray:
+        """(channels, n) -> (channels, n * factor)."""
+        factor = self.factor
+        out = np.empty((x.shape[0], x.shape[1] * factor))
+        for p, h in enumerate(self._up):
+            out[:, p::factor], self._up_state[p] = lfilter(h, 1.0, x, axis=-1,
+                                                           zi=self._up_state[p])
+        return out
+
+    def down(self, y: np.ndarray) -> np.ndarray:
+        """(channels, n * factor) -> (channels, n)."""
+        factor = self.factor
+        n = y.shape[1] // factor
+        ext = np.concatenate((self._down_tail, y), axis=1)
+        self._down_tail = y[:, y.shape[1] - (factor - 1):]
+        out = np.zeros((y.shape[0], n))
+        for p, h in enumerate(self._down):
+            # Stream p holds y[m * factor - p]
+            stream = ext[:, factor - 1 - p::factor][:, :n]
+            filtered, self._down_state[p] = lfilter(h, 1.0, stream, axis=-1,
+                                                    zi=self._down_state[p])
+            out += filtered
+        return out
+
+
+class WaveshapingEngine:
+    """
+    Block waveshaper: transfer curve with optional oversampling.
+
+    Operates on (channels, samples) blocks. With oversampling the output
+    lags the input by get_latency_samples(); delay_dry() delays a dry
+    signal by the same amount for wet/dry mixing.
+
+    Args:
+        curve: Name of a curve in CURVES
+        oversample: 1 (off), 2, 4 or 8
+        use_table: Read the curve from a lookup table
+    """
+
+    def __init__(self, curve: str = "tanh", oversample: int = 1, use_table: bool = False):
+        self.curve = curve
+        self.use_table = use_table
+        self.oversample = 1
+        self._oversampler: Optional[Oversampler] = None
+        self._dry_history = np.zeros((0, 0))
+        self.set_oversample(oversample)
+
+    def set_oversample(self, factor: int):
+        """Change the oversampling factor (resets filter state)."""
+        if factor not in OVERSAMPLE_FACTORS:
+            raise ValueError(f"Oversampling factor must be one of {OVERSAMPLE_FACTORS}")
+        self.oversample = factor
+        self._oversampler = None
+        self._dry_history = np.zeros((0, 0))
+
+    def get_latency_samples(self) -> int:
+        """Delay added by the oversampling filters."""
+        return 0 if self.oversample == 1 else OVERSAMPLER_LATENCY
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """Shape a (channels, samples) block."""
+        if self.oversample == 1:
+            return apply_curve(x, self.curve, self.use_table)
+        if self._oversampler is None or self._oversampler.channels != x.shape[0]:
+            self._oversampler = Oversampler(self.oversample, x.shape[0])
+        upsampled = self._oversampler.up(x)
+        return self._oversampler.down(apply_curve(upsampled, self.curve, self.use_table))
+
+    def delay_dry(self, x: np.ndarray) -> np.ndarray:
+        """Delay a (channels, samples) block by the oversampling latency."""
+        latency = self.get_latency_samples()
+        if latency == 0:
+            return x
+        if self._dry_history.shape != (x.shape[0], latency):
+            self._dry_history = np.zeros((x.shape[0], latency))
+        ext = np.concatenate((self._dry_history, x), axis=1)
+        self._dry_history = ext[:, x.shape[1]:]
+        return ext[:, :x.shape[1]]
+
+    def reset(self):
+        """Clear oversampling and dry-delay state."""
+        if self._oversampler is not None:
+            self._oversampler.reset()
+        self._dry_history = np.zeros((0, 0))
+
+
+class ToneFilter:
+    """
+    One-pole lowpass y[n] = y[n-1] * (1 - c) + x[n] * c, with state kept
+    across blocks. The first block starts from its own first sample.
+    """
+
+    def __init__(self):
+        self._last: Optional[np.ndarray] = None
+
+    def process(self, x: np.ndarray, coef: float) -> np.ndarray:
+        """Filter a (channels, samples) block."""
+        if self._last is None or self._last.shape[0] != x.shape[0]:
+            self._last = x[:, :1].astype(np.float64)
+        pole = 1.0 - coef
+        filtered, _ = lfilter([coef], [1.0, -pole], x, axis=-1, zi=self._last * pole)
+        self._last = filtered[:, -1:]
+        return filtered
+
+    def reset(self):
+        """Forget the previous output."""
+        self._last = None
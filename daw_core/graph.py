@@ -3,11 +3,23 @@ Signal Graph Base Classes
 
 Implements node-based architecture where every audio component is a graph node.
 Nodes communicate through input/output ports with configurable buffers.
+
+When a node is added to an AudioEngine its port buffers are rebound to views
+into the engine's BufferPool, and nodes write their results into those
+views in place, so steady-state processing does not allocate.
+
+Every node carries a silence flag for its last output. A node whose
+upstream nodes are all silent, and whose own tail (reverb decay, delay
+feedback) has run out, is skipped: its summed inputs and outputs are
+zeroed and it reports silence downstream, so idle branches cost almost
+nothing. Parameter changes queued for a sleeping node are applied at once
+(see FXNode.process_silent), since their offsets no longer matter.
 """
 
 import numpy as np
 from typing import List, Callable, Optional
 from dataclasses import dataclass, field
+from .buffers import write_block, sum_into
 
 
 # DSP Constants
@@ -15,6 +27,10 @@ SAMPLE_RATE = 44100
 BUFFER_SIZE = 1024
 NUM_CHANNELS = 2  # Stereo
 
+# Shared zero buffer for out-of-range port lookups on standalone nodes
+_SILENCE = np.zeros((NUM_CHANNELS, BUFFER_SIZE), dtype=np.float32)
+_SILENCE.flags.writeable = False
+
 
 @dataclass
 class Port:
@@ -22,7 +38,9 @@ class Port:
     name: str
     node: "Node"
     channels: int = NUM_CHANNELS
-    buffer: np.ndarray = field(default_factory=lambda: np.zeros((NUM_CHANNELS, BUFFER_SIZE)))
+    buffer: np.ndarray = field(
+        default_factory=lambda: np.zeros((NUM_CHANNELS, BUFFER_SIZE), dtype=np.float32)
+    )
 
     def clear(self):
         """Clear the buffer."""
@@ -51,6 +69,11 @@ class Node:
         ]
         self.connections: List[tuple] = []  # (src_node, src_port, dst_port)
 
+        # Silence tracking (see run_step)
+        self.silent = False  # last output was digital silence
+        self.pruned = False  # skipped unconditionally (e.g. muted track)
+        self._tail_left = 0  # samples of tail still to render after input stops
+
     def process(self):
         """
         Core DSP logic. Override in subclasses.
@@ -58,22 +81,105 @@ class Node:
         """
         pass
 
+    def seek(self, sample_pos: int):
+        """Move to an absolute sample position. Override in streaming nodes."""
+        pass
+
+    def get_tail_samples(self) -> int:
+        """
+        Samples of output this node keeps producing after its input goes
+        silent (0 for memoryless nodes). Override for reverbs, delays, etc.
+        """
+        return 0
+
+    def get_latency_samples(self) -> int:
+        """
+        Samples by which this node's output lags its input (0 unless the
+        node looks ahead). Used for plugin delay compensation.
+        """
+        return 0
+
+    def output_is_silent(self) -> bool:
+        """Silence flag for source nodes (nodes without inputs)."""
+        return False
+
+    def process_silent(self):
+        """Called instead of process() when the node is skipped."""
+        for port in self.output_ports:
+            port.clear()
+
+    def run_step(self, mixes, upstream) -> bool:
+        """
+        Process one block unless the node can sleep.
+
+        Args:
+            mixes: (accumulator, sources) pairs to sum before processing
+            upstream: Nodes feeding this node
+
+        Returns:
+            False if the node was skipped
+        """
+        if not self.begin_step(mixes, upstream):
+            return False
+        self.process()
+        self.silent = self.output_is_silent() if not upstream else False
+        return True
+
+    def begin_step(self, mixes, upstream) -> bool:
+        """
+        Sleep check and input mixing of run_step, without process().
+
+        Returns:
+            False if the node sleeps this block (outputs cleared, marked silent)
+        """
+        if self.pruned:
+            self._sleep(mixes)
+            return False
+
+        if not upstream:
+            return True
+
+        frames = self.output_ports[0].buffer.shape[-1] if self.output_ports else 0
+        if all(node.silent for node in upstream):
+            if self._tail_left <= 0:
+                self._sleep(mixes)
+                return False
+            self._tail_left -= frames
+        else:
+            self._tail_left = self.get_tail_samples()
+
+        for acc, sources in mixes:
+            sum_into(acc, sources)
+        return True
+
+    def _sleep(self, mixes):
+        """Skip this block: zero summed inputs and outputs, report silence."""
+        for acc, _ in mixes:
+            acc.fill(0)
+        self.process_silent()
+        self.silent = True
+
     def get_input(self, port_idx: int = 0) -> np.ndarray:
         """Get the audio buffer from an input port."""
         if port_idx < len(self.input_ports):
             return self.input_ports[port_idx].buffer
-        return np.zeros((NUM_CHANNELS, BUFFER_SIZE))
+        return _SILENCE
 
     def get_output(self, port_idx: int = 0) -> np.ndarray:
         """Get the audio buffer from an output port."""
         if port_idx < len(self.output_ports):
             return self.output_ports[port_idx].buffer
-        return np.zeros((NUM_CHANNELS, BUFFER_SIZE))
+        return _SILENCE
 
     def set_output(self, data: np.ndarray, port_idx: int = 0):
-        """Write audio data to an output port."""
+        """Copy audio data into an output port's buffer (in place)."""
         if port_idx < len(self.output_ports):
-            self.output_ports[port_idx].buffer = data.copy()
+            write_block(self.output_ports[port_idx].buffer, data)
+
+    def clear_output(self, port_idx: int = 0):
+        """Zero an output port's buffer."""
+        if port_idx < len(self.output_ports):
+            self.output_ports[port_idx].clear()
 
     def connect_to(self, target_node: "Node", src_port: int = 0, dst_port: int = 0):
         """Connect this node's output to another node's input."""
@@ -91,6 +197,9 @@ class Node:
 class AudioInput(Node):
     """
     Represents an audio input source (file, hardware, or generated signal).
+
+    Streams its data one block per process() call from the current
+    position; past the end of the data it outputs silence.
     """
 
     def __init__(self, name: str, data: Optional[np.ndarray] = None):
@@ -102,25 +211,78 @@ class AudioInput(Node):
         """Load audio data (e.g., from file or recording)."""
         self.data = data
 
+    @property
+    def length(self) -> int:
+        """Length of the source data in samples."""
+        return self.data.shape[-1]
+
+    def seek(self, sample_pos: int):
+        """Move the stream position."""
+        self.position = max(0, int(sample_pos))
+
+    def output_is_silent(self) -> bool:
+        """True past the end of the data, when disabled, or on digital silence."""
+        return not self.enabled or not np.any(self.get_output(0))
+
+    def process_silent(self):
+        """Keep the stream position moving while pruned."""
+        super().process_silent()
+        self.position += self.get_output(0).shape[-1]
+
     def process(self):
-        """Stream audio data to output port."""
+        """Stream the next block of audio data to the output port."""
+        frames = self.get_output(0).shape[-1]
         if not self.enabled:
-            self.set_output(np.zeros((NUM_CHANNELS, BUFFER_SIZE)))
-            return
-
-        # For now, just return the data as-is
-        # Later, this will handle streaming, file position, etc.
-        self.set_output(self.data)
+            self.clear_output()
+        else:
+            self.set_output(self.data[..., self.position:self.position + frames])
+        self.position += frames
 
 
 class FXNode(Node):
     """
     Generic effect node that applies a DSP function to input signal.
+
+    If in_place is True, fx_fn is called as fx_fn(signal, out=buffer) and
+    must write its result into the output buffer itself; otherwise its
+    return value is copied into the output buffer.
+
+    The input may alias an upstream node's output, so fx_fn must treat it
+    as read-only.
+
+    The tail length is tail_samples if given, otherwise it is asked from
+    the effect behind a bound fx_fn (e.g. FXNode("Verb", reverb.process)),
+    and 0 for plain functions.
+
+    If fx_fn has a settle() attribute (e.g. a track fader), it is called
+    whenever the node sleeps so changes queued for that block still apply.
     """
 
-    def __init__(self, name: str, fx_fn: Callable[[np.ndarray], np.ndarray]):
+    def __init__(self, name: str, fx_fn: Callable[..., np.ndarray], in_place: bool = False,
+                 tail_samples: Optional[int] = None):
         super().__init__(name, num_inputs=1, num_outputs=1)
         self.fx_fn = fx_fn
+        self.in_place = in_place
+        self.tail_samples = tail_samples
+
+    def get_tail_samples(self) -> int:
+        """Tail of the wrapped effect."""
+        if self.tail_samples is not None:
+            return self.tail_samples
+        effect_tail = getattr(getattr(self.fx_fn, "__self__", None), "get_tail_samples", None)
+        return int(effect_tail()) if effect_tail is not None else 0
+
+    def get_latency_samples(self) -> int:
+        """Latency reported by the wrapped effect."""
+        effect_latency = getattr(getattr(self.fx_fn, "__self__", None), "get_latency_samples", None)
+        return int(effect_latency()) if effect_latency is not None else 0
+
+    def process_silent(self):
+        """Clear the output and apply changes queued for the skipped block."""
+        super().process_silent()
+        settle = getattr(self.fx_fn, "settle", None)
+        if settle is not None:
+            settle()
 
     def process(self):
         """Apply effect function to input."""
@@ -129,19 +291,25 @@ class FXNode(Node):
             return
 
         input_signal = self.get_input(0)
-        output = self.fx_fn(input_signal)
-        self.set_output(output)
+        if self.in_place:
+            self.fx_fn(input_signal, out=self.get_output(0))
+        else:
+            self.set_output(self.fx_fn(input_signal))
 
 
 class MixerBus(Node):
     """
     Mixes multiple input signals into a single output.
     Implements summing amplifier behavior.
+
+    For track faders, pans and sends across many tracks use
+    mixer.MixerEngine, which folds them into the same matrix multiply.
     """
 
     def __init__(self, name: str, num_inputs: int = 16):
         super().__init__(name, num_inputs=num_inputs, num_outputs=1)
         self.gain = 1.0  # Post-fader gain
+        self._stack: Optional[np.ndarray] = None  # (inputs, channels, samples)
 
     def set_gain(self, gain_db: float):
         """Set bus gain in dB."""
@@ -149,18 +317,22 @@ class MixerBus(Node):
 
     def process(self):
         """Sum all inputs and apply gain."""
-        if not self.enabled:
-            self.set_output(np.zeros((NUM_CHANNELS, BUFFER_SIZE)))
+        mixed = self.get_output(0)
+        if not self.enabled or not self.input_ports:
+            mixed.fill(0.0)
             return
 
-        # Sum all input ports
-        mixed = np.zeros((NUM_CHANNELS, BUFFER_SIZE))
-        for port in self.input_ports:
-            mixed += port.buffer
+        # Stack the inputs into one block and sum it in a single reduction
+        shape = (len(self.input_ports),) + mixed.shape
+        if self._stack is None or self._stack.shape != shape:
+            self._stack = np.zeros(shape, dtype=np.float32)
+        np.stack([port.buffer for port in self.input_ports], out=self._stack)
+        np.sum(self._stack, axis=0, out=mixed, dtype=np.float32)
 
         # Apply gain and soft clipping
-        output = np.tanh(mixed * self.gain)
-        self.set_output(output)
+        if self.gain != 1.0:
+            np.multiply(mixed, self.gain, out=mixed, casting="unsafe")
+        np.tanh(mixed, out=mixed)
 
 
 class OutputNode(Node):
@@ -176,9 +348,14 @@ class OutputNode(Node):
     def process(self):
         """Monitor output and detect clipping."""
         input_signal = self.get_input(0)
-        self.peak_level = np.max(np.abs(input_signal))
+        self.peak_level = float(max(input_signal.max(), -input_signal.min()))
         self.clipped = self.peak_level > 1.0
 
+    def process_silent(self):
+        """Silent block: nothing to meter."""
+        self.peak_level = 0.0
+        self.clipped = False
+
     def get_status(self) -> dict:
         """Return output status (peak level, clipping, etc.)."""
         return {
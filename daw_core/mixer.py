@@ -0,0 +1,191 @@
+"""
+Vectorized Mixer Engine
+
+Mixes many tracks into a few buses with a handful of large NumPy calls
+instead of a fader FXNode per track and a per-port sum per bus.
+
+Every block the pre-fader outputs of all tracks are stacked into one
+contiguous (tracks, channels, samples) float32 block. Fader gain, pan law,
+mute/solo, phase flip, output routing and send levels are gathered into a
+(channels, buses, tracks) gain tensor, and all bus sums come out of a single
+batched matrix multiply:
+
+    mix[c] = gains[c] @ block[:, c, :]      # (buses, samples) per channel
+
+Tracks with queued sample-accurate fader changes in the current block are
+taken out of the multiply for their post-fader contributions, which are
+added separately with a per-sample gain envelope. If the mixer sleeps
+through a silent block, those changes are applied at once instead.
+
+Usage:
+    mixer = MixerEngine("Mixer", router.tracks.values(), buses=["master", "reverb"])
+    mixer.connect_tracks(engine)
+    engine.connect(mixer, master_out, src_port=mixer.bus_port("master"))
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .graph import Node, NUM_CHANNELS
+from .track import Track
+
+
+class MixerEngine(Node):
+    """
+    N-track mixer node with one input per track and one output per bus.
+
+    Input port i carries track i's signal before the fader (the end of its
+    playback chain); output port b carries the sum for bus_ids[b]. A track
+    reaches a bus through its output_routing (post-fader) or an enabled
+    send (pre- or post-fader, scaled by the send level). Tracks mixed here
+    do not need a fader_node.
+
+    Args:
+        name: Node name
+        tracks: Tracks to mix, in input port order
+        buses: Destination IDs, in output port order
+        routes: Optional track ID -> destination IDs, overriding each
+            track's single output_routing (e.g. Router.routing_matrix)
+    """
+
+    def __init__(self, name: str, tracks: Iterable[Track], buses: Sequence[str] = ("master",),
+                 routes: Optional[Dict[str, Sequence[str]]] = None):
+        self.tracks: List[Track] = list(tracks)
+        self.bus_ids: List[str] = list(buses)
+        self.routes = routes
+        super().__init__(name, num_inputs=len(self.tracks), num_outputs=len(self.bus_ids))
+        self._bus_index: Dict[str, int] = {bus_id: i for i, bus_id in enumerate(self.bus_ids)}
+
+        # Work buffers, (re)allocated only when the block shape changes
+        self._block: Optional[np.ndarray] = None  # (tracks, channels, samples)
+        self._mix: Optional[np.ndarray] = None    # (channels, buses, samples)
+
+    def bus_port(self, bus_id: str) -> int:
+        """Output port index carrying a bus."""
+        return self._bus_index[bus_id]
+
+    def connect_tracks(self, engine):
+        """
+        Add the mixer to an engine and feed it every track's playback chain.
+
+        Call again after freezing or unfreezing a track, which changes the
+        node at the end of its chain. The tracks' fader changes are routed
+        through the engine's parameter queue from here on.
+        """
+        engine.add_node(self)
+        for port_idx, track in enumerate(self.tracks):
+            track.attach_event_queue(engine.parameter_events)
+            chain = track.get_playback_chain()
+            if chain:
+                engine.connect(chain[-1], self, dst_port=port_idx)
+
+    def destinations(self, track: Track) -> Sequence[str]:
+        """Where a track's post-fader output is routed."""
+        if self.routes is not None and self.routes.get(track.id):
+            return self.routes[track.id]
+        return (track.output_routing,)
+
+    def compute_gains(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Gather the mixer state of all tracks into matrices.
+
+        Returns:
+            (fader, post, pre): per-track (left, right) fader gains of shape
+            (2, tracks), and post-/pre-fader (buses, tracks) level matrices
+            with routing, send levels and solo applied
+        """
+        tracks = self.tracks
+        num_tracks = len(tracks)
+        volume = np.fromiter((t.volume for t in tracks), dtype=np.float64, count=num_tracks)
+        pan = np.fromiter((t.pan for t in tracks), dtype=np.float64, count=num_tracks)
+        muted = np.fromiter((t.muted for t in tracks), dtype=bool, count=num_tracks)
+        soloed = np.fromiter((t.soloed for t in tracks), dtype=bool, count=num_tracks)
+        flipped = np.fromiter((t.phase_flip for t in tracks), dtype=bool, count=num_tracks)
+
+        # Same law as Track._channel_gains: equal-power pan on the fader gain
+        gain = np.where(muted, 0.0, 10.0 ** (volume / 20.0))
+        gain = np.where(flipped, -gain, gain)
+        pan = np.clip(pan, -1.0, 1.0)
+        fader = np.stack((gain * np.sqrt(0.5 * (1.0 - pan)),
+                          gain * np.sqrt(0.5 * (1.0 + pan))))
+
+        post = np.zeros((len(self.bus_ids), num_tracks))
+        pre = np.zeros_like(post)
+        bus_index = self._bus_index
+        for t, track in enumerate(tracks):
+            for dest in self.destinations(track):
+                b = bus_index.get(dest)
+                if b is not None:
+                    post[b, t] = 1.0
+            for send in track.sends:
+                b = bus_index.get(send["destination"])
+                if b is None or not send.get("enabled", True):
+                    continue
+                level = 10.0 ** (send["level_db"] / 20.0)
+                if send["pre_fader"]:
+                    pre[b, t] += level
+                else:
+                    post[b, t] += level
+
+        # Soloing any track silences every track that is not soloed
+        if soloed.any():
+            post *= soloed
+            pre *= soloed
+        return fader, post, pre
+
+    def _ensure_buffers(self, channels: int, frames: int):
+        shape = (len(self.tracks), channels, frames)
+        if self._block is None or self._block.shape != shape:
+            self._block = np.zeros(shape, dtype=np.float32)
+            self._mix = np.zeros((channels, len(self.bus_ids), frames), dtype=np.float32)
+
+    def process(self):
+        """Stack the track inputs and produce every bus with one matmul."""
+        if not self.output_ports:
+            return
+        if not self.enabled or not self.tracks:
+            for port in self.output_ports:
+                port.clear()
+            return
+
+        channels, frames = self.get_output(0).shape
+        self._ensure_buffers(channels, frames)
+        block, mix = self._block, self._mix
+        np.stack([port.buffer for port in self.input_ports], out=block)
+
+        fader, post, pre = self.compute_gains()
+        # Tracks with queued fader changes get their post-fader part below
+        dynamic = [t for t, track in enumerate(self.tracks) if track._fader_changes]
+        static_post = post
+        if dynamic:
+            static_post = post.copy()
+            static_post[:, dynamic] = 0.0
+
+        gains = static_post[None, :, :] * fader[:, None, :] + pre[None, :, :]
+        np.matmul(gains.astype(np.float32), block.transpose(1, 0, 2), out=mix)
+
+        for t in dynamic:
+            envelope = self.tracks[t]._fader_envelope(frames)[:2]
+            faded = block[t] * envelope
+            mix += post[:, t].astype(np.float32)[None, :, None] * faded[:, None, :]
+
+        for b, port in enumerate(self.output_ports):
+            np.copyto(port.buffer, mix[:, b], casting="unsafe")
+
+    def process_silent(self):
+        """Silent block: settle queued fader changes instead of holding them."""
+        super().process_silent()
+        for track in self.tracks:
+            if track._fader_changes:
+                track.settle_fader_changes()
+
+    def get_status(self) -> dict:
+        """Mixer dimensions and per-track fader gains (for metering/UI)."""
+        fader, _, _ = self.compute_gains()
+        return {
+            "tracks": [t.id for t in self.tracks],
+            "buses": list(self.bus_ids),
+            "fader_gains": fader.T.tolist(),
+            "channels": NUM_CHANNELS if self._block is None else self._block.shape[1],
+        }
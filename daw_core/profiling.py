@@ -0,0 +1,212 @@
+"""
+Engine Profiling & Xrun Instrumentation
+
+Always-on, low-overhead timing for AudioEngine.
+
+Every block's total processing time is compared against the real-time
+deadline (buffer_size / sample_rate) and counted as an xrun when it
+overruns. Per-node times are recorded on sampled blocks (1 in N, N=1 by
+default) into rolling windows with log2-spaced histograms, from which
+p50/p99 and a "top offenders" report are computed on demand. Recording is
+a couple of list stores per node; all statistics are computed only when a
+report is requested, from a snapshot of the per-node tables so reports can
+be taken while the audio thread keeps recording. Nodes sharing a name are
+reported as "Name", "Name #2", ... in the order they were first timed.
+
+Usage:
+    engine.set_profile_sampling(4)   # time nodes on every 4th block
+    report = engine.get_profile()
+    print(report["xruns"], report["top_offenders"])
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+# log2 histogram: bin b holds times in [2^(b-1), 2^b) ns; 40 bins reach ~9 minutes
+NUM_BINS = 40
+
+
+class RollingHistogram:
+    """
+    Last `window` timings in ns plus a log2 histogram of the same window.
+
+    Args:
+        window: Number of most recent samples kept
+    """
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._samples = [0] * window
+        self._bins = [0] * NUM_BINS
+        self.count = 0  # total samples ever recorded
+        self.max_ns = 0
+
+    def record(self, ns: int):
+        """Add one timing (audio thread)."""
+        idx = self.count % self.window
+        if self.count >= self.window:
+            self._bins[min(self._samples[idx].bit_length(), NUM_BINS - 1)] -= 1
+        self._samples[idx] = ns
+        self._bins[min(ns.bit_length(), NUM_BINS - 1)] += 1
+        self.count += 1
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def values(self) -> np.ndarray:
+        """Timings currently in the window."""
+        return np.asarray(self._samples[:min(self.count, self.window)], dtype=np.int64)
+
+    def percentile(self, q: float) -> float:
+        """q-th percentile of the window in ns (0 if empty)."""
+        values = self.values()
+        return float(np.percentile(values, q)) if values.size else 0.0
+
+    def histogram(self) -> List[dict]:
+        """Non-empty log2 bins as {lo_ns, hi_ns, count}."""
+        return [
+            {"lo_ns": (1 << (b - 1)) if b else 0, "hi_ns": 1 << b, "count": c}
+            for b, c in enumerate(self._bins) if c
+        ]
+
+    def summary(self) -> dict:
+        """Mean/p50/p99/max in microseconds."""
+        values = self.values()
+        if not values.size:
+            return {"samples": 0, "mean_us": 0.0, "p50_us": 0.0, "p99_us": 0.0, "max_us": 0.0}
+        p50, p99 = np.percentile(values, [50, 99])
+        return {
+            "samples": int(values.size),
+            "mean_us": float(values.mean()) / 1e3,
+            "p50_us": float(p50) / 1e3,
+            "p99_us": float(p99) / 1e3,
+            "max_us": self.max_ns / 1e3,
+        }
+
+
+class EngineProfiler:
+    """
+    Block and per-node timing for one engine.
+
+    Args:
+        window: Samples kept per rolling histogram
+        sample_every: Time individual nodes on 1 in N blocks
+    """
+
+    def __init__(self, window: int = 1024, sample_every: int = 1):
+        self.window = window
+        self.sample_every = max(1, int(sample_every))
+        self.enabled = True
+        self.reset()
+
+    def reset(self):
+        """Clear all statistics."""
+        self.block_times = RollingHistogram(self.window)
+        self.node_times: Dict[object, RollingHistogram] = {}
+        self.node_names: Dict[object, str] = {}
+        self.xrun_blame: Dict[object, int] = {}
+        self.xruns = 0
+        self.blocks = 0
+        self.sampled_blocks = 0
+        self.last_block_ns = 0
+        self.last_deadline_ns = 0
+
+    def set_sampling(self, sample_every: int):
+        """Time nodes on 1 in N blocks (1 = every block)."""
+        self.sample_every = max(1, int(sample_every))
+
+    def should_sample(self) -> bool:
+        """Whether the upcoming block should time individual nodes."""
+        return self.enabled and self.blocks % self.sample_every == 0
+
+    def record_node(self, node, ns: int):
+        """Add one node timing. Safe from several workers for distinct nodes."""
+        hist = self.node_times.get(node)
+        if hist is None:
+            hist = self.node_times.setdefault(node, RollingHistogram(self.window))
+            self.node_names[node] = node.name
+        hist.record(ns)
+
+    def forget(self, node):
+        """Drop a node's statistics (e.g. after it left the engine)."""
+        self.node_times.pop(node, None)
+        self.node_names.pop(node, None)
+        self.xrun_blame.pop(node, None)
+
+    def _snapshot(self) -> List[tuple]:
+        """(label, node, histogram) per timed node, with unique labels."""
+        names = dict(self.node_names)
+        seen: Dict[str, int] = {}
+        rows = []
+        for node, hist in list(self.node_times.items()):
+            name = names.get(node, node.name)
+            seen[name] = seen.get(name, 0) + 1
+            label = name if seen[name] == 1 else f"{name} #{seen[name]}"
+            rows.append((label, node, hist))
+        return rows
+
+    def end_block(self, total_ns: int, deadline_ns: int, sampled: bool,
+                  block_nodes: Optional[List[tuple]] = None):
+        """
+        Record a finished block.
+
+        Args:
+            total_ns: Wall time of the whole block
+            deadline_ns: Real-time budget (buffer_size / sample_rate)
+            sampled: Whether node timings were recorded this block
+            block_nodes: (node, ns) pairs of this block, used to blame
+                the slowest node when the block overran
+        """
+        self.blocks += 1
+        self.last_block_ns = total_ns
+        self.last_deadline_ns = deadline_ns
+        self.block_times.record(total_ns)
+        if sampled:
+            self.sampled_blocks += 1
+        if total_ns > deadline_ns:
+            self.xruns += 1
+            if block_nodes:
+                worst = max(block_nodes, key=lambda item: item[1])[0]
+                self.xrun_blame[worst] = self.xrun_blame.get(worst, 0) + 1
+
+    def top_offenders(self, count: int = 5, snapshot: Optional[List[tuple]] = None) -> List[dict]:
+        """Nodes with the highest p99 time, with their share of the deadline."""
+        deadline = self.last_deadline_ns or 1
+        blame = dict(self.xrun_blame)
+        rows = []
+        for label, node, hist in snapshot if snapshot is not None else self._snapshot():
+            summary = hist.summary()
+            rows.append({
+                "node": label,
+                **summary,
+                "p99_deadline_pct": summary["p99_us"] * 1e3 / deadline * 100.0,
+                "xruns_blamed": blame.get(node, 0),
+            })
+        rows.sort(key=lambda row: (row["xruns_blamed"], row["p99_us"]), reverse=True)
+        return rows[:count]
+
+    def report(self, top: int = 5, histograms: bool = False) -> dict:
+        """Full profile: block timing vs deadline, xruns, per-node stats."""
+        block = self.block_times.summary()
+        nodes = self._snapshot()
+        deadline_us = self.last_deadline_ns / 1e3
+        report = {
+            "enabled": self.enabled,
+            "sample_every": self.sample_every,
+            "blocks": self.blocks,
+            "sampled_blocks": self.sampled_blocks,
+            "deadline_us": deadline_us,
+            "block": block,
+            "cpu_load_p50": block["p50_us"] / deadline_us if deadline_us else 0.0,
+            "cpu_load_p99": block["p99_us"] / deadline_us if deadline_us else 0.0,
+            "xruns": self.xruns,
+            "top_offenders": self.top_offenders(top, nodes),
+            "nodes": {label: hist.summary() for label, _, hist in nodes},
+        }
+        if histograms:
+            report["histograms"] = {
+                "block": self.block_times.histogram(),
+                **{label: hist.histogram() for label, _, hist in nodes},
+            }
+        return report
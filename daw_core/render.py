@@ -0,0 +1,267 @@
+"""
+Offline Render / Bounce Engine
+
+Drives an AudioEngine faster than realtime and streams the result to disk.
+
+Blocks are written to the file as soon as they are produced, so memory use
+is bounded by the engine's block size rather than the session length.
+Renders can run synchronously (OfflineRenderer.render) or as a background
+RenderJob with progress polling, which is what the REST API exposes.
+Either way the engine is claimed for the whole render (see
+AudioEngine.claim_offline): a second render or engine.start() is refused
+until it finishes, and its blocks are not counted as xruns.
+
+Usage:
+    from daw_core.render import OfflineRenderer
+
+    renderer = OfflineRenderer(engine)
+    result = renderer.render("mix.wav", start=0.0, end=30.0, unit="seconds")
+    print(f"{result['realtime_factor']:.1f}x realtime")
+"""
+
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+try:
+    import soundfile as sf
+    HAS_SOUNDFILE = True
+except ImportError:
+    HAS_SOUNDFILE = False
+    sf = None
+
+from .engine import AudioEngine
+from .graph import Node, OutputNode
+
+
+class RenderCancelled(Exception):
+    """Raised inside a render when its job has been cancelled."""
+
+
+class OfflineRenderer:
+    """
+    Faster-than-realtime bounce of an engine's output to WAV/FLAC.
+
+    Args:
+        engine: Engine to drive (must not be running in realtime)
+        output_node: Node whose input is captured (default: first OutputNode)
+    """
+
+    FORMATS = {".wav": "WAV", ".flac": "FLAC"}
+
+    def __init__(self, engine: AudioEngine, output_node: Optional[Node] = None):
+        self.engine = engine
+        self.output_node = output_node
+
+    def _capture_node(self) -> Node:
+        """Pick the node whose input buffer is written to the file."""
+        if self.output_node is not None:
+            return self.output_node
+        for node in self.engine.nodes:
+            if isinstance(node, OutputNode):
+                return node
+        raise ValueError("No OutputNode in the engine; pass output_node explicitly")
+
+    def resolve_range(self, start=None, end=None, unit: str = "samples",
+                      transport=None) -> tuple:
+        """
+        Convert a render range to samples.
+
+        Args:
+            start, end: Range bounds in `unit` (None = use transport/session)
+            unit: "samples" or "seconds"
+            transport: Optional TransportClock; its loop region (if enabled)
+                or current position provides missing bounds
+
+        Returns:
+            (start_sample, end_sample)
+        """
+        if unit not in ("samples", "seconds"):
+            raise ValueError(f"Unknown range unit: {unit}")
+        sr = self.engine.sample_rate
+
+        def to_samples(value):
+            return int(round(value * sr)) if unit == "seconds" else int(value)
+
+        start_sample = to_samples(start) if start is not None else None
+        end_sample = to_samples(end) if end is not None else None
+
+        if transport is not None:
+            state = transport.get_state()
+            if state.loop_enabled:
+                if start_sample is None:
+                    start_sample = int(round(state.loop_start_seconds * sr))
+                if end_sample is None:
+                    end_sample = int(round(state.loop_end_seconds * sr))
+            elif start_sample is None:
+                start_sample = int(round(state.time_seconds * sr))
+
+        if start_sample is None:
+            start_sample = 0
+        if end_sample is None:
+            end_sample = self.engine.get_session_length()
+        if end_sample <= start_sample:
+            raise ValueError(f"Empty render range: {start_sample}-{end_sample}")
+        return start_sample, end_sample
+
+    def render(self, path: str, start=None, end=None, unit: str = "samples",
+               transport=None, file_format: Optional[str] = None,
+               subtype: str = "PCM_24", progress_callback=None,
+               cancel_event: Optional[threading.Event] = None) -> Dict:
+        """
+        Render a range of the session to an audio file.
+
+        Args:
+            path: Output file (.wav or .flac)
+            start, end, unit, transport: Render range (see resolve_range)
+            file_format: "WAV" or "FLAC" (default: from the file extension)
+            subtype: soundfile subtype, e.g. "PCM_16", "PCM_24", "FLOAT"
+            progress_callback: Called with the fraction done after each block
+            cancel_event: Set to abort the render
+
+        Returns:
+            Summary dict with frames, durations and realtime_factor
+
+        Raises:
+            RuntimeError: If the engine is playing or already rendering
+        """
+        if not HAS_SOUNDFILE:
+            raise RuntimeError("Offline rendering requires soundfile: pip install soundfile")
+        self.engine.claim_offline()
+        try:
+            return self._render(path, start, end, unit, transport, file_format, subtype,
+                                progress_callback, cancel_event)
+        finally:
+            self.engine.release_offline()
+
+    def _render(self, path: str, start=None, end=None, unit: str = "samples",
+                transport=None, file_format: Optional[str] = None,
+                subtype: str = "PCM_24", progress_callback=None,
+                cancel_event: Optional[threading.Event] = None) -> Dict:
+        """render() on an engine already claimed by the caller."""
+        engine = self.engine
+        if file_format is None:
+            ext = path[path.rfind("."):].lower() if "." in path else ""
+            file_format = self.FORMATS.get(ext, "WAV")
+
+        capture = self._capture_node()
+        start_sample, end_sample = self.resolve_range(start, end, unit, transport)
+        total = end_sample - start_sample
+        block = engine.buffer_size
+        channels = engine.buffer_pool.num_channels
+
+        engine.seek(start_sample)
+        written = 0
+        t0 = time.perf_counter()
+        with sf.SoundFile(path, mode="w", samplerate=engine.sample_rate,
+                          channels=channels, format=file_format, subtype=subtype) as out:
+            while written < total:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise RenderCancelled(path)
+                engine.run_block()
+                frames = min(block, total - written)
+                out.write(capture.get_input(0)[:, :frames].T)
+                written += frames
+                if progress_callback is not None:
+                    progress_callback(written / total)
+        elapsed = time.perf_counter() - t0
+
+        audio_seconds = total / engine.sample_rate
+        return {
+            "path": path,
+            "format": file_format,
+            "subtype": subtype,
+            "start_sample": start_sample,
+            "end_sample": end_sample,
+            "frames": written,
+            "audio_seconds": audio_seconds,
+            "render_seconds": elapsed,
+            "realtime_factor": audio_seconds / elapsed if elapsed > 0 else float("inf"),
+        }
+
+
+class RenderJob:
+    """
+    Background render with progress polling.
+
+    Created by start_render_job(); the render runs on its own thread and
+    get_status() can be polled from API handlers.
+    """
+
+    def __init__(self, renderer: OfflineRenderer, path: str, **render_kwargs):
+        self.id = uuid.uuid4().hex[:12]
+        self.renderer = renderer
+        self.path = path
+        self.render_kwargs = render_kwargs
+        self.status = "pending"  # pending, running, done, failed, cancelled
+        self.progress = 0.0
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"render-{self.id}", daemon=True)
+
+    def start(self):
+        """
+        Claim the engine and start rendering on a background thread.
+
+        Raises:
+            RuntimeError: If the engine is playing or already rendering
+        """
+        if not HAS_SOUNDFILE:
+            raise RuntimeError("Offline rendering requires soundfile: pip install soundfile")
+        self.renderer.engine.claim_offline()
+        self.status = "running"
+        self.started_at = time.time()
+        self._thread.start()
+
+    def _set_progress(self, fraction: float):
+        self.progress = fraction
+
+    def _run(self):
+        try:
+            self.result = self.renderer._render(
+                self.path,
+                progress_callback=self._set_progress,
+                cancel_event=self._cancel,
+                **self.render_kwargs,
+            )
+            self.status = "done"
+        except RenderCancelled:
+            self.status = "cancelled"
+        except Exception as e:
+            self.error = str(e)
+            self.status = "failed"
+        finally:
+            self.renderer.engine.release_offline()
+
+    def cancel(self):
+        """Request cancellation; the render stops after the current block."""
+        self._cancel.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes. Returns False on timeout."""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def get_status(self) -> Dict:
+        """Progress snapshot for polling."""
+        elapsed = time.time() - self.started_at if self.started_at else 0.0
+        return {
+            "job_id": self.id,
+            "path": self.path,
+            "status": self.status,
+            "progress": self.progress,
+            "elapsed_seconds": elapsed,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+def start_render_job(engine: AudioEngine, path: str, output_node: Optional[Node] = None,
+                     **render_kwargs) -> RenderJob:
+    """Create and start a background RenderJob."""
+    job = RenderJob(OfflineRenderer(engine, output_node), path, **render_kwargs)
+    job.start()
+    return job
@@ -3,11 +3,26 @@ Routing & Send System
 
 Implements flexible audio routing with sends, buses, and auxiliary tracks.
 Supports both pre-fader and post-fader sends.
+
+Router.build_graph() compiles the routing matrix and every track's sends
+into an AudioEngine. Tracks are grouped into levels (a track only receives
+from lower levels) and each level is mixed by one MixerEngine: pre-fader
+sends read the track's chain output directly and post-fader sends are
+folded into the mixer's gain matrix, so no tap is copied. Every send into
+the same return comes out of a single matrix multiply, which lets one
+shared reverb on an aux track serve any number of tracks.
+
+Building again into the same engine replaces the previous build: its
+connections are dropped and nodes it no longer uses (old mixers and return
+nodes, removed inserts) are removed from the engine. A frozen track that
+receives other tracks is unfrozen, since its cache holds only its own
+source and incoming audio has to run through the live inserts.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from .track import Track
-from .graph import MixerBus, Node
+from .graph import FXNode, MixerBus, Node, OutputNode
+from .mixer import MixerEngine
 
 
 class Router:
@@ -29,6 +44,8 @@ class Router:
         self.buses: Dict[str, MixerBus] = {}
         self.master_bus: Optional[MixerBus] = None
         self.routing_matrix: Dict[str, List[str]] = {}  # src_id -> [dest_ids]
+        self._built_engine = None  # engine and nodes of the last build_graph()
+        self._built_nodes: Set[Node] = set()
 
     def add_track(self, track: Track):
         """Register a track."""
@@ -145,6 +162,130 @@ class Router:
 
         return True, "Routing is valid"
 
+    def get_destinations(self, track_id: str) -> List[str]:
+        """Post-fader destinations: the routing matrix, else the track's output_routing."""
+        if self.routing_matrix.get(track_id):
+            return list(self.routing_matrix[track_id])
+        return [self.tracks[track_id].output_routing]
+
+    def _feeds(self, track_id: str) -> List[str]:
+        """Tracks receiving audio from a track (routing or enabled sends)."""
+        dests = set(self.get_destinations(track_id))
+        dests.update(s["destination"] for s in self.tracks[track_id].sends
+                     if s.get("enabled", True))
+        return [d for d in dests if d in self.tracks and d != track_id]
+
+    def get_track_levels(self) -> List[List[str]]:
+        """
+        Group tracks so each one only receives from earlier groups.
+
+        Raises:
+            RuntimeError: If routing or sends form a cycle
+        """
+        sources_of: Dict[str, List[str]] = {track_id: [] for track_id in self.tracks}
+        for src in self.tracks:
+            for dest in self._feeds(src):
+                sources_of[dest].append(src)
+        level: Dict[str, int] = {}
+        visiting = set()
+
+        def depth(track_id: str) -> int:
+            if track_id in level:
+                return level[track_id]
+            if track_id in visiting:
+                raise RuntimeError(f"Routing cycle detected involving {track_id}")
+            visiting.add(track_id)
+            level[track_id] = 1 + max((depth(src) for src in sources_of[track_id]), default=-1)
+            visiting.discard(track_id)
+            return level[track_id]
+
+        for track_id in self.tracks:
+            depth(track_id)
+        levels: List[List[str]] = [[] for _ in range(max(level.values(), default=-1) + 1)]
+        for track_id in self.tracks:
+            levels[level[track_id]].append(track_id)
+        return levels
+
+    def build_graph(self, engine, output: Optional[OutputNode] = None) -> OutputNode:
+        """
+        Compile tracks, sends, buses and the master bus into an engine.
+
+        Tracks that receive routed or sent audio get a return node applying
+        their input gain; their own source (if any) is summed into it. Bus
+        nodes and the master bus sum whatever reaches them, and buses feed
+        the master bus.
+
+        Args:
+            engine: AudioEngine to add nodes and connections to
+            output: Final output node (created if omitted)
+
+        Returns:
+            The OutputNode fed by the master bus
+        """
+        if engine is self._built_engine:
+            for src, src_port, dst, dst_port in list(engine.edges):
+                if src in self._built_nodes and dst in self._built_nodes:
+                    engine.disconnect(src, dst, src_port, dst_port)
+        built: Set[Node] = set()
+
+        master = self.master_bus or self.create_master_bus()
+        if output is None:
+            output = OutputNode("Master Out")
+        for node in (master, output, *self.buses.values()):
+            engine.add_node(node)
+            built.add(node)
+        engine.connect(master, output)
+        for bus in self.buses.values():
+            if bus is not master:
+                engine.connect(bus, master)
+
+        receivers = {dest for track_id in self.tracks for dest in self._feeds(track_id)}
+        targets: Dict[str, Node] = {"master": master, **self.buses}
+        for track in self.tracks.values():
+            if track.id in receivers:
+                if track.frozen:
+                    track.unfreeze()  # the cache cannot hold the incoming audio
+                track.return_node = FXNode(
+                    f"{track.name} Return",
+                    lambda x, t=track: x * (10.0 ** (t.input_gain / 20.0)),
+                )
+                targets[track.id] = track.return_node
+            else:
+                track.return_node = None  # no longer receives anything
+            chain = track.get_playback_chain()
+            for node in chain:
+                engine.add_node(node)
+                built.add(node)
+            if track.return_node is not None and track.input_node is not None:
+                engine.add_node(track.input_node)
+                built.add(track.input_node)
+                engine.connect(track.input_node, track.return_node)
+            for src, dst in zip(chain, chain[1:]):
+                engine.connect(src, dst)
+
+        for level_idx, track_ids in enumerate(self.get_track_levels()):
+            tracks = [self.tracks[track_id] for track_id in track_ids]
+            dests = sorted({
+                dest
+                for track in tracks
+                for dest in (*self.get_destinations(track.id),
+                             *(s["destination"] for s in track.sends))
+                if dest in targets and dest != track.id
+            })
+            mixer = MixerEngine(f"Mixer L{level_idx}", tracks, dests,
+                                routes={t.id: self.get_destinations(t.id) for t in tracks})
+            mixer.connect_tracks(engine)
+            built.add(mixer)
+            for dest in dests:
+                engine.connect(mixer, targets[dest], src_port=mixer.bus_port(dest))
+
+        if engine is self._built_engine:
+            for node in self._built_nodes - built:
+                engine.remove_node(node)
+        self._built_engine = engine
+        self._built_nodes = built
+        return output
+
     def to_dict(self) -> Dict:
         """Serialize routing to dict (for project save)."""
         return {
@@ -0,0 +1,357 @@
+"""
+Parallel Stem Export
+
+Bounces every track and bus of a Router session to its own file.
+
+Each stem only depends on the tracks that reach it (through output routing
+or sends, see stem_dependencies), so every stem is rendered from its own
+subgraph of just those tracks in a ProcessPoolExecutor, one AudioEngine per
+stem. Audio sources are written once to .npy files and each worker opens
+the ones its stem needs memory-mapped (read-only), so sources are shared
+through the page cache instead of being pickled to every process.
+
+Workers are forked by default, which hands them the session without
+pickling the insert callables. Fork copies only the calling thread, so a
+lock held by another thread at that moment (logging, the engine lock of a
+running server) stays locked in the workers; from a multi-threaded process
+pass start_method="forkserver" or "spawn" with picklable inserts. Workers report per-stem progress
+through a shared array that the parent can poll while the export runs.
+
+Usage:
+    from daw_core.stems import StemExporter
+
+    exporter = StemExporter(router, sample_rate=48000)
+    job = exporter.export("stems/")
+    while not job.done():
+        print(job.get_progress())
+    results = job.results()
+"""
+
+import copy
+import multiprocessing as mp
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .engine import AudioEngine
+from .graph import AudioInput, FXNode, MixerBus, Node, OutputNode
+from .render import OfflineRenderer
+from .routing import Router
+
+
+# Worker-side session, installed once per process by _init_worker
+_SESSION: Optional[dict] = None
+_PROGRESS = None
+
+
+def _init_worker(session: dict, progress):
+    global _SESSION, _PROGRESS
+    _SESSION = session
+    _PROGRESS = progress
+
+
+def _render_stem(index: int, stem_id: str, path: str, start: int, end: int,
+                 subtype: str) -> dict:
+    """Build one stem's subgraph in a worker process and bounce it."""
+    session = _SESSION
+    source_paths = session["source_paths"]
+    sources = {
+        track_id: np.load(source_paths[track_id], mmap_mode="r")
+        for track_id in stem_dependencies(session["router"], stem_id)
+        if track_id in source_paths
+    }
+    engine = AudioEngine(session["sample_rate"], session["buffer_size"])
+    out = build_stem_graph(session["router"], stem_id, sources, engine)
+
+    def report(fraction: float):
+        _PROGRESS[index] = fraction
+
+    result = OfflineRenderer(engine, out).render(
+        path, start=start, end=end, subtype=subtype, progress_callback=report
+    )
+    result["stem"] = stem_id
+    return result
+
+
+def stem_dependencies(router: Router, stem_id: str) -> List[str]:
+    """
+    Tracks whose audio reaches a stem, including the stem's own track.
+
+    A track feeds a destination when the destination appears in its routing
+    or it has an enabled send to it; feeding is followed transitively.
+    """
+    feeds: Dict[str, List[str]] = {}
+    for track_id, track in router.tracks.items():
+        dests = list(router.get_routing_for_track(track_id))
+        dests += [s["destination"] for s in track.sends if s.get("enabled", True)]
+        for dest in dests:
+            feeds.setdefault(dest, []).append(track_id)
+
+    found: List[str] = [stem_id] if stem_id in router.tracks else []
+    stack = [stem_id]
+    while stack:
+        for upstream in feeds.get(stack.pop(), ()):
+            if upstream not in found:
+                found.append(upstream)
+                stack.append(upstream)
+    return found
+
+
+def build_stem_graph(router: Router, stem_id: str, sources: Dict[str, np.ndarray],
+                     engine: AudioEngine) -> OutputNode:
+    """
+    Add the subgraph that produces one stem to an engine.
+
+    Every track that reaches the stem gets an input stage (its source,
+    plus everything routed or sent into it), copies of its inserts and its
+    fader. Sends tap before or after the fader and are scaled by their
+    level. Bus stems sum their routed tracks through the bus gain.
+
+    Returns:
+        The OutputNode carrying the stem's audio
+    """
+    chains: Dict[str, tuple] = {}
+
+    def add(node: Node) -> Node:
+        engine.add_node(node)
+        return node
+
+    def chain(track_id: str) -> tuple:
+        """(pre_fader, post_fader) nodes for a track, built once."""
+        if track_id in chains:
+            return chains[track_id]
+        track = router.tracks[track_id]
+        input_gain = 10.0 ** (track.input_gain / 20.0)
+        head = add(FXNode(f"{track.name} Input", lambda x, g=input_gain: x * g))
+        if track_id in sources:
+            engine.connect(add(AudioInput(f"{track.name} Source", sources[track_id])), head)
+        feed_into(track_id, head)
+
+        node = head
+        for fx in track.inserts:
+            fx = add(copy.deepcopy(fx))
+            fx.connections = []
+            engine.connect(node, fx)
+            node = fx
+        fader = add(FXNode(f"{track.name} Fader", track._make_fader_fn()))
+        engine.connect(node, fader)
+        chains[track_id] = (node, fader)
+        return chains[track_id]
+
+    def feed_into(dest_id: str, target: Node):
+        """Connect everything routed or sent to dest_id into target."""
+        for track_id, track in router.tracks.items():
+            if track_id == dest_id:
+                continue
+            if dest_id in router.get_routing_for_track(track_id):
+                engine.connect(chain(track_id)[1], target)
+            for send in track.sends:
+                if send["destination"] != dest_id or not send.get("enabled", True):
+                    continue
+                pre, post = chain(track_id)
+                level = 10.0 ** (send["level_db"] / 20.0)
+                tap = add(FXNode(f"{track.name} Send {dest_id}", lambda x, g=level: x * g))
+                engine.connect(pre if send["pre_fader"] else post, tap)
+                engine.connect(tap, target)
+
+    out = add(OutputNode(f"Stem {stem_id}"))
+    if stem_id in router.tracks:
+        engine.connect(chain(stem_id)[1], out)
+    else:
+        bus = router.buses.get(stem_id)
+        mix = add(MixerBus(f"Stem {stem_id} Bus", num_inputs=1))
+        mix.gain = bus.gain if bus is not None else 1.0
+        feed_into(stem_id, mix)
+        engine.connect(mix, out)
+    return out
+
+
+class StemExportJob:
+    """
+    Running stem export.
+
+    Poll get_progress() for per-stem progress; results() blocks until all
+    stems are written and returns their render summaries.
+    """
+
+    def __init__(self, stem_ids: Sequence[str], paths: Sequence[str], futures: Sequence[Future],
+                 progress, executor: ProcessPoolExecutor, tempdir: tempfile.TemporaryDirectory):
+        self.stem_ids = list(stem_ids)
+        self.paths = dict(zip(stem_ids, paths))
+        self.futures = dict(zip(stem_ids, futures))
+        self._progress = progress
+        self._executor = executor
+        self._tempdir = tempdir
+        self._cleanup_lock = threading.Lock()
+        for future in futures:
+            future.add_done_callback(self._maybe_cleanup)
+
+    def _maybe_cleanup(self, _future=None):
+        """Drop the pool and memmapped sources once every stem finished."""
+        if not self.done():
+            return
+        with self._cleanup_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                self._tempdir.cleanup()
+
+    def done(self) -> bool:
+        """Whether every stem has finished (or failed/cancelled)."""
+        return all(f.done() for f in self.futures.values())
+
+    def _status(self, future: Future) -> str:
+        if future.cancelled():
+            return "cancelled"
+        if future.running():
+            return "running"
+        if not future.done():
+            return "pending"
+        return "failed" if future.exception() is not None else "done"
+
+    def get_progress(self) -> Dict[str, dict]:
+        """Per-stem status and completed fraction."""
+        progress = {}
+        for index, stem_id in enumerate(self.stem_ids):
+            future = self.futures[stem_id]
+            status = self._status(future)
+            progress[stem_id] = {
+                "path": self.paths[stem_id],
+                "status": status,
+                "progress": 1.0 if status == "done" else float(self._progress[index]),
+                "error": str(future.exception()) if status == "failed" else None,
+            }
+        return progress
+
+    def cancel(self):
+        """Cancel stems that have not started yet."""
+        for future in self.futures.values():
+            future.cancel()
+        self._maybe_cleanup()
+
+    def results(self, timeout: Optional[float] = None) -> Dict[str, dict]:
+        """
+        Wait for every stem and return its render summary.
+
+        Raises:
+            The first exception raised while rendering a stem
+        """
+        results = {
+            stem_id: self.futures[stem_id].result(timeout)
+            for stem_id in self.stem_ids
+            if not self.futures[stem_id].cancelled()
+        }
+        self._maybe_cleanup()
+        return results
+
+
+class StemExporter:
+    """
+    Bounce tracks and buses of a Router session as separate stems.
+
+    Each track's source is taken from its input_node (an AudioInput with
+    data). Inserts are copied into the worker subgraphs, so with a start
+    method other than "fork" they must be picklable.
+
+    Args:
+        router: Session routing (tracks, buses, sends)
+        sample_rate: Render sample rate
+        buffer_size: Block size of the per-stem engines
+        max_workers: Worker processes (default: available CPUs)
+        start_method: multiprocessing start method for the workers
+            (default: "fork" where available; see the module notes before
+            forking a multi-threaded process such as the API server)
+    """
+
+    def __init__(self, router: Router, sample_rate: int = 44100, buffer_size: int = 1024,
+                 max_workers: Optional[int] = None, start_method: Optional[str] = None):
+        self.router = router
+        self.sample_rate = sample_rate
+        self.buffer_size = buffer_size
+        self.max_workers = max_workers
+        self.start_method = start_method
+
+    def default_stems(self) -> List[str]:
+        """Every track and registered bus."""
+        return list(self.router.tracks) + [b for b in self.router.buses if b not in self.router.tracks]
+
+    def _sources(self) -> Dict[str, np.ndarray]:
+        sources = {}
+        for track_id, track in self.router.tracks.items():
+            node = track.input_node
+            if isinstance(node, AudioInput) and node.data is not None:
+                sources[track_id] = node.data
+        return sources
+
+    def export(self, output_dir: str, stems: Optional[Sequence[str]] = None,
+               start: Optional[int] = None, end: Optional[int] = None,
+               extension: str = "wav", subtype: str = "PCM_24") -> StemExportJob:
+        """
+        Start rendering stems in a process pool.
+
+        Args:
+            output_dir: Directory for the stem files (<stem_id>.<extension>)
+            stems: Track/bus ids to export (default: default_stems())
+            start, end: Range in samples (default: whole session)
+            extension: "wav" or "flac"
+            subtype: soundfile subtype
+
+        Returns:
+            StemExportJob for progress polling and results
+        """
+        valid, message = self.router.validate_routing()
+        if not valid:
+            raise ValueError(message)
+        stem_ids = list(stems) if stems is not None else self.default_stems()
+        unknown = [s for s in stem_ids if s not in self.router.tracks and s not in self.router.buses]
+        if unknown:
+            raise KeyError(f"Unknown stems: {unknown}")
+
+        # Share sources read-only through memory-mapped files
+        tempdir = tempfile.TemporaryDirectory(prefix="daw_stems_")
+        sources = self._sources()
+        source_paths = {}
+        for track_id, data in sources.items():
+            source_path = os.path.join(tempdir.name, f"source_{len(source_paths)}.npy")
+            mapped = np.lib.format.open_memmap(source_path, mode="w+", dtype=np.float32,
+                                               shape=data.shape)
+            mapped[...] = data
+            mapped.flush()
+            del mapped
+            source_paths[track_id] = source_path
+
+        if start is None:
+            start = 0
+        if end is None:
+            end = max((data.shape[-1] for data in sources.values()), default=0)
+
+        session = {
+            "router": self.router,
+            "source_paths": source_paths,
+            "sample_rate": self.sample_rate,
+            "buffer_size": self.buffer_size,
+        }
+        # fork hands the session to workers without pickling the insert callables
+        method = self.start_method
+        if method is None and "fork" in mp.get_all_start_methods():
+            method = "fork"
+        context = mp.get_context(method)
+        progress = context.Array("d", len(stem_ids), lock=False)
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(session, progress),
+        )
+
+        os.makedirs(output_dir, exist_ok=True)
+        paths = [os.path.join(output_dir, f"{stem_id}.{extension}") for stem_id in stem_ids]
+        futures = [
+            executor.submit(_render_stem, index, stem_id, path, start, end, subtype)
+            for index, (stem_id, path) in enumerate(zip(stem_ids, paths))
+        ]
+        return StemExportJob(stem_ids, paths, futures, progress, executor, tempdir)
@@ -14,6 +14,8 @@ while the underlying engine is node-based.
 
 from typing import List, Optional, Dict, Any
 from .graph import Node, FXNode, MixerBus
+from .events import ParameterEventQueue
+from .fusion import InsertChain
 import numpy as np
 
 
@@ -36,6 +38,8 @@ class Track:
     - sends: List of (destination_track, level, pre/post) tuples
     """
 
+    FADER_PARAMS = ("volume", "pan", "muted", "phase_flip")
+
     def __init__(self, track_id: str, name: str, track_type: str = "audio"):
         self.id = track_id
         self.name = name
@@ -56,6 +60,8 @@ class Track:
         # DSP Effects
         self.phase_flip = False
         self.inserts: List[FXNode] = []  # Insert effects chain
+        self.fuse_inserts = False  # play inserts through one fused InsertChain node
+        self._insert_chain: Optional[InsertChain] = None
         self.sends: List[Dict[str, Any]] = []  # Send destinations
 
         # Routing
@@ -63,9 +69,17 @@ class Track:
 
         # Internal nodes (managed by engine)
         self.input_node: Optional[Node] = None
+        self.return_node: Optional[Node] = None  # sums routed/sent audio (see Router.build_graph)
         self.fader_node: Optional[FXNode] = None
         self.output_node: Optional[MixerBus] = None
 
+        # Control -> audio thread parameter changes (see attach_event_queue)
+        self.event_queue: Optional[ParameterEventQueue] = None
+        self._fader_changes: List[tuple] = []  # (offset, param, value), audio thread only
+
+        # Freeze (see freeze())
+        self.freeze_node: Optional[Node] = None
+
     def add_insert(self, fx_node: FXNode, position: Optional[int] = None):
         """
         Insert an effect into the FX chain.
@@ -78,17 +92,42 @@ class Track:
             self.inserts.append(fx_node)
         else:
             self.inserts.insert(position, fx_node)
+        self._chain_changed()
 
     def remove_insert(self, fx_index: int):
         """Remove an effect from the chain."""
         if 0 <= fx_index < len(self.inserts):
             self.inserts.pop(fx_index)
+            self._chain_changed()
 
     def reorder_inserts(self, old_idx: int, new_idx: int):
         """Reorder effects in the chain."""
         if 0 <= old_idx < len(self.inserts) and 0 <= new_idx < len(self.inserts):
             fx = self.inserts.pop(old_idx)
             self.inserts.insert(new_idx, fx)
+            self._chain_changed()
+
+    def set_insert_param(self, fx_index: int, param: str, value):
+        """
+        Change a parameter of an insert's effect from the control thread.
+
+        Uses the effect's set_<param>() (or setattr) and re-checks the
+        freeze cache, which is not validated per block.
+        """
+        if 0 <= fx_index < len(self.inserts):
+            fx = self.inserts[fx_index]
+            target = getattr(fx.fx_fn, "__self__", fx)
+            setter = getattr(target, f"set_{param}", None)
+            if setter is not None:
+                setter(value)
+            else:
+                setattr(target, param, value)
+            self.validate_freeze()
+
+    def _chain_changed(self):
+        """Re-check freeze and pruning after an insert edit."""
+        self.validate_freeze()
+        self.update_pruning()
 
     def add_send(self, destination_id: str, level_db: float = 0.0, pre_fader: bool = False):
         """
@@ -105,19 +144,122 @@ class Track:
             "pre_fader": pre_fader,
             "enabled": True,
         })
+        self.update_pruning()
 
     def remove_send(self, destination_id: str):
         """Remove a send to a track."""
         self.sends = [s for s in self.sends if s["destination"] != destination_id]
+        self.update_pruning()
+
+    def has_active_sends(self) -> bool:
+        """Whether any enabled send still carries audio."""
+        return any(s.get("enabled", True) and s["level_db"] > -96.0 for s in self.sends)
 
-    def set_volume(self, gain_db: float):
-        """Set track fader level."""
+    def update_pruning(self):
+        """
+        Let the engine skip this track's nodes entirely while it is muted
+        and nothing taps it through a send.
+        """
+        self._set_pruned(self.muted and not self.has_active_sends())
+
+    def _set_pruned(self, pruned: bool):
+        # A frozen track replays its cache instead of the source and inserts
+        frozen = self.freeze_node is not None
+        for node in (self.input_node, self.return_node, self._insert_chain, *self.inserts):
+            if node is not None:
+                node.pruned = pruned or frozen
+        for node in (self.freeze_node, self.fader_node):
+            if node is not None:
+                node.pruned = pruned
+
+    @property
+    def frozen(self) -> bool:
+        """Whether the track currently plays from its freeze cache."""
+        return self.freeze_node is not None
+
+    def freeze(self, cache_dir: Optional[str] = None, block_size: int = 1024,
+               sample_rate: int = 44100) -> Node:
+        """
+        Render the source through the inserts once and play the result.
+
+        The returned node streams the memory-mapped cache and replaces
+        input_node + inserts in the signal chain (see get_playback_chain).
+        """
+        from .freeze import freeze_track
+        self.freeze_node = freeze_track(self, cache_dir, block_size, sample_rate)
+        self.update_pruning()
+        return self.freeze_node
+
+    def unfreeze(self):
+        """
+        Go back to processing the inserts live.
+
+        A frozen node still wired into an engine switches to running the
+        live chain itself until the graph is rebuilt (see FrozenSource).
+        """
+        if self.freeze_node is not None:
+            self.freeze_node.stale = True
+        self.freeze_node = None
+        self.update_pruning()
+
+    def validate_freeze(self) -> bool:
+        """
+        Unfreeze if the inserts, their order or the source changed since
+        the cache was rendered.
+
+        Returns:
+            True if the track is still frozen
+        """
+        if self.freeze_node is None:
+            return False
+        from .freeze import chain_hash
+        if chain_hash(self) != self.freeze_node.content_hash:
+            self.unfreeze()
+            return False
+        return True
+
+    @property
+    def insert_chain(self) -> InsertChain:
+        """Single node running all inserts with linear runs fused (see fusion)."""
+        if self._insert_chain is None:
+            self._insert_chain = InsertChain(f"{self.name} Inserts", self.inserts)
+            self.update_pruning()
+        return self._insert_chain
+
+    def get_playback_chain(self) -> List[Node]:
+        """
+        Nodes from source to last insert, honouring freeze state.
+
+        A track receiving other tracks starts at its return_node, into
+        which its own source is summed. With fuse_inserts set the inserts
+        are replaced by insert_chain; changing it, like freezing, needs the
+        graph to be rebuilt.
+        """
+        if self.freeze_node is not None:
+            return [self.freeze_node]
+        first = self.return_node if self.return_node is not None else self.input_node
+        head = [first] if first is not None else []
+        if self.fuse_inserts and self.inserts:
+            return head + [self.insert_chain]
+        return head + list(self.inserts)
+
+    def set_volume(self, gain_db: float, sample_time: int = -1):
+        """
+        Set track fader level.
+
+        With an event queue attached the change is applied by the audio
+        thread at sample_time (-1 = next block); otherwise immediately.
+        """
+        if self._queue_event("volume", gain_db, sample_time):
+            return
         self.volume = gain_db
         if self.fader_node:
             self.fader_node.fx_fn = self._make_fader_fn()
 
-    def set_pan(self, pan: float):
+    def set_pan(self, pan: float, sample_time: int = -1):
         """Set stereo panning (-1.0 to +1.0)."""
+        if self._queue_event("pan", pan, sample_time):
+            return
         self.pan = np.clip(pan, -1.0, 1.0)
 
     def set_input_gain(self, gain_db: float):
@@ -128,45 +270,127 @@ class Track:
         """Set record arm state."""
         self.armed = armed
 
-    def set_muted(self, muted: bool):
+    def set_muted(self, muted: bool, sample_time: int = -1):
         """Set mute state."""
+        if self._queue_event("muted", muted, sample_time):
+            return
         self.muted = muted
+        self.update_pruning()
 
     def set_soloed(self, soloed: bool):
         """Set solo state."""
         self.soloed = soloed
 
-    def set_phase_flip(self, enabled: bool):
+    def set_phase_flip(self, enabled: bool, sample_time: int = -1):
         """Enable/disable phase invert."""
+        if self._queue_event("phase_flip", enabled, sample_time):
+            return
         self.phase_flip = enabled
 
-    def _make_fader_fn(self):
-        """Create the fader processing function."""
-        gain_linear = 10.0 ** (self.volume / 20.0)
-        pan = self.pan
+    def attach_event_queue(self, queue: Optional[ParameterEventQueue]):
+        """
+        Route fader changes through an engine's parameter queue.
 
-        def fader_process(signal: np.ndarray) -> np.ndarray:
-            # Apply gain
-            processed = signal * gain_linear
+        Once attached, set_volume/set_pan/set_muted/set_phase_flip only
+        enqueue the change; the audio thread applies it sample-accurately.
+        """
+        self.event_queue = queue
+
+    def _queue_event(self, param: str, value, sample_time: int) -> bool:
+        """Push a fader change to the audio thread if a queue is attached."""
+        if self.event_queue is None:
+            return False
+        self.event_queue.push(self, param, value, sample_time)
+        return True
+
+    def apply_event(self, param: str, value, offset: int = 0):
+        """
+        Apply a queued change on the audio thread.
 
-            # Apply panning (stereo)
-            if processed.shape[0] == 2:
-                # L/R panning
-                left_gain = np.sqrt(0.5 * (1.0 - pan))
-                right_gain = np.sqrt(0.5 * (1.0 + pan))
-                processed[0] *= left_gain
-                processed[1] *= right_gain
+        Fader parameters take effect at `offset` samples into the next
+        fader block; anything else is applied immediately.
+        """
+        if param in self.FADER_PARAMS:
+            self._fader_changes.append((offset, param, value))
+            if param == "muted" and not value:
+                # Wake the chain so the fader can apply the unmute
+                self._set_pruned(False)
+        else:
+            setattr(self, param, value)
+
+    def _set_fader_param(self, param: str, value):
+        if param == "pan":
+            value = float(np.clip(value, -1.0, 1.0))
+        setattr(self, param, value)
+        if param == "muted":
+            self.update_pruning()
+
+    def _channel_gains(self):
+        """Current (left, right) fader gains including pan, mute and phase."""
+        gain = 10.0 ** (self.volume / 20.0)
+        if self.muted:
+            gain = 0.0
+        if self.phase_flip:
+            gain = -gain
+        return (gain * np.sqrt(0.5 * (1.0 - self.pan)),
+                gain * np.sqrt(0.5 * (1.0 + self.pan)),
+                gain)
+
+    def _fader_envelope(self, frames: int, dtype=np.float32) -> np.ndarray:
+        """
+        Consume queued fader changes as per-sample (left, right, mono) gains.
 
-            # Apply mute
-            if self.muted:
-                processed *= 0.0
+        The block is split at each change's offset into segments with
+        piecewise-constant gains.
+        """
+        gains = np.empty((3, frames), dtype=dtype)
+        changes = sorted(self._fader_changes, key=lambda c: c[0])
+        self._fader_changes.clear()
+        start = 0
+        for offset, param, value in changes:
+            offset = min(offset, frames)
+            gains[:, start:offset] = np.array(self._channel_gains())[:, None]
+            self._set_fader_param(param, value)
+            start = max(start, offset)
+        gains[:, start:] = np.array(self._channel_gains())[:, None]
+        return gains
+
+    def settle_fader_changes(self):
+        """
+        Apply every queued fader change now, in offset order.
 
-            # Apply phase flip
-            if self.phase_flip:
-                processed *= -1.0
+        Called when the fader (node or mixer) sleeps through a silent
+        block: nothing is audible, so the offsets no longer matter, and the
+        changes must not carry over into the next block.
+        """
+        changes = sorted(self._fader_changes, key=lambda c: c[0])
+        self._fader_changes.clear()
+        for _, param, value in changes:
+            self._set_fader_param(param, value)
 
-            return processed
+    def _make_fader_fn(self):
+        """
+        Create the fader processing function.
 
+        The function reads the track state every block, so parameter
+        changes need no rebuild. Queued changes switch to per-sample gains
+        for that block (see _fader_envelope), or are settled at once when
+        the fader node sleeps.
+        """
+        def fader_process(signal: np.ndarray) -> np.ndarray:
+            stereo = signal.ndim == 2 and signal.shape[0] == 2
+            if not self._fader_changes:
+                left, right, gain = self._channel_gains()
+                if stereo:
+                    return signal * np.array([[left], [right]], dtype=signal.dtype)
+                return signal * gain
+
+            gains = self._fader_envelope(signal.shape[-1], signal.dtype)
+            if stereo:
+                return signal * gains[:2]
+            return signal * gains[2]
+
+        fader_process.settle = self.settle_fader_changes
         return fader_process
 
     def to_dict(self) -> Dict[str, Any]:
@@ -187,6 +411,7 @@ class Track:
             "inserts": [{"name": fx.name, "enabled": fx.enabled} for fx in self.inserts],
             "sends": self.sends,
             "output_routing": self.output_routing,
+            "frozen": self.frozen,
         }
 
     def from_dict(self, data: Dict[str, Any]):
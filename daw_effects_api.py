@@ -15,10 +15,10 @@ logger = logging.getLogger(__name__)
 try:
     # Main effects from __init__
     from daw_core.fx import (
-        EQ3Band, HighLowPass, Compressor, Limiter, Expander, Gate, NoiseGate,
+        EQ3Band, HighLowPass, Compressor, Limiter, LookaheadLimiter, MultibandCompressor, Expander, Gate, NoiseGate,
         Saturation, HardClip, Distortion, WaveShaper,
         SimpleDelay, PingPongDelay, MultiTapDelay, StereoDelay,
-        Reverb, HallReverb, PlateReverb, RoomReverb
+        Reverb, HallReverb, PlateReverb, RoomReverb, ConvolutionReverb
     )
     # Utility effects from modulation_and_utility module
     from daw_core.fx.modulation_and_utility import Chorus, Gain
@@ -97,6 +97,28 @@ EFFECTS_REGISTRY = {
             "makeup_gain": EffectParameter(name="Makeup Gain", min=0, max=60, default=0, unit="dB"),
         }
     },
+    "limiter_lookahead": {
+        "class": LookaheadLimiter,
+        "name": "Lookahead Limiter",
+        "category": "dynamics",
+        "parameters": {
+            "ceiling": EffectParameter(name="Ceiling", min=-20, max=0, default=-1, unit="dBTP"),
+            "lookahead": EffectParameter(name="Lookahead", min=0.1, max=20, default=1.5, unit="ms"),
+            "release": EffectParameter(name="Release", min=1, max=1000, default=50, unit="ms"),
+        }
+    },
+    "compressor_multiband": {
+        "class": MultibandCompressor,
+        "name": "Multiband Compressor",
+        "category": "dynamics",
+        "parameters": {
+            "threshold": EffectParameter(name="Threshold", min=-60, max=0, default=-20, unit="dB"),
+            "ratio": EffectParameter(name="Ratio", min=1, max=20, default=4),
+            "attack": EffectParameter(name="Attack", min=0.1, max=100, default=10, unit="ms"),
+            "release": EffectParameter(name="Release", min=10, max=1000, default=100, unit="ms"),
+            "makeup_gain": EffectParameter(name="Makeup Gain", min=-12, max=12, default=0, unit="dB"),
+        }
+    },
     "reverb_plate": {
         "class": PlateReverb,
         "name": "Plate Reverb",
@@ -108,6 +130,15 @@ EFFECTS_REGISTRY = {
             "wet": EffectParameter(name="Wet", min=0, max=1, default=0.5),
         }
     },
+    "reverb_convolution": {
+        "class": ConvolutionReverb,
+        "name": "Convolution Reverb",
+        "category": "reverb",
+        "parameters": {
+            "wet_level": EffectParameter(name="Wet", min=0, max=1, default=1),
+            "dry_level": EffectParameter(name="Dry", min=0, max=1, default=0),
+        }
+    },
     "chorus": {
         "class": Chorus,
         "name": "Chorus",
@@ -116,6 +147,7 @@ EFFECTS_REGISTRY = {
             "rate": EffectParameter(name="Rate", min=0.1, max=10, default=1.5, unit="Hz"),
             "depth": EffectParameter(name="Depth", min=0, max=1, default=0.5),
             "wet": EffectParameter(name="Wet", min=0, max=1, default=0.5),
+            "voices": EffectParameter(name="Voices", min=1, max=8, default=1),
         }
     },
     "delay": {
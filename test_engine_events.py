@@ -0,0 +1,175 @@
+"""
+DAW Core Engine - Parameter Event Queue Tests
+
+Tests for the lock-free control -> audio thread parameter ring and
+sample-accurate application of queued changes.
+"""
+
+import threading
+
+import pytest
+import numpy as np
+from daw_core.engine import AudioEngine
+from daw_core.events import ParameterEventQueue
+from daw_core.graph import AudioInput, FXNode, OutputNode
+from daw_core.track import Track
+
+
+class _Target:
+    def __init__(self):
+        self.gain = 0.0
+        self.calls = []
+
+    def set_gain(self, value):
+        self.gain = value
+        self.calls.append(value)
+
+
+class TestParameterEventQueue:
+    """Test the parameter ring."""
+
+    def test_fifo_with_wraparound(self):
+        """Verify events come out in order across the ring boundary."""
+        queue = ParameterEventQueue(capacity=4)
+        out = []
+        for i in range(10):
+            assert queue.push(None, "p", i)
+            out.append(queue.pop()[2])
+        assert out == list(range(10))
+        assert queue.pop() is None
+
+    def test_full_ring_drops(self):
+        """Verify pushing into a full ring fails without blocking."""
+        queue = ParameterEventQueue(capacity=2)
+        assert queue.push(None, "p", 1)
+        assert queue.push(None, "p", 2)
+        assert not queue.push(None, "p", 3)
+        assert queue.dropped == 1
+        assert len(queue) == 2
+
+    def test_concurrent_producer(self):
+        """Verify a producer thread and consumer lose no events."""
+        queue = ParameterEventQueue(capacity=64)
+        total = 20000
+        received = []
+
+        def produce():
+            i = 0
+            while i < total:
+                if queue.push(None, "p", i):
+                    i += 1
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        while len(received) < total:
+            event = queue.pop()
+            if event is not None:
+                received.append(event[2])
+        thread.join()
+        assert received == list(range(total))
+
+    def test_concurrent_producers(self):
+        """Verify several producer threads lose no events."""
+        queue = ParameterEventQueue(capacity=64)
+        producers, per_thread = 4, 5000
+        received = []
+
+        def produce(tag):
+            i = 0
+            while i < per_thread:
+                if queue.push(tag, "p", i):
+                    i += 1
+
+        threads = [threading.Thread(target=produce, args=(t,)) for t in range(producers)]
+        for thread in threads:
+            thread.start()
+        while len(received) < producers * per_thread:
+            event = queue.pop()
+            if event is not None:
+                received.append((event[0], event[2]))
+        for thread in threads:
+            thread.join()
+        assert queue.pop() is None
+        for tag in range(producers):
+            assert [v for t, v in received if t == tag] == list(range(per_thread))
+
+
+class TestEngineEvents:
+    """Test block-start draining in AudioEngine."""
+
+    def test_setter_applied_at_next_block(self):
+        """Verify queued changes reach set_<param> on the audio thread."""
+        engine = AudioEngine(buffer_size=64)
+        target = _Target()
+        engine.schedule_parameter(target, "gain", -6.0)
+        assert target.gain == 0.0
+        engine.run_block()
+        assert target.gain == -6.0
+        assert engine.get_stats()["parameter_events_applied"] == 1
+
+    def test_future_event_waits_for_its_block(self):
+        """Verify timestamped changes are held until their block."""
+        engine = AudioEngine(buffer_size=64)
+        target = _Target()
+        engine.schedule_parameter(target, "gain", 1.0, sample_time=200)
+        engine.schedule_parameter(target, "gain", 2.0, sample_time=100)
+        engine.run_block()  # 0-63
+        assert target.calls == []
+        engine.run_block()  # 64-127
+        assert target.calls == [2.0]
+        engine.run_block()  # 128-191
+        engine.run_block()  # 192-255
+        assert target.calls == [2.0, 1.0]
+
+
+class TestTrackFaderEvents:
+    """Test sample-accurate fader changes on Track."""
+
+    def _engine(self, track, data=None):
+        engine = AudioEngine(buffer_size=64)
+        src = AudioInput("In", np.ones((2, 256), dtype=np.float32) if data is None else data)
+        track.fader_node = FXNode("Fader", track._make_fader_fn())
+        out = OutputNode("Out")
+        for node in (src, track.fader_node, out):
+            engine.add_node(node)
+        engine.connect(src, track.fader_node)
+        engine.connect(track.fader_node, out)
+        track.attach_event_queue(engine.parameter_events)
+        return engine
+
+    def test_volume_change_is_sample_accurate(self):
+        """Verify a queued volume change lands on its exact sample."""
+        track = Track("t1", "Track")
+        engine = self._engine(track)
+        track.set_volume(-6.0, sample_time=64 + 10)
+        assert track.volume == 0.0  # not applied on the control thread
+
+        engine.run_block()
+        engine.run_block()
+        out = track.fader_node.get_output(0)
+        before = np.sqrt(0.5)
+        after = 10.0 ** (-6.0 / 20.0) * np.sqrt(0.5)
+        assert np.allclose(out[:, :10], before)
+        assert np.allclose(out[:, 10:], after)
+        assert track.volume == -6.0
+
+    def test_change_during_silence_applies_before_audio(self):
+        """Verify a change queued into a sleeping fader is not replayed later."""
+        track = Track("t1", "Track")
+        data = np.ones((2, 256), dtype=np.float32)
+        data[:, :64] = 0.0
+        engine = self._engine(track, data)
+        track.set_muted(True, sample_time=10)
+
+        engine.run_block()  # silent: the fader sleeps
+        assert track.muted and not track._fader_changes
+        engine.run_block()
+        assert not np.any(track.fader_node.get_output(0))
+
+    def test_mute_without_queue_is_immediate(self):
+        """Verify tracks without a queue keep direct updates."""
+        track = Track("t1", "Track")
+        track.set_muted(True)
+        assert track.muted
+        fader = track._make_fader_fn()
+        assert not np.any(fader(np.ones((2, 8), dtype=np.float32)))
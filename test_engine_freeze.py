@@ -0,0 +1,145 @@
+"""
+DAW Core Engine - Track Freeze Tests
+
+Tests for rendering a track's insert chain to a memory-mapped cache and
+invalidating it when the chain or source changes.
+"""
+
+import pytest
+import numpy as np
+from daw_core.engine import AudioEngine
+from daw_core.graph import AudioInput, FXNode, OutputNode
+from daw_core.track import Track
+from daw_core.freeze import chain_hash
+from daw_core.fx.delays import SimpleDelay
+from daw_core.fx.dynamics_part2 import LookaheadLimiter
+from daw_core.fx.modulation_and_utility import Gain
+
+
+def _track(length=4096):
+    rng = np.random.default_rng(11)
+    track = Track("t1", "Vocals")
+    track.input_node = AudioInput("Vocals", rng.standard_normal((2, length)).astype(np.float32) * 0.1)
+    gain = Gain()
+    gain.set_gain(-6.0)
+    track.add_insert(FXNode("Gain", gain.process))
+    track.add_insert(FXNode("Half", lambda x: x * 0.5))
+    return track, gain
+
+
+class TestTrackFreeze:
+    """Test freeze rendering and playback."""
+
+    def test_frozen_audio_matches_chain(self, tmp_path):
+        """Verify the cache equals the source run through the inserts."""
+        track, _ = _track()
+        node = track.freeze(cache_dir=str(tmp_path), block_size=512)
+
+        expected = track.input_node.data * 10.0 ** (-6.0 / 20.0) * 0.5
+        assert isinstance(node.data, np.memmap)
+        assert node.data.dtype == np.float32
+        assert np.allclose(node.data, expected, atol=1e-6)
+        assert track.frozen
+        assert all(fx.pruned for fx in track.inserts)
+        assert track.get_playback_chain() == [node]
+
+    def test_cache_reused_for_same_chain(self, tmp_path):
+        """Verify refreezing an unchanged chain does not re-render."""
+        track, _ = _track()
+        first = track.freeze(cache_dir=str(tmp_path))
+        mtime = (tmp_path / f"t1-{first.content_hash}.npy").stat().st_mtime_ns
+        second = track.freeze(cache_dir=str(tmp_path))
+        assert second.path == first.path
+        assert (tmp_path / f"t1-{first.content_hash}.npy").stat().st_mtime_ns == mtime
+
+    def test_tail_rendered_past_source(self, tmp_path):
+        """Verify effect tails extend the cache."""
+        track = Track("t2", "Keys")
+        track.input_node = AudioInput("Keys", np.ones((2, 1000), dtype=np.float32) * 0.1)
+        track.add_insert(FXNode("Tail", lambda x: x, tail_samples=700))
+        node = track.freeze(cache_dir=str(tmp_path), block_size=256)
+        assert node.data.shape[-1] == 1700
+        assert not np.any(node.data[:, 1000:])
+
+    def test_render_isolated_from_live_state(self, tmp_path):
+        """Verify the render starts from reset copies and leaves live inserts alone."""
+        track = Track("t4", "Bus")
+        track.input_node = AudioInput("Bus", np.full((2, 2048), 0.1, dtype=np.float32))
+        limiter = LookaheadLimiter()
+        track.add_insert(FXNode("Limiter", limiter.process))
+        limiter.process(np.ones((2, 512), dtype=np.float32))  # live audio in the delay line
+        live_delay = limiter._delay.copy()
+
+        node = track.freeze(cache_dir=str(tmp_path), block_size=256)
+        expected = LookaheadLimiter().process(track.input_node.data.copy())
+        assert np.allclose(node.data[:, :2048], expected, atol=1e-6)
+        assert np.array_equal(limiter._delay, live_delay)
+
+
+class TestFreezeInvalidation:
+    """Test content-hash invalidation."""
+
+    def test_parameter_change_invalidates(self, tmp_path):
+        """Verify changing an insert parameter unfreezes on validation."""
+        track, gain = _track()
+        track.freeze(cache_dir=str(tmp_path))
+        assert track.validate_freeze()
+        gain.set_gain(-12.0)
+        assert not track.validate_freeze()
+        assert not track.frozen
+        assert not any(fx.pruned for fx in track.inserts)
+
+    def test_reorder_and_source_change_hash(self):
+        """Verify order and source audio are part of the hash."""
+        track, _ = _track()
+        original = chain_hash(track)
+        track.reorder_inserts(0, 1)
+        assert chain_hash(track) != original
+        track.reorder_inserts(0, 1)
+        assert chain_hash(track) == original
+        track.input_node.data[0, 0] += 0.5
+        assert chain_hash(track) != original
+
+    def test_runtime_state_not_hashed(self):
+        """Verify processing audio (delay buffers) keeps the hash stable."""
+        track = Track("t3", "Gtr")
+        track.input_node = AudioInput("Gtr", np.ones((2, 256), dtype=np.float32))
+        delay = SimpleDelay()
+        track.add_insert(FXNode("Delay", delay.process))
+        before = chain_hash(track)
+        delay.process(np.ones(512, dtype=np.float32))
+        assert chain_hash(track) == before
+
+    def test_seek_revalidates(self, tmp_path):
+        """Verify a transport seek unfreezes a stale track."""
+        track, gain = _track()
+        node = track.freeze(cache_dir=str(tmp_path))
+        gain.set_gain(0.0)
+        node.seek(0)
+        assert not track.frozen
+
+    def test_insert_edit_unfreezes(self, tmp_path):
+        """Verify adding an insert invalidates immediately."""
+        track, _ = _track()
+        track.freeze(cache_dir=str(tmp_path))
+        track.add_insert(FXNode("Extra", lambda x: x))
+        assert not track.frozen
+
+    def test_parameter_edit_changes_engine_output(self, tmp_path):
+        """Verify editing a frozen insert is heard on the next block."""
+        track, gain = _track()
+        node = track.freeze(cache_dir=str(tmp_path), block_size=512)
+        engine = AudioEngine(buffer_size=256)
+        out = OutputNode("Out")
+        for n in (node, out):
+            engine.add_node(n)
+        engine.connect(node, out)
+        source = track.input_node.data
+
+        engine.run_block()
+        assert np.allclose(out.get_input(0), node.data[:, :256])
+        track.set_insert_param(0, "gain", -12.0)
+        assert not track.frozen and node.stale
+        engine.run_block()
+        expected = source[:, 256:512] * 10.0 ** (-12.0 / 20.0) * 0.5
+        assert np.allclose(out.get_input(0), expected, atol=1e-6)
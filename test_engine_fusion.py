@@ -0,0 +1,149 @@
+"""
+DAW Core Engine - Insert Chain Fusion Tests
+
+Tests for running a track's inserts as one node with consecutive linear
+stages fused into a single SOS cascade and channel matrix.
+"""
+
+import numpy as np
+from daw_core.engine import AudioEngine
+from daw_core.fusion import FusedStage, InsertChain
+from daw_core.graph import AudioInput, FXNode, OutputNode
+from daw_core.track import Track
+from daw_core.fx.eq_and_dynamics import EQ3Band, HighLowPass
+from daw_core.fx.modulation_and_utility import Gain, WidthControl
+
+
+def _source(frames=4096, seed=5):
+    return np.random.default_rng(seed).standard_normal((2, frames)) * 0.1
+
+
+def _linear_inserts():
+    hp = HighLowPass()
+    hp.set_cutoff(120)
+    eq = EQ3Band()
+    eq.set_mid_band(4.0, 1500.0, 1.2)
+    gain = Gain()
+    gain.set_gain(-3.0)
+    width = WidthControl()
+    width.set_width(1.5)
+    return hp, eq, gain, width
+
+
+def _reference(audio, hp, eq, gain, width):
+    """The stages one after another, width on the (left, right) rows."""
+    filtered = eq.process(hp.process(audio)) * 10 ** (gain.gain_db / 20.0)
+    mid = (filtered[0] + filtered[1]) / 2
+    side = (filtered[0] - filtered[1]) / 2 * width.width
+    return np.stack((mid + side, mid - side))
+
+
+def _blocks(chain, audio, block=512):
+    return np.concatenate([chain.run(audio[:, i:i + block])
+                           for i in range(0, audio.shape[-1], block)], axis=1)
+
+
+class TestInsertChain:
+    """Test plan building and fused output."""
+
+    def test_linear_run_fused_into_one_stage(self):
+        """Verify four linear inserts become one kernel with the same output."""
+        effects = _linear_inserts()
+        chain = InsertChain("Chain", [FXNode(type(e).__name__, e.process) for e in effects])
+        plan = chain.plan()
+        assert len(plan) == 1 and isinstance(plan[0], FusedStage)
+        assert len(plan[0].filter.sos) == 4  # 2nd-order highpass + 3 EQ bands
+
+        audio = _source()
+        expected = _reference(audio, *_linear_inserts())
+        assert np.allclose(_blocks(chain, audio), expected, atol=1e-9)
+
+    def test_nonlinear_stage_splits_runs_and_bypass_elided(self):
+        """Verify a nonlinear insert breaks the run and bypassed stages vanish."""
+        hp, eq, gain, width = _linear_inserts()
+        clip = FXNode("Clip", np.tanh)
+        nodes = [FXNode("HP", hp.process), clip, FXNode("EQ", eq.process),
+                 FXNode("Gain", gain.process)]
+        chain = InsertChain("Chain", nodes)
+        assert [type(step).__name__ for step in chain.plan()] == ["FusedStage", "FXNode",
+                                                                  "FusedStage"]
+        clip.enabled = False
+        eq.enabled = False
+        plan = chain.plan()
+        assert len(plan) == 1 and len(plan[0].sources) == 1
+
+    def test_refused_on_parameter_change(self):
+        """Verify a parameter edit is picked up on the next block."""
+        hp, eq, gain, width = _linear_inserts()
+        chain = InsertChain("Chain", [FXNode("EQ", eq.process), FXNode("Gain", gain.process)])
+        audio = _source(1024)
+        chain.run(audio)
+        gain.set_gain(6.0)
+        stage = chain.plan()[0]
+        assert stage.sources[0] is eq.sos
+        assert np.allclose(stage.matrix, np.eye(2) * 10 ** (6.0 / 20.0))
+        eq.set_low_band(6.0, 100.0, 0.7)
+        assert chain.plan()[0].sources[0] is eq.sos
+
+    def test_bypass_keeps_fused_state(self):
+        """Verify toggling a member re-fuses the same stage without a click."""
+        hp, eq, gain, width = _linear_inserts()
+        eq_node = FXNode("EQ", eq.process)
+        chain = InsertChain("Chain", [FXNode("HP", hp.process), eq_node])
+        audio = _source(2048)
+        chain.run(audio[:, :1024])
+        stage = chain.plan()[0]
+        state = stage.filter._zi.copy()
+
+        eq_node.enabled = False
+        assert chain.plan()[0] is stage
+        assert np.array_equal(stage.filter._zi[:len(state)], state)
+        out = chain.run(audio[:, 1024:1088])
+        fresh = FusedStage()
+        fresh.update((hp.sos,), None)
+        assert not np.allclose(out, fresh.process(audio[:, 1024:1088]))
+
+    def test_linear_phase_eq_runs_unfused(self):
+        """Verify effects that are not currently IIR are called directly."""
+        eq = EQ3Band()
+        eq.set_phase_mode("linear")
+        chain = InsertChain("Chain", [FXNode("EQ", eq.process)])
+        assert isinstance(chain.plan()[0], FXNode)
+        assert chain.get_latency_samples() == eq.get_latency_samples()
+
+
+class TestTrackFusion:
+    """Test the fused chain inside the engine."""
+
+    def test_engine_output_matches_unfused(self):
+        """Verify a track plays the same with fuse_inserts on."""
+        audio = _source(1024).astype(np.float32)
+        outputs = []
+        for fuse in (False, True):
+            track = Track("t1", "Track")
+            track.input_node = AudioInput("Src", audio)
+            for effect in _linear_inserts():
+                track.add_insert(FXNode(type(effect).__name__, effect.process))
+            track.fuse_inserts = fuse
+            engine = AudioEngine(buffer_size=256)
+            out = OutputNode("Out")
+            chain = track.get_playback_chain()
+            for node in chain + [out]:
+                engine.add_node(node)
+            for src, dst in zip(chain, chain[1:] + [out]):
+                engine.connect(src, dst)
+            blocks = []
+            for _ in range(4):
+                engine.run_block()
+                blocks.append(out.get_input(0).copy())
+            outputs.append(np.concatenate(blocks, axis=1))
+            assert len(chain) == (2 if fuse else 5)
+        assert np.allclose(outputs[0], outputs[1], atol=1e-5)
+
+    def test_width_matches_fused_matrix(self):
+        """Verify WidthControl.process applies the matrix it reports."""
+        width = WidthControl()
+        width.set_width(1.5)
+        audio = _source(256)
+        _, matrix = width.linear_response()
+        assert np.allclose(width.process(audio), matrix @ audio)
@@ -0,0 +1,532 @@
+"""
+DAW Core Engine - Graph Scheduling Tests
+
+Tests for the compiled execution plan, incremental topological ordering,
+connect-time cycle detection, pooled port buffers and edge data flow in
+AudioEngine.
+"""
+
+import pytest
+import numpy as np
+from daw_core.engine import AudioEngine
+from daw_core.graph import Node, AudioInput, FXNode, MixerBus, OutputNode
+
+
+def _assert_valid_order(engine):
+    """Every edge must point forward in the compiled order."""
+    order = engine.get_execution_plan().order
+    position = {node: i for i, node in enumerate(order)}
+    assert len(order) == len(engine.nodes)
+    for src, dsts in engine.graph.items():
+        for dst in dsts:
+            assert position[src] < position[dst]
+
+
+class TestExecutionPlan:
+    """Test the cached execution plan."""
+
+    def test_plan_is_cached_between_blocks(self):
+        """Verify the plan is not rebuilt while the topology is unchanged."""
+        engine = AudioEngine()
+        src = AudioInput("In")
+        fx = FXNode("FX", lambda x: x)
+        out = OutputNode("Out")
+        for node in (src, fx, out):
+            engine.add_node(node)
+        engine.connect(src, fx)
+        engine.connect(fx, out)
+
+        engine.start()
+        for _ in range(10):
+            engine.process_block()
+
+        assert engine.plan_builds == 1
+        assert engine.block_count == 10
+
+    def test_plan_rebuilt_after_topology_change(self):
+        """Verify add/remove/connect invalidate the plan."""
+        engine = AudioEngine()
+        a, b = Node("A"), Node("B")
+        engine.add_node(a)
+        first = engine.get_execution_plan()
+        engine.add_node(b)
+        engine.connect(a, b)
+        second = engine.get_execution_plan()
+
+        assert second is not first
+        assert second.order == [a, b]
+        engine.remove_node(a)
+        assert engine.get_execution_plan().order == [b]
+
+    def test_buffer_table_covers_all_outputs(self):
+        """Verify each output port gets a buffer assignment."""
+        engine = AudioEngine()
+        src = AudioInput("In")
+        bus = MixerBus("Bus", num_inputs=4)
+        out = OutputNode("Out")
+        for node in (src, bus, out):
+            engine.add_node(node)
+
+        plan = engine.get_execution_plan()
+        assert (src, 0) in plan.buffer_table
+        assert (bus, 0) in plan.buffer_table
+        assert plan.num_buffers >= 1
+
+
+class TestIncrementalOrdering:
+    """Test incremental topological order maintenance."""
+
+    def test_backward_edge_reorders_region(self):
+        """Verify an edge against the current order is repaired."""
+        engine = AudioEngine()
+        nodes = [Node(f"N{i}") for i in range(5)]
+        for node in nodes:
+            engine.add_node(node)
+
+        # N4 -> N0 contradicts insertion order
+        engine.connect(nodes[4], nodes[0])
+        engine.connect(nodes[0], nodes[2])
+        engine.connect(nodes[3], nodes[4])
+        _assert_valid_order(engine)
+
+    def test_matches_full_sort_on_random_dag(self):
+        """Verify incremental order is valid for a random DAG."""
+        rng = np.random.default_rng(7)
+        engine = AudioEngine()
+        nodes = [Node(f"N{i}") for i in range(60)]
+        for node in nodes:
+            engine.add_node(node)
+
+        # Random edges from a hidden permutation are always acyclic
+        rank = rng.permutation(len(nodes))
+        for _ in range(200):
+            i, j = rng.integers(0, len(nodes), size=2)
+            if rank[i] < rank[j]:
+                engine.connect(nodes[i], nodes[j])
+
+        _assert_valid_order(engine)
+        assert len(engine.topological_sort()) == len(nodes)
+
+
+class TestCycleDetection:
+    """Test connect-time cycle detection."""
+
+    def test_cycle_rejected_at_connect(self):
+        """Verify connect raises and leaves the graph untouched."""
+        engine = AudioEngine()
+        a, b, c = Node("A"), Node("B"), Node("C")
+        for node in (a, b, c):
+            engine.add_node(node)
+        engine.connect(a, b)
+        engine.connect(b, c)
+
+        with pytest.raises(RuntimeError):
+            engine.connect(c, a)
+
+        assert a not in engine.graph[c]
+        _assert_valid_order(engine)
+
+    def test_self_loop_rejected(self):
+        """Verify a node cannot feed itself."""
+        engine = AudioEngine()
+        a = Node("A")
+        engine.add_node(a)
+        with pytest.raises(RuntimeError):
+            engine.connect(a, a)
+
+
+class TestBufferPool:
+    """Test pooled, preallocated port buffers."""
+
+    def _chain(self, engine, length):
+        src = AudioInput("In", np.full((2, engine.buffer_size), 0.1, dtype=np.float32))
+        nodes = [src] + [FXNode(f"FX{i}", lambda x: x * 0.5) for i in range(length)]
+        nodes.append(OutputNode("Out"))
+        for node in nodes:
+            engine.add_node(node)
+        for a, b in zip(nodes, nodes[1:]):
+            engine.connect(a, b)
+        return nodes
+
+    def test_buffers_sized_from_engine(self):
+        """Verify port buffers use the engine block size and float32."""
+        engine = AudioEngine(buffer_size=256)
+        nodes = self._chain(engine, 2)
+        engine.get_execution_plan()
+        out = nodes[1].get_output(0)
+        assert out.shape == (2, 256)
+        assert out.dtype == np.float32
+
+    def test_chain_reuses_slots(self):
+        """Verify a long serial chain needs only a couple of buffers."""
+        engine = AudioEngine(buffer_size=128)
+        self._chain(engine, 50)
+        plan = engine.get_execution_plan()
+        assert plan.num_buffers <= 3
+        assert engine.buffer_pool.capacity == plan.num_buffers
+
+    def test_live_ranges_do_not_overlap(self):
+        """Verify a node never shares a slot with the output it reads."""
+        engine = AudioEngine(buffer_size=64)
+        nodes = self._chain(engine, 10)
+        plan = engine.get_execution_plan()
+        for a, b in zip(nodes[:-2], nodes[1:-1]):
+            assert plan.buffer_table[(a, 0)] != plan.buffer_table[(b, 0)]
+
+    def test_no_buffer_rebinding_per_block(self):
+        """Verify processing writes into the same preallocated views."""
+        engine = AudioEngine(buffer_size=64)
+        nodes = self._chain(engine, 3)
+        engine.start()
+        engine.process_block()
+        before = [n.get_output(0) for n in nodes[:-1]]
+        engine.process_block()
+        after = [n.get_output(0) for n in nodes[:-1]]
+        assert all(a is b for a, b in zip(before, after))
+
+    def test_buffer_size_change_rebinds(self):
+        """Verify changing buffer_size recompiles the plan."""
+        engine = AudioEngine(buffer_size=64)
+        nodes = self._chain(engine, 1)
+        engine.get_execution_plan()
+        engine.buffer_size = 32
+        engine.get_execution_plan()
+        assert nodes[0].get_output(0).shape == (2, 32)
+
+
+class TestEdgeDataFlow:
+    """Test audio movement along port-level edges."""
+
+    def test_chain_moves_audio(self):
+        """Verify audio reaches the output through an FX chain."""
+        engine = AudioEngine(buffer_size=64)
+        src = AudioInput("In", np.full((2, 64), 0.5, dtype=np.float32))
+        fx = FXNode("Half", lambda x: x * 0.5)
+        out = OutputNode("Out")
+        for node in (src, fx, out):
+            engine.add_node(node)
+        engine.connect(src, fx)
+        engine.connect(fx, out)
+
+        engine.start()
+        engine.process_block()
+        assert np.allclose(fx.get_output(0), 0.25)
+        assert out.peak_level == pytest.approx(0.25)
+
+    def test_single_fan_in_aliases_source(self):
+        """Verify a single-edge input is a zero-copy alias."""
+        engine = AudioEngine(buffer_size=64)
+        src = AudioInput("In")
+        fx = FXNode("FX", lambda x: x)
+        engine.add_node(src)
+        engine.add_node(fx)
+        engine.connect(src, fx)
+        engine.get_execution_plan()
+        assert fx.input_ports[0].buffer is src.output_ports[0].buffer
+
+    def test_multi_fan_in_sums(self):
+        """Verify several edges into one port are summed."""
+        engine = AudioEngine(buffer_size=32)
+        sources = [AudioInput(f"In{i}", np.full((2, 32), 0.1 * (i + 1), dtype=np.float32))
+                   for i in range(3)]
+        probe = FXNode("Probe", lambda x: x)
+        for node in sources + [probe]:
+            engine.add_node(node)
+        for node in sources:
+            engine.connect(node, probe)
+
+        engine.start()
+        engine.process_block()
+        assert np.allclose(probe.get_output(0), 0.6)
+        assert (probe, 0) in engine.get_execution_plan().accumulator_table
+
+    def test_bus_port_routing(self):
+        """Verify sources on separate bus ports are mixed by the bus."""
+        engine = AudioEngine(buffer_size=32)
+        a = AudioInput("A", np.full((2, 32), 0.2, dtype=np.float32))
+        b = AudioInput("B", np.full((2, 32), 0.3, dtype=np.float32))
+        bus = MixerBus("Bus", num_inputs=2)
+        for node in (a, b, bus):
+            engine.add_node(node)
+        engine.connect(a, bus, dst_port=0)
+        engine.connect(b, bus, dst_port=1)
+
+        engine.start()
+        engine.process_block()
+        assert np.allclose(bus.get_output(0), np.tanh(0.5), atol=1e-6)
+
+    def test_disconnect_restores_silence(self):
+        """Verify disconnecting an edge leaves the input silent."""
+        engine = AudioEngine(buffer_size=32)
+        src = AudioInput("In", np.ones((2, 32), dtype=np.float32))
+        fx = FXNode("FX", lambda x: x)
+        engine.add_node(src)
+        engine.add_node(fx)
+        engine.connect(src, fx)
+        engine.disconnect(src, fx)
+
+        engine.start()
+        engine.process_block()
+        assert not np.any(fx.get_output(0))
+        assert fx not in engine.graph[src]
+
+    def test_invalid_port_rejected(self):
+        """Verify connecting to a missing port raises."""
+        engine = AudioEngine()
+        src, fx = AudioInput("In"), FXNode("FX", lambda x: x)
+        engine.add_node(src)
+        engine.add_node(fx)
+        with pytest.raises(IndexError):
+            engine.connect(src, fx, dst_port=3)
+
+
+class TestParallelScheduler:
+    """Test multi-core level scheduling."""
+
+    def _session(self, engine, num_tracks):
+        from scipy.signal import butter, sosfilt
+        sos = butter(4, 0.2, output="sos")
+        rng = np.random.default_rng(3)
+        bus = MixerBus("Master", num_inputs=num_tracks)
+        engine.add_node(bus)
+        for i in range(num_tracks):
+            src = AudioInput(f"In{i}", rng.standard_normal((2, engine.buffer_size)).astype(np.float32) * 0.1)
+            eq = FXNode(f"EQ{i}", lambda x: sosfilt(sos, x, axis=-1))
+            engine.add_node(src)
+            engine.add_node(eq)
+            engine.connect(src, eq)
+            engine.connect(eq, bus, dst_port=i)
+        return bus
+
+    def test_levels_respect_dependencies(self):
+        """Verify levels group independent track nodes together."""
+        engine = AudioEngine(buffer_size=64)
+        self._session(engine, 8)
+        levels = engine.get_execution_plan().levels
+        assert [len(level) for level in levels] == [8, 8, 1]
+
+    def test_parallel_matches_serial(self):
+        """Verify parallel processing gives identical output."""
+        serial = AudioEngine(buffer_size=256)
+        parallel = AudioEngine(buffer_size=256)
+        bus_serial = self._session(serial, 16)
+        bus_parallel = self._session(parallel, 16)
+
+        parallel.enable_parallel(num_workers=4)
+        try:
+            for engine in (serial, parallel):
+                engine.start()
+                for _ in range(3):
+                    engine.process_block()
+            assert np.allclose(bus_serial.get_output(0), bus_parallel.get_output(0))
+
+            stats = parallel.get_stats()["parallel"]
+            assert stats["num_workers"] == 4
+            assert stats["blocks_processed"] == 3
+            assert sum(w["nodes_processed"] for w in stats["workers"]) == 3 * 33
+        finally:
+            parallel.disable_parallel()
+
+    def test_worker_error_propagates(self):
+        """Verify a node exception is raised on the calling thread."""
+        engine = AudioEngine(buffer_size=32)
+
+        def broken(x):
+            raise ValueError("boom")
+
+        src = AudioInput("In", np.ones((2, 32), dtype=np.float32))
+        fx = FXNode("Broken", broken)
+        engine.add_node(src)
+        engine.add_node(fx)
+        engine.connect(src, fx)
+        engine.enable_parallel(num_workers=2)
+        try:
+            engine.start()
+            with pytest.raises(ValueError):
+                engine.process_block()
+        finally:
+            engine.disable_parallel()
+
+
+class TestSilenceSkipping:
+    """Test silence propagation and idle-node sleeping."""
+
+    def _chain(self, engine, data, fx_fn=lambda x: x * 0.5, **fx_kwargs):
+        src = AudioInput("In", data)
+        fx = FXNode("FX", fx_fn, **fx_kwargs)
+        out = OutputNode("Out")
+        for node in (src, fx, out):
+            engine.add_node(node)
+        engine.connect(src, fx)
+        engine.connect(fx, out)
+        return src, fx, out
+
+    def test_silent_branch_is_skipped(self):
+        """Verify nodes downstream of silence do no work."""
+        engine = AudioEngine(buffer_size=64)
+        calls = []
+        self._chain(engine, np.zeros((2, 256), dtype=np.float32),
+                    fx_fn=lambda x: calls.append(1) or x)
+        engine.start()
+        engine.process_block()
+        assert calls == []
+        assert engine.get_stats()["nodes_skipped_last_block"] == 2
+
+    def test_tail_keeps_node_running(self):
+        """Verify a node with a tail keeps processing after input stops."""
+        engine = AudioEngine(buffer_size=64)
+        data = np.zeros((2, 1024), dtype=np.float32)
+        data[:, :64] = 1.0
+        _, fx, _ = self._chain(engine, data, tail_samples=128)
+        engine.start()
+        processed = []
+        for _ in range(6):
+            before = engine.nodes_skipped
+            engine.process_block()
+            processed.append(engine.nodes_skipped == before)
+        # block 0 has input, blocks 1-2 render the tail, then sleep
+        assert processed == [True, True, True, False, False, False]
+        assert not np.any(fx.get_output(0))
+
+    def test_sleeping_node_input_is_silent(self):
+        """Verify a summed input reads zeros once its sources have ended."""
+        engine = AudioEngine(buffer_size=64)
+        sources = [AudioInput(f"In{i}", np.full((2, 64), 0.25 * (i + 1), dtype=np.float32))
+                   for i in range(2)]
+        out = OutputNode("Out")
+        for node in sources + [out]:
+            engine.add_node(node)
+        for node in sources:
+            engine.connect(node, out)
+        engine.start()
+        engine.process_block()
+        assert np.allclose(out.get_input(0), 0.75)
+        engine.process_block()
+        assert out.silent and not np.any(out.get_input(0))
+
+    def test_effect_tails_declared(self):
+        """Verify reverb/delay tails are picked up from bound fx functions."""
+        from daw_core.fx.reverb import Reverb
+        from daw_core.fx.delays import SimpleDelay
+        from daw_core.fx.modulation_and_utility import Gain
+
+        reverb = Reverb()
+        small = reverb.get_tail_samples()
+        reverb.set_room_size(1.0)
+        assert reverb.get_tail_samples() > small > 0
+
+        delay = SimpleDelay()
+        delay.set_feedback(0.0)
+        no_feedback = delay.get_tail_samples()
+        delay.set_feedback(0.9)
+        assert delay.get_tail_samples() > no_feedback
+
+        assert FXNode("Verb", reverb.process).get_tail_samples() == reverb.get_tail_samples()
+        assert FXNode("Gain", Gain().process).get_tail_samples() == 0
+
+    def test_latency_accumulates_along_paths(self):
+        """Verify engine latency is the worst path through lookahead effects."""
+        from daw_core.fx.dynamics_part2 import LookaheadLimiter
+
+        engine = AudioEngine(buffer_size=64)
+        limiter = LookaheadLimiter()
+        src, fx, out = self._chain(engine, np.zeros((2, 256), dtype=np.float32),
+                                   fx_fn=limiter.process)
+        dry = FXNode("Dry", lambda x: x)
+        engine.add_node(dry)
+        engine.connect(src, dry)
+        engine.connect(dry, out)
+        latency = limiter.get_latency_samples()
+        assert latency > 0
+        assert engine.get_latency(dry) == 0
+        assert engine.get_latency(out) == engine.get_latency() == latency
+
+    def test_muted_track_pruned_unless_sent(self):
+        """Verify muting prunes a track's chain unless a send is active."""
+        from daw_core.track import Track
+        engine = AudioEngine(buffer_size=64)
+        track = Track("t1", "Track")
+        src, fx, out = self._chain(engine, np.ones((2, 512), dtype=np.float32))
+        track.input_node = src
+        track.add_insert(fx)
+
+        track.set_muted(True)
+        assert src.pruned and fx.pruned
+        engine.start()
+        engine.process_block()
+        assert engine.nodes_skipped_last_block == 3
+        assert src.position == 64  # pruned sources keep streaming time
+
+        track.add_send("fx_return", level_db=-6.0)
+        assert not src.pruned
+        engine.process_block()
+        assert engine.nodes_skipped_last_block == 0
+
+
+class TestProfiling:
+    """Test per-node timing and xrun instrumentation."""
+
+    def _engine(self, buffer_size=64):
+        engine = AudioEngine(buffer_size=buffer_size)
+        src = AudioInput("In", np.ones((2, 64 * 100), dtype=np.float32))
+        fast = FXNode("Fast", lambda x: x)
+        out = OutputNode("Out")
+        for node in (src, fast, out):
+            engine.add_node(node)
+        engine.connect(src, fast)
+        engine.connect(fast, out)
+        return engine, fast
+
+    def test_node_percentiles_reported(self):
+        """Verify every node gets p50/p99 timings."""
+        engine, _ = self._engine()
+        for _ in range(20):
+            engine.run_block()
+        profile = engine.get_profile(histograms=True)
+        assert set(profile["nodes"]) == {"In", "Fast", "Out"}
+        stats = profile["nodes"]["Fast"]
+        assert stats["samples"] == 20
+        assert 0 < stats["p50_us"] <= stats["p99_us"] <= stats["max_us"]
+        assert profile["deadline_us"] == pytest.approx(64 / 44100 * 1e6, rel=1e-3)
+        assert sum(b["count"] for b in profile["histograms"]["Fast"]) == 20
+
+    def test_sampling_one_in_n(self):
+        """Verify nodes are only timed on sampled blocks."""
+        engine, _ = self._engine()
+        engine.set_profile_sampling(4)
+        for _ in range(20):
+            engine.run_block()
+        profile = engine.get_profile()
+        assert profile["blocks"] == 20
+        assert profile["sampled_blocks"] == 5
+        assert profile["nodes"]["Fast"]["samples"] == 5
+
+    def test_xrun_counted_and_blamed(self):
+        """Verify an overrunning node triggers xruns and tops the offenders."""
+        import time
+        engine, fast = self._engine(buffer_size=64)
+        slow = FXNode("Slow", lambda x: time.sleep(0.003) or x)
+        engine.add_node(slow)
+        engine.connect(fast, slow)
+        for _ in range(3):
+            engine.run_block()
+        profile = engine.get_profile()
+        assert profile["xruns"] == 3
+        assert engine.get_stats()["xruns"] == 3
+        assert profile["top_offenders"][0]["node"] == "Slow"
+        assert profile["top_offenders"][0]["xruns_blamed"] == 3
+
+    def test_duplicate_names_and_removed_nodes(self):
+        """Verify same-named nodes are reported apart and removed ones dropped."""
+        engine, fast = self._engine()
+        twin = FXNode("Fast", lambda x: x)
+        engine.add_node(twin)
+        engine.connect(fast, twin)
+        engine.run_block()
+        profile = engine.get_profile(histograms=True)
+        assert set(profile["nodes"]) == {"In", "Fast", "Fast #2", "Out"}
+        assert "Fast #2" in profile["histograms"]
+
+        engine.remove_node(twin)
+        assert twin not in engine.profiler.node_times
+        assert set(engine.get_profile()["nodes"]) == {"In", "Fast", "Out"}
@@ -0,0 +1,142 @@
+"""
+DAW Core Engine - Mixer Engine Tests
+
+Tests for the vectorized N-track mixer: fader/pan/mute/solo/phase gains,
+routing and sends as one matrix multiply, and sample-accurate fader changes.
+"""
+
+import numpy as np
+from daw_core.engine import AudioEngine
+from daw_core.graph import AudioInput, MixerBus, OutputNode
+from daw_core.mixer import MixerEngine
+from daw_core.track import Track
+
+
+def _session(num_tracks=4, frames=256, seed=3):
+    rng = np.random.default_rng(seed)
+    tracks = []
+    for i in range(num_tracks):
+        track = Track(f"t{i}", f"Track {i}")
+        track.input_node = AudioInput(
+            f"Src {i}", rng.standard_normal((2, frames)).astype(np.float32) * 0.1
+        )
+        tracks.append(track)
+    return tracks
+
+
+def _run(tracks, buses=("master",), block=256):
+    engine = AudioEngine(buffer_size=block)
+    for track in tracks:
+        engine.add_node(track.input_node)
+    mixer = MixerEngine("Mixer", tracks, buses)
+    mixer.connect_tracks(engine)
+    outs = {}
+    for bus_id in buses:
+        outs[bus_id] = OutputNode(bus_id)
+        engine.add_node(outs[bus_id])
+        engine.connect(mixer, outs[bus_id], src_port=mixer.bus_port(bus_id))
+    engine.run_block()
+    return {bus_id: out.get_input(0).copy() for bus_id, out in outs.items()}
+
+
+def _reference(track):
+    """Source through the Track's own fader function."""
+    return track._make_fader_fn()(track.input_node.data)
+
+
+class TestMixerEngine:
+    """Test the vectorized mixer against the per-track fader path."""
+
+    def test_matches_per_track_faders(self):
+        """Verify volume, pan, mute and phase flip match Track's fader."""
+        tracks = _session()
+        tracks[0].set_volume(-6.0)
+        tracks[1].set_pan(-0.5)
+        tracks[2].set_muted(True)
+        tracks[3].set_phase_flip(True)
+        expected = sum(_reference(t) for t in tracks)
+        mixed = _run(tracks)["master"]
+        assert np.allclose(mixed, expected, atol=1e-5)
+
+    def test_solo_silences_other_tracks(self):
+        """Verify soloing leaves only soloed tracks audible."""
+        tracks = _session()
+        tracks[1].set_soloed(True)
+        mixed = _run(tracks)["master"]
+        assert np.allclose(mixed, _reference(tracks[1]), atol=1e-5)
+
+    def test_routing_and_sends(self):
+        """Verify output routing and pre/post-fader sends reach their buses."""
+        tracks = _session(num_tracks=3)
+        tracks[0].set_volume(-12.0)
+        tracks[0].add_send("fx", level_db=-6.0, pre_fader=True)
+        tracks[1].add_send("fx", level_db=0.0, pre_fader=False)
+        tracks[2].output_routing = "fx"
+        out = _run(tracks, buses=("master", "fx"))
+
+        level = 10.0 ** (-6.0 / 20.0)
+        master = _reference(tracks[0]) + _reference(tracks[1])
+        fx = (tracks[0].input_node.data * level + _reference(tracks[1])
+              + _reference(tracks[2]))
+        assert np.allclose(out["master"], master, atol=1e-5)
+        assert np.allclose(out["fx"], fx, atol=1e-5)
+
+    def test_sample_accurate_fader_change(self):
+        """Verify queued fader changes split the block like the fader node."""
+        tracks = _session(num_tracks=2)
+        tracks[0].apply_event("volume", -20.0, offset=100)
+        tracks[0].add_send("fx", level_db=0.0, pre_fader=True)
+        out = _run(tracks, buses=("master", "fx"))
+
+        src = tracks[0].input_node.data
+        expected = np.array(src) * np.sqrt(0.5)
+        expected[:, 100:] *= 10.0 ** (-20.0 / 20.0)
+        expected += _reference(tracks[1])
+        assert np.allclose(out["master"], expected, atol=1e-5)
+        assert np.allclose(out["fx"], src, atol=1e-5)
+        assert tracks[0].volume == -20.0
+
+    def test_fader_change_settled_while_silent(self):
+        """Verify a sleeping mixer applies queued changes instead of keeping them."""
+        tracks = _session(num_tracks=2)
+        for track in tracks:
+            track.input_node.data[:] = 0.0
+        tracks[0].apply_event("volume", -20.0, offset=100)
+        out = _run(tracks)
+        assert not np.any(out["master"])
+        assert tracks[0].volume == -20.0 and not tracks[0]._fader_changes
+
+    def test_connected_tracks_use_engine_queue(self):
+        """Verify connect_tracks routes fader changes through the engine queue."""
+        tracks = _session(num_tracks=2)
+        engine = AudioEngine(buffer_size=256)
+        for track in tracks:
+            engine.add_node(track.input_node)
+        MixerEngine("Mixer", tracks, ("master",)).connect_tracks(engine)
+        assert all(t.event_queue is engine.parameter_events for t in tracks)
+        tracks[0].set_volume(-6.0)
+        assert tracks[0].volume == 0.0
+        engine.run_block()
+        assert tracks[0].volume == -6.0
+
+    def test_many_tracks(self):
+        """Verify a 128-track session sums correctly."""
+        tracks = _session(num_tracks=128, frames=128)
+        for i, track in enumerate(tracks):
+            track.set_volume(-float(i % 12))
+            track.set_pan((i % 9 - 4) / 4.0)
+        expected = sum(_reference(t) for t in tracks)
+        mixed = _run(tracks, block=128)["master"]
+        assert np.allclose(mixed, expected, atol=1e-4)
+
+
+class TestMixerBus:
+    """Test the stacked MixerBus sum."""
+
+    def test_bus_sums_inputs(self):
+        """Verify every input port is summed before gain and clipping."""
+        bus = MixerBus("Bus", num_inputs=3)
+        for i, port in enumerate(bus.input_ports):
+            port.buffer[:] = 0.1 * (i + 1)
+        bus.process()
+        assert np.allclose(bus.get_output(0), np.tanh(0.6))
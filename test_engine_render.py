@@ -0,0 +1,103 @@
+"""
+DAW Core Engine - Offline Render Tests
+
+Tests for faster-than-realtime bouncing of the engine output to disk.
+"""
+
+import pytest
+import numpy as np
+
+sf = pytest.importorskip("soundfile")
+
+from daw_core.engine import AudioEngine
+from daw_core.graph import AudioInput, FXNode, OutputNode
+from daw_core.render import OfflineRenderer, start_render_job
+
+
+def _session(length, buffer_size=256, gain=0.5):
+    """Ramp source -> gain -> output."""
+    engine = AudioEngine(sample_rate=44100, buffer_size=buffer_size)
+    ramp = np.linspace(-0.5, 0.5, length, dtype=np.float32)
+    src = AudioInput("In", np.stack([ramp, -ramp]))
+    fx = FXNode("Gain", lambda x: x * gain)
+    out = OutputNode("Out")
+    for node in (src, fx, out):
+        engine.add_node(node)
+    engine.connect(src, fx)
+    engine.connect(fx, out)
+    return engine, ramp * gain
+
+
+class TestOfflineRender:
+    """Test OfflineRenderer."""
+
+    def test_full_session_render(self, tmp_path):
+        """Verify the whole session is written sample-accurately."""
+        engine, expected = _session(1000)
+        path = str(tmp_path / "mix.wav")
+        result = OfflineRenderer(engine).render(path, subtype="FLOAT")
+
+        data, sr = sf.read(path, dtype="float32")
+        assert sr == 44100
+        assert data.shape == (1000, 2)
+        assert np.allclose(data[:, 0], expected, atol=1e-6)
+        assert np.allclose(data[:, 1], -expected, atol=1e-6)
+        assert result["frames"] == 1000
+        assert result["realtime_factor"] > 1.0
+
+    def test_range_in_samples_and_seconds(self, tmp_path):
+        """Verify start/end select the same range in either unit."""
+        engine, expected = _session(44100)
+        renderer = OfflineRenderer(engine)
+        a = str(tmp_path / "a.wav")
+        b = str(tmp_path / "b.wav")
+        renderer.render(a, start=4410, end=8820, subtype="FLOAT")
+        renderer.render(b, start=0.1, end=0.2, unit="seconds", subtype="FLOAT")
+
+        data_a, _ = sf.read(a, dtype="float32")
+        data_b, _ = sf.read(b, dtype="float32")
+        assert len(data_a) == 4410
+        assert np.array_equal(data_a, data_b)
+        assert np.allclose(data_a[:, 0], expected[4410:8820], atol=1e-6)
+
+    def test_tail_after_summed_sources_is_silent(self, tmp_path):
+        """Verify a fan-in output renders zeros after its sources end."""
+        engine = AudioEngine(sample_rate=44100, buffer_size=256)
+        sources = [AudioInput(f"In{i}", np.full((2, 256), 0.25, dtype=np.float32))
+                   for i in range(2)]
+        out = OutputNode("Out")
+        for node in sources + [out]:
+            engine.add_node(node)
+        for node in sources:
+            engine.connect(node, out)
+        path = str(tmp_path / "tail.wav")
+        OfflineRenderer(engine).render(path, end=2048, subtype="FLOAT")
+
+        data, _ = sf.read(path, dtype="float32")
+        assert np.allclose(data[:256], 0.5)
+        assert not np.any(data[256:])
+
+    def test_flac_from_extension(self, tmp_path):
+        """Verify .flac paths are written as FLAC."""
+        engine, _ = _session(512)
+        path = str(tmp_path / "mix.flac")
+        result = OfflineRenderer(engine).render(path, subtype="PCM_16")
+        assert result["format"] == "FLAC"
+        assert sf.info(path).format == "FLAC"
+
+    def test_running_engine_rejected(self, tmp_path):
+        """Verify a realtime engine cannot be bounced concurrently."""
+        engine, _ = _session(512)
+        engine.start()
+        with pytest.raises(RuntimeError):
+            OfflineRenderer(engine).render(str(tmp_path / "mix.wav"))
+
+    def test_background_job_progress(self, tmp_path):
+        """Verify a render job reports completion and progress."""
+        engine, _ = _session(8192)
+        job = start_render_job(engine, str(tmp_path / "mix.wav"))
+        assert job.wait(timeout=10)
+        status = job.get_status()
+        assert status["status"] == "done"
+        assert status["progress"] == pytest.approx(1.0)
+        assert status["result"]["frames"] == 8192
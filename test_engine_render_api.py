@@ -0,0 +1,108 @@
+"""
+DAW Core Engine - Render API Tests
+
+Tests for the /engine/render routes: output confined to the render
+directory, one user of the engine at a time, and no xruns from offline
+blocks.
+"""
+
+import threading
+import time
+
+import pytest
+import numpy as np
+
+pytest.importorskip("soundfile")
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+
+import daw_core.api as api
+from daw_core.engine import AudioEngine
+from daw_core.graph import AudioInput, FXNode, OutputNode
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    engine = AudioEngine(sample_rate=44100, buffer_size=256)
+    monkeypatch.setattr(api, "audio_engine", engine)
+    monkeypatch.setattr(api, "render_jobs", {})
+    monkeypatch.setattr(api, "RENDER_DIR", str(tmp_path / "renders"))
+    return TestClient(api.app), engine
+
+
+def _session(engine, fx_fn=lambda x: x * 0.5, length=4096):
+    src = AudioInput("In", np.full((2, length), 0.25, dtype=np.float32))
+    fx = FXNode("FX", fx_fn)
+    out = OutputNode("Out")
+    for node in (src, fx, out):
+        engine.add_node(node)
+    engine.connect(src, fx)
+    engine.connect(fx, out)
+
+
+def _wait(client, job_id):
+    for _ in range(500):
+        status = client.get(f"/engine/render/{job_id}").json()
+        if status["status"] not in ("pending", "running"):
+            return status
+        time.sleep(0.01)
+    raise AssertionError("render did not finish")
+
+
+class TestRenderAPI:
+    """Test the render routes."""
+
+    def test_render_written_inside_render_dir(self, client, tmp_path):
+        """Verify relative names land in RENDER_DIR and escapes are refused."""
+        http, engine = client
+        _session(engine)
+        response = http.post("/engine/render", json={"path": "mixes/mix.wav"})
+        assert response.status_code == 200
+        status = _wait(http, response.json()["job_id"])
+        assert status["status"] == "done"
+        assert (tmp_path / "renders" / "mixes" / "mix.wav").exists()
+
+        for path in ("../escape.wav", str(tmp_path / "abs.wav"), "mix.txt", "."):
+            assert http.post("/engine/render", json={"path": path}).status_code == 400
+        assert not (tmp_path / "escape.wav").exists()
+
+    def test_one_engine_user_at_a_time(self, client):
+        """Verify renders and engine start are refused while the engine is busy."""
+        http, engine = client
+        gate = threading.Event()
+        _session(engine, fx_fn=lambda x: gate.wait(5) and x)
+        job_id = http.post("/engine/render", json={"path": "a.wav"}).json()["job_id"]
+
+        assert http.post("/engine/render", json={"path": "b.wav"}).status_code == 409
+        assert http.post("/engine/start").status_code == 409
+        assert not engine.is_running
+
+        gate.set()
+        assert _wait(http, job_id)["status"] == "done"
+        assert http.post("/engine/start").status_code == 200
+        assert http.post("/engine/render", json={"path": "c.wav"}).status_code == 409
+
+    def test_offline_blocks_not_counted_as_xruns(self, client):
+        """Verify blocks far slower than realtime do not register xruns."""
+        http, engine = client
+        _session(engine, fx_fn=lambda x: time.sleep(0.01) or x, length=1024)
+        job_id = http.post("/engine/render", json={"path": "slow.wav"}).json()["job_id"]
+        assert _wait(http, job_id)["status"] == "done"
+        assert engine.profiler.xruns == 0
+
+        engine.seek(0)
+        engine.run_block()  # the same block outside a render misses its deadline
+        assert engine.profiler.xruns == 1
+
+    def test_finished_jobs_evicted(self, client, monkeypatch):
+        """Verify only the most recent finished jobs are kept."""
+        http, engine = client
+        monkeypatch.setattr(api, "MAX_FINISHED_RENDER_JOBS", 2)
+        _session(engine, length=256)
+        job_ids = []
+        for i in range(4):
+            job_id = http.post("/engine/render", json={"path": f"{i}.wav"}).json()["job_id"]
+            assert _wait(http, job_id)["status"] == "done"
+            job_ids.append(job_id)
+        assert list(api.render_jobs) == job_ids[1:]
+        assert http.get(f"/engine/render/{job_ids[0]}").status_code == 404
@@ -0,0 +1,151 @@
+"""
+DAW Core Engine - Send/Return Tests
+
+Tests for compiling Router routing and track sends into an AudioEngine
+graph with shared aux returns.
+"""
+
+import pytest
+import numpy as np
+from daw_core.engine import AudioEngine
+from daw_core.graph import AudioInput, FXNode, MixerBus
+from daw_core.mixer import MixerEngine
+from daw_core.routing import Router
+from daw_core.track import Track
+
+
+def _router(num_tracks=3, length=512):
+    """Source tracks with pre/post-fader sends into one shared return."""
+    rng = np.random.default_rng(9)
+    router = Router()
+    for i in range(num_tracks):
+        track = Track(f"t{i}", f"Track {i}")
+        track.input_node = AudioInput(
+            f"Src {i}", rng.standard_normal((2, length)).astype(np.float32) * 0.05
+        )
+        track.add_send("verb", level_db=-6.0, pre_fader=(i == 0))
+        track.set_volume(-3.0 * i)
+        router.add_track(track)
+    verb = Track("verb", "Verb Return", track_type="aux")
+    verb.add_insert(FXNode("Shared Verb", lambda x: x * 0.25))
+    router.add_track(verb)
+    return router
+
+
+def _fader(track, signal):
+    return track._make_fader_fn()(signal)
+
+
+class TestSendReturn:
+    """Test the compiled send/return graph."""
+
+    def test_levels_follow_sends(self):
+        """Verify returns are mixed after the tracks sending to them."""
+        router = _router()
+        assert router.get_track_levels() == [["t0", "t1", "t2"], ["verb"]]
+
+    def test_shared_return_output(self):
+        """Verify master carries dry tracks plus the shared return."""
+        router = _router()
+        engine = AudioEngine(buffer_size=512)
+        out = router.build_graph(engine)
+        engine.run_block()
+
+        level = 10.0 ** (-6.0 / 20.0)
+        dry = np.zeros((2, 512))
+        sent = np.zeros((2, 512))
+        for i in range(3):
+            track = router.tracks[f"t{i}"]
+            src = track.input_node.data
+            dry += _fader(track, src)
+            sent += level * (src if i == 0 else _fader(track, src))
+        wet = _fader(router.tracks["verb"], sent * 0.25)
+        assert np.allclose(out.get_input(0), np.tanh(dry + wet), atol=1e-5)
+
+    def test_one_mixer_per_level(self):
+        """Verify all sends to the return come from a single mixer output."""
+        router = _router(num_tracks=40)
+        engine = AudioEngine(buffer_size=512)
+        router.build_graph(engine)
+        mixers = [n for n in engine.nodes if isinstance(n, MixerEngine)]
+        assert len(mixers) == 2
+        verb_return = router.tracks["verb"].return_node
+        feeding = [e for e in engine.edges if e[2] is verb_return]
+        assert len(feeding) == 1 and feeding[0][0] is mixers[0]
+
+    def test_pre_fader_tap_is_a_view(self):
+        """Verify the mixer reads the chain output buffer without a copy."""
+        router = _router()
+        engine = AudioEngine(buffer_size=512)
+        router.build_graph(engine)
+        engine.get_execution_plan()
+        mixer = next(n for n in engine.nodes if isinstance(n, MixerEngine) and "t0" in
+                     [t.id for t in n.tracks])
+        src = router.tracks["t0"].input_node
+        assert np.shares_memory(mixer.get_input(0), src.get_output(0))
+
+    def test_buses_and_routing_matrix(self):
+        """Verify routing matrix destinations reach their bus."""
+        router = _router(num_tracks=2)
+        router.add_bus("drums", MixerBus("Drums", num_inputs=1))
+        router.route_track("t1", "drums")
+        engine = AudioEngine(buffer_size=512)
+        router.build_graph(engine)
+        engine.run_block()
+        track = router.tracks["t1"]
+        expected = np.tanh(_fader(track, track.input_node.data))
+        assert np.allclose(router.buses["drums"].get_output(0), expected, atol=1e-5)
+
+    def test_rebuild_drops_unused_return(self):
+        """Verify a track whose last send was removed loses its return node."""
+        router = _router()
+        router.build_graph(AudioEngine(buffer_size=512))
+        verb = router.tracks["verb"]
+        assert verb.get_playback_chain()[0] is verb.return_node
+
+        for i in range(3):
+            router.tracks[f"t{i}"].remove_send("verb")
+        router.build_graph(AudioEngine(buffer_size=512))
+        assert verb.return_node is None
+        assert verb.get_playback_chain() == verb.inserts
+
+    def test_rebuild_into_same_engine(self):
+        """Verify building twice replaces the first build instead of adding to it."""
+        router = _router()
+        engine = AudioEngine(buffer_size=512)
+        out = router.build_graph(engine)
+        engine.run_block()
+        expected = out.get_input(0).copy()
+
+        router.build_graph(engine, output=out)
+        assert len([n for n in engine.nodes if isinstance(n, MixerEngine)]) == 2
+        assert len([n for n in engine.nodes if n.name == "Verb Return Return"]) == 1
+        engine.seek(0)
+        engine.run_block()
+        assert np.allclose(out.get_input(0), expected, atol=1e-6)
+
+    def test_frozen_return_unfrozen(self, tmp_path):
+        """Verify a frozen track receiving sends goes back to its live chain."""
+        router = _router()
+        verb = router.tracks["verb"]
+        verb.input_node = AudioInput("Verb Src", np.zeros((2, 512), dtype=np.float32))
+        verb.freeze(cache_dir=str(tmp_path))
+        engine = AudioEngine(buffer_size=512)
+        router.build_graph(engine)
+        assert not verb.frozen
+        assert verb.return_node in engine.nodes
+
+    def test_connect_unknown_node_rejected(self):
+        """Verify connecting a node that is not in the engine raises."""
+        engine = AudioEngine(buffer_size=512)
+        src = AudioInput("In", np.zeros((2, 512), dtype=np.float32))
+        engine.add_node(src)
+        with pytest.raises(ValueError):
+            engine.connect(src, FXNode("Stray", lambda x: x))
+
+    def test_send_cycle_rejected(self):
+        """Verify sends that loop back are reported."""
+        router = _router(num_tracks=1)
+        router.tracks["verb"].add_send("t0")
+        with pytest.raises(RuntimeError):
+            router.get_track_levels()
@@ -0,0 +1,89 @@
+"""
+DAW Core Engine - Stem Export Tests
+
+Tests for partitioning a Router session into per-stem subgraphs and
+rendering them in a process pool.
+"""
+
+import pytest
+import numpy as np
+
+sf = pytest.importorskip("soundfile")
+
+from daw_core.engine import AudioEngine
+from daw_core.graph import AudioInput, FXNode
+from daw_core.routing import Router
+from daw_core.track import Track
+from daw_core.stems import StemExporter, build_stem_graph, stem_dependencies
+from daw_core.render import OfflineRenderer
+
+
+def _router(length=2048):
+    """Two source tracks routed into an aux, one of them with a send."""
+    rng = np.random.default_rng(5)
+    router = Router()
+    for i in range(2):
+        track = Track(f"t{i}", f"Track {i}")
+        track.input_node = AudioInput(
+            f"Track {i}", rng.standard_normal((2, length)).astype(np.float32) * 0.1
+        )
+        track.add_insert(FXNode(f"Half {i}", lambda x: x * 0.5))
+        router.add_track(track)
+    router.add_track(Track("fx", "FX Return", track_type="aux"))
+    router.add_track(Track("aux", "Drum Bus", track_type="aux"))
+    router.route_track("t0", "aux")
+    router.route_track("t1", "aux")
+    router.tracks["t1"].add_send("fx", level_db=-6.0, pre_fader=True)
+    router.tracks["t1"].set_volume(-3.0)
+    return router
+
+
+class TestStemPartition:
+    """Test per-stem subgraph construction."""
+
+    def test_dependencies_follow_routing_and_sends(self):
+        """Verify each stem only pulls in the tracks that reach it."""
+        router = _router()
+        assert stem_dependencies(router, "t0") == ["t0"]
+        assert sorted(stem_dependencies(router, "aux")) == ["aux", "t0", "t1"]
+        assert sorted(stem_dependencies(router, "fx")) == ["fx", "t1"]
+
+    def test_send_stem_is_scaled_prefader(self, tmp_path):
+        """Verify a pre-fader send ignores the source's fader."""
+        router = _router()
+        engine = AudioEngine(buffer_size=256)
+        source = router.tracks["t1"].input_node.data
+        out = build_stem_graph(router, "fx", {"t1": source}, engine)
+        path = str(tmp_path / "fx.wav")
+        OfflineRenderer(engine, out).render(path, end=source.shape[-1], subtype="FLOAT")
+
+        data, _ = sf.read(path, dtype="float32")
+        expected = source * 0.5 * 10.0 ** (-6.0 / 20.0) * np.sqrt(0.5)
+        assert np.allclose(data.T, expected, atol=1e-6)
+
+
+class TestStemExport:
+    """Test process-pool stem rendering."""
+
+    def test_export_all_stems(self, tmp_path):
+        """Verify every stem is written and the aux sums its inputs."""
+        router = _router()
+        job = StemExporter(router, buffer_size=512, max_workers=2).export(
+            str(tmp_path), subtype="FLOAT"
+        )
+        results = job.results(timeout=60)
+        assert set(results) == {"t0", "t1", "fx", "aux"}
+
+        progress = job.get_progress()
+        assert all(p["status"] == "done" and p["progress"] == 1.0 for p in progress.values())
+
+        t0, _ = sf.read(str(tmp_path / "t0.wav"), dtype="float32")
+        t1, _ = sf.read(str(tmp_path / "t1.wav"), dtype="float32")
+        aux, _ = sf.read(str(tmp_path / "aux.wav"), dtype="float32")
+        assert aux.shape == (2048, 2)
+        assert np.allclose(aux, (t0 + t1) * np.sqrt(0.5), atol=1e-5)
+
+    def test_unknown_stem_rejected(self, tmp_path):
+        """Verify requesting a missing stem raises before spawning workers."""
+        with pytest.raises(KeyError):
+            StemExporter(_router()).export(str(tmp_path), stems=["nope"])
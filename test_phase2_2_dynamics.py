@@ -5,7 +5,13 @@ Validates Limiter, Expander, Gate, and NoiseGate implementations.
 """
 
 import numpy as np
-from daw_core.fx.dynamics_part2 import Limiter, Expander, Gate, NoiseGate
+from scipy.signal import butter, resample_poly, sosfilt
+from daw_core.fx.dynamics_part2 import (
+    Limiter, LookaheadLimiter, MultibandCompressor, Expander, Gate, NoiseGate,
+)
+from daw_core.fx.eq_and_dynamics import Compressor
+from daw_core.fx.dynamics_core import GainReductionHistory, sliding_max, smooth_envelope
+from daw_core.fx.multiband import Crossover, linkwitz_riley
 
 
 def test_limiter():
@@ -238,6 +244,135 @@ def test_serialization():
     print(f"  ✓ All effects serializable")
 
 
+
+def _bursts(num_samples=8000, seed=0):
+    """Stereo noise with bursts well above and below typical thresholds."""
+    rng = np.random.default_rng(seed)
+    level = np.repeat(rng.uniform(0, 1, num_samples // 200) ** 3, 200)
+    return (rng.standard_normal((2, num_samples)) * level).astype(np.float32)
+
+
+def test_block_size_independence():
+    """Test envelope, hold and hysteresis state carry across blocks."""
+    signal = _bursts()
+    for make in (Compressor, Expander, Gate, NoiseGate):
+        whole, split = make(), make()
+        for fx in (whole, split):
+            if hasattr(fx, "set_threshold"):
+                fx.set_threshold(-12)
+            if hasattr(fx, "set_hold"):
+                fx.set_hold(5)
+        expected = whole.process(signal)
+        chunks = [split.process(signal[:, i:i + 333]) for i in range(0, signal.shape[1], 333)]
+        assert np.allclose(np.concatenate(chunks, axis=1), expected, atol=1e-6), make.__name__
+        assert split.envelope == whole.envelope
+
+
+def test_gate_hold_matches_reference():
+    """Test the vectorized gate against the per-sample hold logic."""
+    gate = Gate()
+    gate.set_threshold(-12)
+    gate.set_hold(2)
+    signal = _bursts(seed=1)
+    out = gate.process(signal)
+
+    attack = 1.0 - np.exp(-1.0 / (gate.attack / 1000.0 * gate.sample_rate))
+    release = 1.0 - np.exp(-1.0 / (gate.release / 1000.0 * gate.sample_rate))
+    level_db = 20.0 * np.log10(np.maximum(np.abs(signal).max(axis=0), 1e-6))
+    envelope = smooth_envelope(level_db, 0.0, attack, release)
+    hold_samples = int(gate.hold / 1000.0 * gate.sample_rate)
+    hold, expected_open = 0, []
+    for env in envelope:
+        if env > gate.threshold:
+            hold = hold_samples
+            expected_open.append(True)
+        elif hold > 0:
+            hold -= 1
+            expected_open.append(True)
+        else:
+            expected_open.append(False)
+    assert np.array_equal(out != 0, signal * np.array(expected_open) != 0)
+    assert gate.hold_counter == hold
+
+
+def test_gain_reduction_history_ring():
+    """Test the history keeps only the newest values in order."""
+    history = GainReductionHistory(capacity=5)
+    history.extend(np.arange(3.0))
+    history.append(3.0)
+    history.extend(np.arange(4.0, 7.0))
+    assert len(history) == 5
+    assert list(history) == [2.0, 3.0, 4.0, 5.0, 6.0]
+    assert np.max(history) == 6.0
+
+    limiter = Limiter()
+    limiter.process(np.ones(20000) * 0.99)
+    assert len(limiter.gr_history) == 10000
+
+
+def test_sliding_max():
+    """Test the O(1) sliding maximum against a direct window scan."""
+    values = np.random.default_rng(4).standard_normal(1000)
+    for window in (1, 2, 7, 64, 1000):
+        expected = np.lib.stride_tricks.sliding_window_view(values, window).max(axis=1)
+        assert np.array_equal(sliding_max(values, window), expected)
+
+
+def test_lookahead_limiter_true_peak_ceiling():
+    """Test block-wise output stays under the ceiling, including inter-sample peaks."""
+    sr = 96000
+    rng = np.random.default_rng(5)
+    signal = sosfilt(butter(8, 20000, fs=sr, output="sos"), rng.standard_normal((2, sr)) * 2.0)
+    limiter = LookaheadLimiter(sample_rate=sr)
+    limiter.set_ceiling(-1.0)
+    out = np.concatenate([limiter.process(signal[:, i:i + 1000])
+                          for i in range(0, signal.shape[1], 1000)], axis=1)
+    true_peak_db = 20 * np.log10(np.abs(resample_poly(out, 8, 1, axis=1)).max())
+    assert true_peak_db <= -0.9
+    assert limiter.get_gain_reduction() > 0
+
+
+def test_lookahead_limiter_latency():
+    """Test quiet material passes through delayed by exactly the reported latency."""
+    limiter = LookaheadLimiter(sample_rate=44100)
+    latency = limiter.get_latency_samples()
+    signal = np.random.default_rng(6).uniform(-0.3, 0.3, (2, 4096))
+    out = np.concatenate([limiter.process(signal[:, i:i + 512])
+                          for i in range(0, 4096, 512)], axis=1)
+    assert np.allclose(out[:, latency:], signal[:, :-latency])
+    assert np.allclose(out[:, :latency], 0.0)
+
+
+def test_crossover_sums_to_allpass():
+    """Test LR4 bands sum to the cascaded allpass, seamlessly across blocks."""
+    freqs = (150.0, 1200.0, 7000.0)
+    signal = np.random.default_rng(7).standard_normal((2, 8000))
+    crossover = Crossover(freqs)
+    bands = np.concatenate([crossover.split(signal[:, i:i + 700])
+                            for i in range(0, 8000, 700)], axis=-1)
+    assert bands.shape == (4, 2, 8000)
+    allpass = np.vstack([linkwitz_riley(f, 44100.0)[2] for f in freqs])
+    assert np.allclose(bands.sum(axis=0), sosfilt(allpass, signal))
+
+
+def test_multiband_compressor_per_band():
+    """Test only the band holding the loud signal is compressed."""
+    sr = 44100
+    t = np.arange(sr) / sr
+    signal = 0.9 * np.sin(2 * np.pi * 60 * t) + 0.01 * np.sin(2 * np.pi * 3000 * t)
+    mbc = MultibandCompressor()
+    mbc.set_threshold(-20)
+    mbc.set_ratio(8)
+    out = mbc.process(signal)
+    gr = mbc.get_gain_reduction()
+    assert gr[0] > 10 and gr[2] == 0.0
+    assert np.abs(out[sr // 2:]).max() < 0.5
+
+    restored = MultibandCompressor()
+    restored.from_dict(mbc.to_dict())
+    assert restored.to_dict() == mbc.to_dict()
+
+
 if __name__ == "__main__":
     print("\n" + "╔" + "=" * 58 + "╗")
     print("║" + " Phase 2.2 Dynamic Processors Test Suite ".center(58) + "║")
@@ -0,0 +1,132 @@
+"""
+Filter Engine Tests
+
+Tests for the stateful SOS filter, coefficient cache and partitioned FFT
+convolution behind EQ3Band, HighLowPass and ConvolutionReverb, and for
+EQ3Band's linear-phase mode.
+"""
+
+import numpy as np
+import pytest
+from scipy.signal import sosfilt, sosfreqz
+from daw_core.fx.eq_and_dynamics import EQ3Band, HighLowPass
+from daw_core.fx.filter_engine import (
+    PartitionedConvolver,
+    SMOOTHING_MS,
+    SOSFilter,
+    design_sos,
+    partition_spectra,
+)
+
+
+def _blocks(effect, audio, block):
+    return np.concatenate([effect.process(audio[..., i:i + block])
+                           for i in range(0, audio.shape[-1], block)], axis=-1)
+
+
+def _noise(samples=20000, channels=2, seed=0):
+    return np.random.default_rng(seed).standard_normal((channels, samples))
+
+
+def _eq():
+    eq = EQ3Band()
+    eq.set_low_band(6.0, 100.0, 0.7)
+    eq.set_mid_band(-4.0, 1000.0, 1.0)
+    eq.set_high_band(3.0, 8000.0, 0.7)
+    return eq
+
+
+class TestSOSFilter:
+    """Test state carry-over, coefficient caching and smoothing."""
+
+    def test_design_cached_copies(self):
+        """Verify repeated designs are equal but independent arrays."""
+        a = design_sos("peaking", 1000.0, 1.0, 6.0, 44100)
+        b = design_sos("peaking", 1000.0, 1.0, 6.0, 44100)
+        assert np.array_equal(a, b) and a is not b
+        with pytest.raises(ValueError):
+            design_sos("notch", 1000.0)
+
+    def test_eq_blocks_match_single_pass(self):
+        """Verify the merged cascade is seamless across odd block sizes."""
+        audio = _noise()
+        eq = _eq()
+        expected = sosfilt(eq.high_sos, sosfilt(eq.mid_sos, sosfilt(eq.low_sos, audio)))
+        assert np.allclose(_blocks(_eq(), audio, 333), expected)
+
+    def test_highlow_pass_blocks_match_single_pass(self):
+        """Verify HighLowPass carries state across blocks."""
+        audio = _noise()
+        hp = HighLowPass()
+        hp.set_order(4)
+        assert np.allclose(_blocks(hp, audio, 257), sosfilt(hp.sos, audio))
+
+    def test_coefficient_change_is_ramped(self):
+        """Verify a parameter jump ramps in and ends on the new design."""
+        sr = 44100
+        t = np.arange(sr // 2) / sr
+        sine = np.sin(2 * np.pi * 220 * t)
+        hp = HighLowPass()
+        hp.set_type("lowpass")
+        hp.set_cutoff(300)
+        hp.process(sine[:4410])
+        hp.set_cutoff(5000)
+        hp.set_order(4)
+        ramped = hp.process(sine[4410:])
+        assert np.isfinite(ramped).all()
+        assert np.max(np.abs(np.diff(ramped))) < 0.1
+
+        ramp = int(SMOOTHING_MS / 1000 * sr)
+        settled = SOSFilter(hp.sos)
+        settled.process(sine[:4410 + ramp])
+        tail = settled.process(sine[4410 + ramp:])
+        assert np.allclose(ramped[ramp + 4410:], tail[4410:], atol=1e-6)
+
+
+class TestFFTFiltering:
+    """Test partitioned convolution and the linear-phase EQ."""
+
+    def test_partitioned_convolver_matches_direct(self):
+        """Verify overlap-save output equals direct convolution."""
+        rng = np.random.default_rng(1)
+        ir = rng.standard_normal(3000)
+        audio = _noise(10000, 1)
+        conv = PartitionedConvolver(partition_spectra(ir[None], 256), 256)
+        wet = _blocks(conv, audio, 700)
+        assert np.allclose(wet[0], np.convolve(audio[0], ir)[:10000])
+
+    def test_linear_phase_impulse(self):
+        """Verify the FIR is symmetric about the reported latency."""
+        eq = _eq()
+        eq.set_phase_mode("linear")
+        latency = eq.get_latency_samples()
+        impulse = np.zeros(3 * EQ3Band.LINEAR_PHASE_TAPS)
+        impulse[0] = 1.0
+        response = _blocks(eq, impulse, 500)
+        assert np.argmax(np.abs(response)) == latency
+        assert np.allclose(response[latency - 2000:latency],
+                           response[latency + 1:latency + 2001][::-1])
+
+    def test_linear_phase_magnitude_matches_iir(self):
+        """Verify the linear-phase magnitude follows the band settings."""
+        eq = _eq()
+        eq.set_phase_mode("linear")
+        impulse = np.zeros(EQ3Band.LINEAR_PHASE_TAPS)
+        impulse[0] = 1.0
+        response = np.fft.rfft(eq.process(impulse))
+        freqs = np.fft.rfftfreq(EQ3Band.LINEAR_PHASE_TAPS, 1 / 44100)
+        for f in (300.0, 1000.0, 3000.0, 10000.0):
+            k = np.argmin(np.abs(freqs - f))
+            _, h = sosfreqz(eq.sos, worN=[2 * np.pi * freqs[k] / 44100])
+            assert abs(20 * np.log10(abs(response[k]) / abs(h[0]))) < 0.1
+
+    def test_phase_mode_serialization(self):
+        """Verify phase mode round-trips and invalid modes are rejected."""
+        eq = _eq()
+        eq.set_phase_mode("linear")
+        restored = EQ3Band()
+        restored.from_dict(eq.to_dict())
+        assert restored.phase_mode == "linear"
+        assert restored.get_latency_samples() == EQ3Band.LINEAR_PHASE_TAPS // 2
+        with pytest.raises(ValueError):
+            eq.set_phase_mode("mixed")
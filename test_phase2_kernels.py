@@ -0,0 +1,108 @@
+"""
+Kernel Backend Tests
+
+Tests that every registered per-sample loop (the code numba compiles)
+matches its NumPy fallback, and for backend selection and the effect
+registry. The loops are run as plain Python here, so they are checked
+whether or not numba is installed.
+"""
+
+import numpy as np
+import pytest
+import daw_core.automation as automation
+from daw_core.fx import EFFECT_KERNELS, get_effect_backends, warm_up_kernels
+from daw_core.fx import kernels
+from daw_core.fx.dynamics_core import envelope_bank, envelope_follower, smooth_envelope
+from daw_core.fx.reverb import _allpass_kernel, _comb_kernel
+
+
+def _bank_args(rng, comb=True):
+    delays = np.array([37, 41, 53])
+    lines = rng.standard_normal((3, 53)) * 0.2
+    write_pos = np.array([5, 0, 52])
+    signal = rng.standard_normal((3, 300)) * 0.3
+    feedback = np.array([0.8, 0.7, 0.6])
+    if comb:
+        return (lines, delays, write_pos, np.array([0.1, 0.2, -0.1]), feedback,
+                np.array([0.3, 0.3, 0.5]), np.array([0.7, 0.7, 0.5]), signal)
+    return lines, delays, write_pos, feedback, signal
+
+
+class TestKernelEquivalence:
+    """Test loops against fallbacks, including state written back."""
+
+    @pytest.mark.parametrize("comb", [True, False])
+    def test_reverb_banks(self, comb):
+        """Verify comb/allpass loops match the chunked NumPy banks."""
+        kernel = _comb_kernel if comb else _allpass_kernel
+        loop_args = _bank_args(np.random.default_rng(0), comb)
+        numpy_args = _bank_args(np.random.default_rng(0), comb)
+        assert np.allclose(kernel.loop(*loop_args), kernel.fallback(*numpy_args))
+        for a, b in zip(loop_args, numpy_args):
+            assert np.allclose(a, b)  # delay lines, write positions, damping state
+
+    def test_envelope_follower(self):
+        """Verify the envelope loop matches the Python-float fallback."""
+        levels = np.random.default_rng(1).uniform(-80, 0, 1000)
+        args = (levels, -120.0, 0.3, 0.01)
+        assert np.allclose(envelope_follower.loop(*args), envelope_follower.fallback(*args))
+
+    @pytest.mark.parametrize("rows", [3, 40])
+    def test_envelope_bank(self, rows):
+        """Verify the 2-D envelope loop matches per-row followers on both fallback paths."""
+        rng = np.random.default_rng(3)
+        args = (rng.uniform(-80, 0, (rows, 300)), rng.uniform(-80, 0, rows),
+                rng.uniform(0.1, 0.5, rows), rng.uniform(0.001, 0.05, rows))
+        expected = np.stack([smooth_envelope(*(a[i] for a in args)) for i in range(rows)])
+        assert np.allclose(envelope_bank.loop(*args), expected)
+        assert np.allclose(envelope_bank.fallback(*args), expected)
+
+    def test_lfo_shapes(self):
+        """Verify every deterministic LFO shape."""
+        kernel = automation._lfo_kernel
+        for shape in range(4):
+            args = (0.3, 0.001, shape, 0.7, 500)
+            assert np.allclose(kernel.loop(*args), kernel.fallback(*args))
+
+    def test_adsr_stage_transitions(self):
+        """Verify block-vectorized ADSR stages match the state machine."""
+        kernel = automation._adsr_kernel
+        rng = np.random.default_rng(2)
+        for _ in range(200):
+            args = (int(rng.integers(0, 3000)), int(rng.integers(0, 5000)),
+                    int(rng.integers(0, 5)), float(rng.uniform()), float(rng.uniform()),
+                    int(rng.integers(0, 5000)), 0, 44100.0, 0.01, 0.02,
+                    float(rng.choice([0.0, 0.6])), 0.05)
+            out_loop, *state_loop = kernel.loop(*args)
+            out_numpy, *state_numpy = kernel.fallback(*args)
+            assert np.allclose(out_loop, out_numpy)
+            assert state_loop[0] == state_numpy[0]
+            assert np.allclose(state_loop[1:], state_numpy[1:])
+
+
+class TestBackendSelection:
+    """Test backend switching and reporting."""
+
+    def test_registry_and_warm_up(self):
+        """Verify every effect's kernels are registered and warm up."""
+        timings = warm_up_kernels()
+        assert {"lfo", "adsr"} <= set(timings)
+        for names in EFFECT_KERNELS.values():
+            assert set(names) <= set(timings)
+        assert EFFECT_KERNELS["DynamicEQ"] == ("envelope_bank",)
+        assert set(get_effect_backends().values()) == {kernels.get_backend()}
+
+    def test_set_backend(self):
+        """Verify switching to numpy and rejecting unavailable backends."""
+        previous = kernels.get_backend()
+        try:
+            kernels.set_backend("numpy")
+            assert set(kernels.kernel_backends().values()) == {"numpy"}
+            assert _comb_kernel._impl is _comb_kernel.fallback
+            with pytest.raises(ValueError):
+                kernels.set_backend("cuda")
+            if not kernels.HAS_NUMBA:
+                with pytest.raises(ValueError):
+                    kernels.set_backend("numba")
+        finally:
+            kernels.set_backend(previous)
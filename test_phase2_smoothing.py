@@ -0,0 +1,108 @@
+"""
+Parameter Smoothing Tests
+
+Tests for the block-rate SmoothedParameter ramps and for effects using
+them: no steps on parameter changes, and the same output whatever the
+block size.
+"""
+
+import numpy as np
+import pytest
+from daw_core.fx.smoothing import SmoothedParameter
+from daw_core.fx.eq_and_dynamics import Compressor
+from daw_core.fx.saturation import Saturation
+from daw_core.fx.delays import SimpleDelay, StereoDelay
+from daw_core.fx.reverb import Reverb
+
+
+def _blocks(process, signal, size):
+    return np.concatenate([process(signal[..., i:i + size])
+                           for i in range(0, signal.shape[-1], size)], axis=-1)
+
+
+class TestSmoothedParameter:
+    """Test ramp generation."""
+
+    def test_settled_returns_scalar(self):
+        """Verify no array is built while the value is steady."""
+        param = SmoothedParameter(0.5)
+        assert param.next(512, 0.5) == 0.5
+        assert isinstance(param.next(512, 0.5), float)
+
+    def test_first_block_snaps(self):
+        """Verify a target set before any audio applies immediately."""
+        param = SmoothedParameter(0.0)
+        assert param.next(64, 1.0) == 1.0
+
+    def test_linear_ramp_across_blocks(self):
+        """Verify the ramp is independent of block size and ends on target."""
+        whole = SmoothedParameter(0.0, ramp_ms=10, sample_rate=1000)
+        split = SmoothedParameter(0.0, ramp_ms=10, sample_rate=1000)
+        whole.next(1)
+        split.next(1)
+        ramp = whole.next(16, 1.0)
+        parts = np.concatenate([np.broadcast_to(split.next(n, 1.0), n) for n in (3, 4, 9)])
+        assert np.allclose(ramp, parts)
+        assert np.allclose(ramp[:10], np.arange(1, 11) / 10)
+        assert np.all(ramp[10:] == 1.0) and whole.settled
+        assert whole.next(8) == 1.0
+
+    def test_exponential_and_retarget(self):
+        """Verify equal-ratio steps and retargeting from the value in use."""
+        param = SmoothedParameter(1.0, ramp_ms=4, mode="exponential", sample_rate=1000)
+        param.next(1)
+        ramp = param.next(4, 16.0)
+        assert np.allclose(ramp, [2.0, 4.0, 8.0, 16.0])
+        param.set_target(1.0)
+        ramp = param.next(2)
+        assert np.allclose(ramp, [8.0, 4.0])
+        assert param.current == pytest.approx(4.0)
+
+    def test_unknown_mode(self):
+        """Verify invalid modes are rejected."""
+        with pytest.raises(ValueError):
+            SmoothedParameter(0.0, mode="cubic")
+
+
+class TestSmoothedEffects:
+    """Test effects under parameter changes."""
+
+    def test_compressor_makeup_has_no_step(self):
+        """Verify a makeup change ramps instead of jumping."""
+        comp = Compressor()
+        comp.set_threshold(0.0)
+        dc = np.full((2, 4096), 0.1)
+        comp.process(dc[:, :512])
+        comp.set_makeup_gain(12.0)
+        out = comp.process(dc[:, 512:])
+        assert np.max(np.abs(np.diff(out[0]))) < 1e-3
+        assert out[0, -1] == pytest.approx(np.tanh(0.1 * 10 ** (12 / 20)))
+
+    @pytest.mark.parametrize("make", [Saturation, SimpleDelay, StereoDelay, Reverb])
+    def test_block_size_independent(self, make):
+        """Verify one large block matches many small ones through a change."""
+        signal = np.random.default_rng(4).standard_normal((2, 8192)) * 0.2
+        outputs = []
+        for size in (8192, 128):
+            fx = make()
+            fx.process(signal[:, :1024])
+            fx.set_mix(0.2) if hasattr(fx, "set_mix") else fx.set_wet_level(0.9)
+            if isinstance(fx, SimpleDelay):
+                fx.set_time(120)
+            if isinstance(fx, StereoDelay):
+                fx.set_time_l(90)
+            outputs.append(_blocks(fx.process, signal[:, 1024:], size))
+        assert np.allclose(outputs[0], outputs[1], atol=1e-6)
+
+    def test_delay_time_crossfades(self):
+        """Verify a new delay time fades between read heads without a click."""
+        delay = SimpleDelay()
+        delay.set_feedback(0.0)
+        delay.set_mix(1.0)
+        delay.set_time(4)
+        ramp = np.linspace(0, 0.5, 2048).reshape(1, -1).astype(np.float32)
+        delay.process(ramp[:, :1024])
+        delay.set_time(2)  # an instant switch would jump by ~0.02
+        out = delay.process(ramp[:, 1024:])
+        assert np.max(np.abs(np.diff(out))) < 0.001
+        assert out[0, -1] == pytest.approx(ramp[0, -1 - 88], abs=1e-6)